@@ -1,9 +1,17 @@
-from flask import Blueprint, request, jsonify
-from controllers.auth_controller import register, login, get_current_user
-from controllers.job_controller import get_jobs, get_job, create_job
+from flask import Blueprint, Response, request, jsonify
+from controllers.auth_controller import register, login, get_current_user, revoke_sessions
+from controllers.job_controller import (
+    get_jobs, get_job, create_job, update_job, delete_job, jobs_version, job_version
+)
 from controllers.recommendation_controller import get_recommendations
 from controllers.profile_controller import get_profile, update_profile
+from controllers.application_controller import (
+    get_user_applications, get_job_applications, update_application_status
+)
 from utils.auth import token_required
+from utils.query_budget import query_budget
+from utils.http_cache import response_cache
+from utils.metrics import metrics, PROMETHEUS_CONTENT_TYPE
 
 api_bp = Blueprint('api', __name__)
 
@@ -22,12 +30,22 @@ def login_route():
 def me_route(current_user):
     return get_current_user(current_user)
 
-# Job routes
+@api_bp.route('/auth/revoke', methods=['POST'])
+@token_required
+def revoke_route(current_user):
+    return revoke_sessions(current_user)
+
+# Job routes (anonymous, cached and revalidated with ETags; budgets include
+# the version query, and for listings the search index check and the total)
 @api_bp.route('/jobs', methods=['GET'])
+@query_budget(4)
+@response_cache.cached(jobs_version)
 def jobs_route():
     return get_jobs(request.args)
 
 @api_bp.route('/jobs/<job_id>', methods=['GET'])
+@query_budget(2)
+@response_cache.cached(job_version)
 def job_route(job_id):
     return get_job(job_id)
 
@@ -36,12 +54,47 @@ def job_route(job_id):
 def create_job_route(current_user):
     return create_job(request.json, current_user)
 
-# Recommendation routes
+@api_bp.route('/jobs/<job_id>', methods=['PUT'])
+@token_required
+def update_job_route(current_user, job_id):
+    return update_job(job_id, request.json, current_user)
+
+@api_bp.route('/jobs/<job_id>', methods=['DELETE'])
+@token_required
+def delete_job_route(current_user, job_id):
+    return delete_job(job_id, current_user)
+
+# Application routes (budgets include the token_required user query)
+@api_bp.route('/applications', methods=['GET'])
+@query_budget(2)
+@token_required
+def applications_route(current_user):
+    return get_user_applications(current_user, request.args)
+
+@api_bp.route('/jobs/<job_id>/applications', methods=['GET'])
+@query_budget(3)
+@token_required
+def job_applications_route(current_user, job_id):
+    return get_job_applications(job_id, current_user, request.args)
+
+@api_bp.route('/applications/<application_id>/status', methods=['PUT'])
+@query_budget(3)
+@token_required
+def application_status_route(current_user, application_id):
+    return update_application_status(application_id, request.json, current_user)
+
+# Recommendation routes (user, profile, applications and jobs)
 @api_bp.route('/recommendations', methods=['GET'])
+@query_budget(4)
 @token_required
 def recommendations_route(current_user):
     return get_recommendations(current_user, request.args)
 
+# Monitoring routes
+@api_bp.route('/metrics', methods=['GET'])
+def metrics_route():
+    return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 # Profile routes
 @api_bp.route('/profile', methods=['GET'])
 @token_required
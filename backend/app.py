@@ -4,7 +4,17 @@ from dotenv import load_dotenv
 import os
 
 from api.routes import api_bp
-from models.db import init_db
+from models.db import init_db, db
+from services.recommendation_service import recommendation_service
+from services.skill_service import skill_resolver
+from services.search_service import job_search
+from services.job_count_service import job_counts
+from utils.auth import init_auth
+from utils.json_provider import init_json
+from utils.http_cache import response_cache
+from utils.metrics import metrics
+from utils.query_budget import init_query_budget
+from utils.profiling import profiler
 
 # Load environment variables
 load_dotenv()
@@ -16,19 +26,73 @@ def create_app(test_config=None):
     # Configure the app
     app.config.from_mapping(
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
-        DATABASE_URI=os.environ.get('DATABASE_URI', 'sqlite:///smarthire.db'),
+        SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URI', 'sqlite:///smarthire.db'),
         ML_MODEL_PATH=os.environ.get('ML_MODEL_PATH', '../ml/models/trained/'),
+        RECOMMENDATION_CACHE=os.environ.get('RECOMMENDATION_CACHE', 'memory'),
+        RECOMMENDATION_CACHE_SIZE=int(os.environ.get('RECOMMENDATION_CACHE_SIZE', 10000)),
+        RECOMMENDATION_CACHE_TTL=int(os.environ.get('RECOMMENDATION_CACHE_TTL', 300)),
+        JOB_INDEX_SYNC_INTERVAL=float(os.environ.get('JOB_INDEX_SYNC_INTERVAL', 5.0)),
+        # Worker processes serving the app (as set for gunicorn)
+        WEB_CONCURRENCY=int(os.environ.get('WEB_CONCURRENCY', 1)),
+        RECOMMENDATION_SERVING=os.environ.get('RECOMMENDATION_SERVING', 'inline'),
+        RECOMMENDATION_SCORING_WORKERS=int(os.environ.get('RECOMMENDATION_SCORING_WORKERS', 1)),
+        RECOMMENDATION_BATCH_SIZE=int(os.environ.get('RECOMMENDATION_BATCH_SIZE', 64)),
+        RECOMMENDATION_BATCH_WINDOW_MS=float(os.environ.get('RECOMMENDATION_BATCH_WINDOW_MS', 2.0)),
+        RECOMMENDATION_QUEUE_SIZE=int(os.environ.get('RECOMMENDATION_QUEUE_SIZE', 1024)),
+        RECOMMENDATION_MATMUL_BATCH=int(os.environ.get('RECOMMENDATION_MATMUL_BATCH', 8)),
+        AUTH_STATELESS=os.environ.get('AUTH_STATELESS', 'false').lower() == 'true',
+        AUTH_PRINCIPAL_CACHE_TTL=int(os.environ.get('AUTH_PRINCIPAL_CACHE_TTL', 30)),
+        PROFILE_DIR=os.environ.get('PROFILE_DIR'),
+        PROFILE_SAMPLE_EVERY=int(os.environ.get('PROFILE_SAMPLE_EVERY', 100)),
+        JOB_COUNT_CACHE_TTL=int(os.environ.get('JOB_COUNT_CACHE_TTL', 60)),
+        RESPONSE_CACHE=os.environ.get('RESPONSE_CACHE', 'memory'),
+        RESPONSE_CACHE_SIZE=int(os.environ.get('RESPONSE_CACHE_SIZE', 2000)),
+        RESPONSE_CACHE_TTL=int(os.environ.get('RESPONSE_CACHE_TTL', 300)),
+        RESPONSE_CACHE_MAX_AGE=int(os.environ.get('RESPONSE_CACHE_MAX_AGE', 0)),
+        JSON_FAST=os.environ.get('JSON_FAST', 'true').lower() == 'true',
     )
     
+    # Overrides for tests and benchmarks
+    if test_config is not None:
+        app.config.update(test_config)
+    
+    # orjson-backed jsonify when available
+    init_json(app)
+    
     # Enable CORS
     CORS(app)
     
     # Initialize the database
     init_db(app)
     
+    # Request and stage timings (/api/metrics), and opt-in sampled profiling
+    profiler.init_app(app)
+    metrics.init_app(app)
+    
+    # Token verification and the principal cache
+    init_auth(app)
+    
+    # Per-request SQL statement counts for query_budget
+    init_query_budget(app, db)
+    
+    # Process-wide skill name -> id cache
+    skill_resolver.init_app(app)
+    
+    # Job full-text search (flask search reindex)
+    job_search.init_app(app)
+    
+    # Cached job listing totals (?total=true)
+    job_counts.init_app(app)
+    
+    # Public job responses, revalidated with ETags
+    response_cache.init_app(app)
+    
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Load and warm up the recommendation model once per process
+    recommendation_service.init_app(app)
+    
     @app.route('/')
     def index():
         return {"status": "SmartHire API is running"}
@@ -1,9 +1,16 @@
 from flask import jsonify
+from sqlalchemy.orm import contains_eager, joinedload
 from models.db import db
 from models.application import Application
 from models.job import Job
+from services.recommendation_service import recommendation_service
+from utils.pagination import keyset_page, parse_limit, InvalidCursor
+from utils.serialization import parse_fields, InvalidFields
 from datetime import datetime
 
+# Applications are listed newest first; id breaks created_at ties
+APPLICATION_ORDER = [Application.created_at, Application.id]
+
 def apply_for_job(job_id, data, current_user):
     """Submit a job application"""
     try:
@@ -45,6 +52,9 @@ def apply_for_job(job_id, data, current_user):
         db.session.add(new_application)
         db.session.commit()
         
+        # Applied jobs are no longer recommended
+        recommendation_service.invalidate_user(current_user['id'])
+        
         return jsonify({
             'success': True,
             'message': 'Application submitted successfully',
@@ -58,34 +68,53 @@ def apply_for_job(job_id, data, current_user):
             'message': f'Error submitting application: {str(e)}'
         }), 500
 
-def get_user_applications(current_user):
-    """Get all applications submitted by the current user"""
+def get_user_applications(current_user, args):
+    """Get the applications submitted by the current user, one page at a time"""
     try:
-        applications = Application.query.filter_by(user_id=current_user['id']).all()
+        # Sparse fieldsets of the applications (?fields=, may name job) and
+        # of their jobs (?job_fields=)
+        fields = parse_fields(args, Application.FIELDS + ('job',))
+        job_fields = parse_fields({'fields': args.get('job_fields')}, Job.FIELDS)
+        
+        # Applications and their jobs in a single joined query; applications
+        # whose job was deleted are skipped
+        query = Application.query.join(Application.job).options(
+            contains_eager(Application.job)
+        ).filter(Application.user_id == current_user['id'])
+        
+        applications, next_cursor = keyset_page(
+            query, APPLICATION_ORDER, args.get('cursor'), parse_limit(args)
+        )
         
-        # Get job details for each application
         result = []
         for app in applications:
-            job = Job.query.get(app.job_id)
-            if job:
-                app_data = app.to_dict()
-                app_data['job'] = job.to_dict()
-                result.append(app_data)
+            app_data = app.to_dict(fields)
+            if fields is None or 'job' in fields:
+                app_data['job'] = app.job.to_dict(job_fields)
+            result.append(app_data)
         
         return jsonify({
             'success': True,
-            'applications': result
+            'applications': result,
+            'next_cursor': next_cursor
         }), 200
         
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Error retrieving applications: {str(e)}'
         }), 500
 
-def get_job_applications(job_id, current_user):
-    """Get all applications for a specific job (employer only)"""
+def get_job_applications(job_id, current_user, args):
+    """Get the applications for a specific job, one page at a time (employer only)"""
     try:
+        fields = parse_fields(args, Application.FIELDS)
+        
         # Get the job
         job = Job.query.get(job_id)
         
@@ -104,17 +133,26 @@ def get_job_applications(job_id, current_user):
             }), 403
         
         # Get applications
-        applications = Application.query.filter_by(job_id=job_id).all()
+        applications, next_cursor = keyset_page(
+            Application.query.filter_by(job_id=job_id), APPLICATION_ORDER,
+            args.get('cursor'), parse_limit(args)
+        )
         
         # Format response
-        result = [app.to_dict() for app in applications]
+        result = [app.to_dict(fields) for app in applications]
         
         return jsonify({
             'success': True,
             'applications': result,
-            'count': len(result)
+            'count': len(result),
+            'next_cursor': next_cursor
         }), 200
         
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -124,8 +162,10 @@ def get_job_applications(job_id, current_user):
 def update_application_status(application_id, data, current_user):
     """Update application status (employer only)"""
     try:
-        # Get the application
-        application = Application.query.get(application_id)
+        # Get the application and its job in one query
+        application = db.session.get(
+            Application, application_id, options=[joinedload(Application.job)]
+        )
         
         # Check if application exists
         if not application:
@@ -134,11 +174,8 @@ def update_application_status(application_id, data, current_user):
                 'message': 'Application not found'
             }), 404
         
-        # Get the job
-        job = Job.query.get(application.job_id)
-        
         # Check if user is the employer
-        if job.employer_id != current_user['id']:
+        if application.job.employer_id != current_user['id']:
             return jsonify({
                 'success': False,
                 'message': 'You are not authorized to update this application'
@@ -155,12 +192,15 @@ def update_application_status(application_id, data, current_user):
         # Update status
         application.status = data['status']
         application.updated_at = datetime.utcnow()
+        
+        # Serialized before the commit expires it, which would reload the row
+        application_data = application.to_dict()
         db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Application status updated successfully',
-            'application': application.to_dict()
+            'application': application_data
         }), 200
         
     except Exception as e:
@@ -2,17 +2,24 @@ from flask import jsonify
 from models.db import db
 from models.user import User
 from models.profile import Profile
+from utils.auth import token_claims, revoke_tokens
 import jwt
 import os
 from datetime import datetime, timedelta
 import re
 
-def generate_token(user_id):
-    """Generate JWT token for authentication"""
+def generate_token(user_id, claims=None):
+    """
+    Generate JWT token for authentication
+    claims: Optional user claims (see utils.auth.token_claims); with
+        AUTH_STATELESS the principal is built from them instead of a query
+    """
     payload = {
         'user_id': user_id,
         'exp': datetime.utcnow() + timedelta(days=1)  # Token expires in 1 day
     }
+    if claims:
+        payload.update(claims)
     token = jwt.encode(payload, os.environ.get('JWT_SECRET_KEY', 'dev'), algorithm='HS256')
     return token
 
@@ -69,7 +76,7 @@ def register(data):
         db.session.commit()
         
         # Generate token
-        token = generate_token(new_user.id)
+        token = generate_token(new_user.id, token_claims(new_user))
         
         return jsonify({
             'success': True,
@@ -106,7 +113,7 @@ def login(data):
             }), 401
         
         # Generate token
-        token = generate_token(user.id)
+        token = generate_token(user.id, token_claims(user))
         
         return jsonify({
             'success': True,
@@ -123,21 +130,28 @@ def login(data):
 
 def get_current_user(current_user):
     """Get current authenticated user"""
+    # token_required already loaded (or verified) the user
+    return jsonify({
+        'success': True,
+        'user': current_user
+    }), 200
+
+def revoke_sessions(current_user):
+    """Invalidate every token of the current user, and issue a new one"""
     try:
         user = User.query.get(current_user['id'])
-        if not user:
-            return jsonify({
-                'success': False,
-                'message': 'User not found'
-            }), 404
+        revoke_tokens(user)
+        db.session.commit()
         
         return jsonify({
             'success': True,
-            'user': user.to_dict()
+            'message': 'All other sessions were signed out',
+            'token': generate_token(user.id, token_claims(user))
         }), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'success': False,
-            'message': f'Error retrieving user: {str(e)}'
+            'message': f'Error revoking sessions: {str(e)}'
         }), 500
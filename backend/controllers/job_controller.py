@@ -1,23 +1,55 @@
-from flask import jsonify
+from flask import current_app, jsonify
 from models.db import db
 from models.job import Job
-from models.skill import Skill
+from models.job_deletion import JobDeletion
+from services.recommendation_service import recommendation_service
+from services.skill_service import skill_resolver
+from services.search_service import job_search
+from services.job_count_service import job_counts
+from utils.pagination import keyset_page, parse_limit, InvalidCursor
+from utils.http_cache import response_cache
+from utils.serialization import parse_fields, InvalidFields
 from datetime import datetime
+import math
 import re
 
+# Jobs are listed newest first; id breaks created_at ties
+JOB_ORDER = [Job.created_at, Job.id]
+
+# Job columns an employer may change with update_job
+UPDATABLE_FIELDS = ('title', 'company', 'location', 'description', 'requirements', 'job_type',
+                    'experience_level', 'salary_min', 'salary_max', 'salary_range', 'is_active')
+
+# Arguments that pick a page rather than filter the listing
+PAGE_ARGUMENTS = ('cursor', 'page', 'limit', 'total', 'fields')
+
+def jobs_version():
+    """
+    Version of the job listings for response caching: the number of jobs and
+    the latest job change, so inserts, updates and deletes all change it
+    """
+    count, latest = db.session.query(db.func.count(Job.id), db.func.max(Job.updated_at)).one()
+    return f"{count}:{latest.isoformat() if latest else ''}"
+
+def job_version(job_id):
+    """Version of a job for response caching, or None if there is no such job"""
+    row = db.session.query(Job.updated_at).filter(Job.id == job_id).first()
+    if row is None:
+        return None
+    return row.updated_at.isoformat() if row.updated_at else ''
+
 def get_jobs(args):
     """Get all jobs with optional filtering"""
     try:
         # Start with base query
         query = Job.query
         
-        # Apply filters
-        if 'title' in args:
-            query = query.filter(Job.title.ilike(f"%{args['title']}%"))
-        
-        if 'location' in args:
-            query = query.filter(Job.location.ilike(f"%{args['location']}%"))
+        # Full-text search (q) and title/location filters use the search index
+        query, relevance = job_search.search(
+            query, q=args.get('q'), title=args.get('title'), location=args.get('location')
+        )
         
+        # Apply filters
         if 'job_type' in args:
             query = query.filter(Job.job_type == args['job_type'])
         
@@ -42,24 +74,39 @@ def get_jobs(args):
         if 'show_inactive' not in args or args['show_inactive'].lower() != 'true':
             query = query.filter(Job.is_active == True)
         
-        # Handle pagination
-        page = int(args.get('page', 1))
-        limit = min(int(args.get('limit', 10)), 50)  # Limit to 50 items max
+        limit = parse_limit(args, default=10, maximum=50)
+        fields = parse_fields(args, Job.FIELDS)
+        response = {'success': True}
         
-        # Execute query with pagination
-        paginated_jobs = query.order_by(Job.created_at.desc()).paginate(page=page, per_page=limit)
+        if 'page' in args or relevance is not None:
+            # Numbered pages, and search results ranked by relevance, which
+            # has no keyset; deep pages scan every earlier row
+            page = max(1, int(args.get('page', 1)))
+            order = [column.desc() for column in JOB_ORDER]
+            if relevance is not None:
+                order.insert(0, relevance)
+            jobs = query.order_by(*order).offset((page - 1) * limit).limit(limit).all()
+            response['current_page'] = page
+        else:
+            # Keyset pages: every page costs the same as the first one
+            jobs, response['next_cursor'] = keyset_page(query, JOB_ORDER, args.get('cursor'), limit)
         
-        # Format response
-        jobs = [job.to_dict() for job in paginated_jobs.items]
+        response['jobs'] = [job.to_dict(fields) for job in jobs]
         
-        return jsonify({
-            'success': True,
-            'jobs': jobs,
-            'total': paginated_jobs.total,
-            'pages': paginated_jobs.pages,
-            'current_page': page
-        }), 200
+        # Totals cost a second query over the filtered jobs; only on request, cached
+        if args.get('total', '').lower() == 'true':
+            filters = {name: value for name, value in args.items() if name not in PAGE_ARGUMENTS}
+            response['total'] = job_counts.count(query, filters)
+            if 'current_page' in response:
+                response['pages'] = math.ceil(response['total'] / limit)
         
+        return jsonify(response), 200
+        
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -88,6 +135,23 @@ def get_job(job_id):
             'message': f'Error retrieving job: {str(e)}'
         }), 500
 
+def _job_written(job, skills=None):
+    """
+    Propagate a committed job write to the recommender and the caches
+
+    The write already stands, so failures here are logged rather than
+    turned into an error response.
+    """
+    try:
+        if job.is_active:
+            recommendation_service.add_job(job.to_dict(), skills, version=job.updated_at)
+        else:
+            recommendation_service.remove_jobs([job.id], version=job.updated_at)
+    except Exception as e:
+        current_app.logger.warning(f'Recommendation index not updated for job {job.id}: {e}')
+    job_counts.clear()
+    response_cache.clear()
+
 def create_job(data, current_user):
     """Create a new job listing"""
     # Check if user is an employer
@@ -113,38 +177,129 @@ def create_job(data, current_user):
             company=data['company'],
             location=data['location'],
             description=data['description'],
+            requirements=data.get('requirements') or '',
             job_type=data['job_type'],
             experience_level=data['experience_level'],
             employer_id=current_user['id'],
             salary_min=data.get('salary_min'),
             salary_max=data.get('salary_max'),
+            salary_range=data.get('salary_range'),
             is_active=data.get('is_active', True)
         )
         
         # Handle skills
+        skills = []
         if 'skills' in data and isinstance(data['skills'], list):
-            for skill_name in data['skills']:
-                # Find or create skill
-                skill = Skill.query.filter_by(name=skill_name).first()
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    db.session.add(skill)
-                
-                new_job.skills.append(skill)
+            # Find or create all skills at once
+            new_job.skills = skill_resolver.resolve(data['skills'])
+            skills = [skill.name for skill in new_job.skills]
         
         # Save to database
         db.session.add(new_job)
         db.session.commit()
         
+    except Exception as e:
+        db.session.rollback()
         return jsonify({
-            'success': True,
-            'message': 'Job created successfully',
-            'job': new_job.to_dict()
-        }), 201
+            'success': False,
+            'message': f'Error creating job: {str(e)}'
+        }), 500
+    
+    # Make the job visible to recommendations and listings immediately
+    _job_written(new_job, skills)
+    
+    return jsonify({
+        'success': True,
+        'message': 'Job created successfully',
+        'job': new_job.to_dict()
+    }), 201
+
+def _owned_job(job_id, current_user):
+    """(job, None) for a job posted by current_user, or (None, error response)"""
+    job = Job.query.get(job_id)
+    
+    if not job:
+        return None, (jsonify({
+            'success': False,
+            'message': 'Job not found'
+        }), 404)
+    
+    if job.employer_id != current_user['id']:
+        return None, (jsonify({
+            'success': False,
+            'message': 'You are not authorized to modify this job'
+        }), 403)
+    
+    return job, None
+
+def update_job(job_id, data, current_user):
+    """Update a job listing (employer who posted it only); is_active=false deactivates it"""
+    job, error = _owned_job(job_id, current_user)
+    if error:
+        return error
+    
+    try:
+        for field in UPDATABLE_FIELDS:
+            if field in data:
+                setattr(job, field, data[field])
+        
+        if 'skills' in data and isinstance(data['skills'], list):
+            job.skills = skill_resolver.resolve(data['skills'])
+        skills = [skill.name for skill in job.skills]
+        
+        db.session.commit()
         
     except Exception as e:
         db.session.rollback()
         return jsonify({
             'success': False,
-            'message': f'Error creating job: {str(e)}'
+            'message': f'Error updating job: {str(e)}'
+        }), 500
+    
+    # Re-index the new version, or drop a deactivated job from recommendations
+    _job_written(job, skills)
+    
+    return jsonify({
+        'success': True,
+        'message': 'Job updated successfully',
+        'job': job.to_dict()
+    }), 200
+
+def delete_job(job_id, current_user):
+    """Delete a job listing without applications (employer who posted it only)"""
+    job, error = _owned_job(job_id, current_user)
+    if error:
+        return error
+    
+    # Applications keep their job; deactivate it instead
+    if job.applications:
+        return jsonify({
+            'success': False,
+            'message': 'This job has applications; deactivate it instead'
+        }), 409
+    
+    try:
+        # The tombstone lets every worker drop the job (see sync_jobs)
+        deletion = JobDeletion(job_id=job.id)
+        db.session.add(deletion)
+        db.session.delete(job)
+        db.session.commit()
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error deleting job: {str(e)}'
         }), 500
+    
+    try:
+        recommendation_service.remove_jobs([job_id], version=deletion.deleted_at)
+    except Exception as e:
+        current_app.logger.warning(f'Recommendation index not updated for job {job_id}: {e}')
+    job_counts.clear()
+    response_cache.clear()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Job deleted successfully'
+    }), 200
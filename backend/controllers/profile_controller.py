@@ -1,8 +1,9 @@
 from flask import jsonify
 from models.db import db
 from models.profile import Profile
-from models.skill import Skill
 from models.experience import Experience
+from services.recommendation_service import recommendation_service
+from services.skill_service import skill_resolver
 from datetime import datetime
 
 def get_profile(current_user):
@@ -50,18 +51,8 @@ def update_profile(current_user, data):
         
         # Handle skills update
         if 'skills' in data and isinstance(data['skills'], list):
-            # Clear existing skills
-            profile.skills = []
-            
-            # Add updated skills
-            for skill_name in data['skills']:
-                # Find or create skill
-                skill = Skill.query.filter_by(name=skill_name).first()
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    db.session.add(skill)
-                
-                profile.skills.append(skill)
+            # Find or create all skills at once, replacing the existing ones
+            profile.skills = skill_resolver.resolve(data['skills'])
         
         # Handle experiences update
         if 'experiences' in data and isinstance(data['experiences'], list):
@@ -106,6 +97,9 @@ def update_profile(current_user, data):
         profile.updated_at = datetime.utcnow()
         db.session.commit()
         
+        # Recommendations depend on the profile
+        recommendation_service.invalidate_user(current_user['id'])
+        
         return jsonify({
             'success': True,
             'message': 'Profile updated successfully',
@@ -1,16 +1,48 @@
 # backend/controllers/recommendation_controller.py
 from flask import jsonify
-from services.recommendation_service import recommendation_service
+from services.recommendation_service import recommendation_service, JOB_ATTRIBUTES
+from services.scoring_pool import ScoringOverloaded
+from utils.metrics import record_stages, stage
 
 def get_recommendations(current_user, args):
     """Get job recommendations for the current user"""
     try:
         limit = int(args.get('limit', 10))
-        recommendations = recommendation_service.get_recommendations_for_user(current_user['id'], limit)
-        return jsonify({
-            'success': True,
-            'recommendations': recommendations
-        }), 200
+        
+        # Same filters as the job search
+        filters = {}
+        for name in JOB_ATTRIBUTES:
+            if name not in args:
+                continue
+            if name in ('salary_min', 'salary_max'):
+                try:
+                    filters[name] = int(args[name])
+                except ValueError:
+                    pass
+            else:
+                filters[name] = args[name]
+        
+        recommendations, timings = recommendation_service.get_recommendations_for_user(
+            current_user['id'], limit, filters
+        )
+        
+        # Exported on /api/metrics and in the Server-Timing header
+        record_stages(timings)
+        
+        with stage('serialize'):
+            response = jsonify({
+                'success': True,
+                'recommendations': recommendations
+            })
+        return response, 200
+    except ScoringOverloaded as e:
+        # Backpressure from the coalesced scoring queue (full or timed out)
+        response = jsonify({
+            'success': False,
+            'message': str(e)
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 503
     except Exception as e:
         return jsonify({
             'success': False,
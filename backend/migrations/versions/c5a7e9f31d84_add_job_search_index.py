@@ -0,0 +1,73 @@
+"""Add job full-text search index
+
+Revision ID: c5a7e9f31d84
+Revises: 8b4e1d0c7a52
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a7e9f31d84'
+down_revision = '8b4e1d0c7a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # FTS5 table over the jobs rows, kept in sync by triggers
+        op.execute("""
+            CREATE VIRTUAL TABLE jobs_fts USING fts5(
+                title, location, company, description,
+                content='jobs', content_rowid='rowid', tokenize='porter unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts(rowid, title, location, company, description)
+                VALUES (new.rowid, new.title, new.location, new.company, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, location, company, description)
+                VALUES ('delete', old.rowid, old.title, old.location, old.company, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER jobs_fts_update AFTER UPDATE OF title, location, company, description ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, location, company, description)
+                VALUES ('delete', old.rowid, old.title, old.location, old.company, old.description);
+                INSERT INTO jobs_fts(rowid, title, location, company, description)
+                VALUES (new.rowid, new.title, new.location, new.company, new.description);
+            END
+        """)
+        op.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        # Weighted tsvector, maintained by the database on every write
+        op.execute("""
+            ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(company, '')), 'C') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'D')
+            ) STORED
+        """)
+        op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS jobs_fts_update')
+        op.execute('DROP TRIGGER IF EXISTS jobs_fts_delete')
+        op.execute('DROP TRIGGER IF EXISTS jobs_fts_insert')
+        op.execute('DROP TABLE IF EXISTS jobs_fts')
+    elif dialect == 'postgresql':
+        op.drop_index('ix_jobs_search_vector', table_name='jobs')
+        with op.batch_alter_table('jobs', schema=None) as batch_op:
+            batch_op.drop_column('search_vector')
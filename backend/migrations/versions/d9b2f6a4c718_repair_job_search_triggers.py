@@ -0,0 +1,50 @@
+"""Repair job search triggers
+
+Revision ID: d9b2f6a4c718
+Revises: c3e5a8f1b946
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9b2f6a4c718'
+down_revision = 'c3e5a8f1b946'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # An earlier a4c9e27d5f13 recreated the jobs table on SQLite, dropping
+    # the jobs_fts triggers; jobs written since then are missing from the
+    # index, so recreate the triggers and rebuild it
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, title, location, company, description)
+            VALUES (new.rowid, new.title, new.location, new.company, new.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, location, company, description)
+            VALUES ('delete', old.rowid, old.title, old.location, old.company, old.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, location, company, description ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, location, company, description)
+            VALUES ('delete', old.rowid, old.title, old.location, old.company, old.description);
+            INSERT INTO jobs_fts(rowid, title, location, company, description)
+            VALUES (new.rowid, new.title, new.location, new.company, new.description);
+        END
+    """)
+    op.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    # The triggers belong to c5a7e9f31d84
+    pass
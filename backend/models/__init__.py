@@ -1,5 +1,6 @@
 from .db import db
 from .user import User
 from .job import Job
+from .job_deletion import JobDeletion
 from .application import Application
 from .skill import Skill
\ No newline at end of file
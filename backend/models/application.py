@@ -1,9 +1,15 @@
 from models.db import db
+from utils.serialization import isoformat, select_fields
 from datetime import datetime
 import uuid
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # Keyset pagination of a user's or a job's applications, newest first
+        db.Index('ix_applications_user_id_created_at', 'user_id', 'created_at', 'id'),
+        db.Index('ix_applications_job_id_created_at', 'job_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = db.Column(db.String(36), db.ForeignKey('jobs.id'), nullable=False)
@@ -16,12 +22,15 @@ class Application(db.Model):
     job = db.relationship('Job', backref='applications')
     user = db.relationship('User', backref='applications')
     
-    def to_dict(self):
-        return {
+    # Fields of to_dict, for sparse fieldsets (?fields=)
+    FIELDS = ('id', 'job_id', 'user_id', 'status', 'created_at', 'updated_at')
+    
+    def to_dict(self, fields=None):
+        return select_fields({
             'id': self.id,
             'job_id': self.job_id,
             'user_id': self.user_id,
             'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+            'created_at': isoformat(self.created_at),
+            'updated_at': isoformat(self.updated_at)
+        }, fields)
\ No newline at end of file
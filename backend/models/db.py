@@ -12,5 +12,6 @@ def init_db(app):
     # Import models to ensure they are registered with SQLAlchemy
     from models.user import User
     from models.job import Job
+    from models.job_deletion import JobDeletion
     from models.skill import Skill
     from models.application import Application
\ No newline at end of file
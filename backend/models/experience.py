@@ -1,4 +1,5 @@
 from models.db import db
+from utils.serialization import isoformat
 from datetime import datetime
 import uuid
 
@@ -24,9 +25,9 @@ class Experience(db.Model):
             'title': self.title,
             'company': self.company,
             'location': self.location,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'start_date': isoformat(self.start_date),
+            'end_date': isoformat(self.end_date),
             'is_current': self.is_current,
             'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': isoformat(self.created_at),
         }
@@ -1,10 +1,25 @@
 # backend/models/job.py
 from models.db import db
+from utils.serialization import isoformat, select_fields
 from datetime import datetime
 import uuid
 
+job_skills = db.Table('job_skills',
+    db.Column('job_id', db.String(36), db.ForeignKey('jobs.id'), primary_key=True),
+    db.Column('skill_id', db.String(36), db.ForeignKey('skills.id'), primary_key=True)
+)
+
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        # Keyset pagination of the job listing, newest first: active jobs
+        # (the default), all jobs and by job type
+        db.Index('ix_jobs_is_active_created_at', 'is_active', 'created_at', 'id'),
+        db.Index('ix_jobs_created_at_id', 'created_at', 'id'),
+        db.Index('ix_jobs_job_type_created_at', 'job_type', 'created_at', 'id'),
+        # Latest change to any job, the version of cached job listings
+        db.Index('ix_jobs_updated_at', 'updated_at'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
@@ -14,16 +29,27 @@ class Job(db.Model):
     location = db.Column(db.String(200), nullable=False)
     salary_range = db.Column(db.String(100))
     job_type = db.Column(db.String(50), nullable=False)
+    experience_level = db.Column(db.String(50), nullable=True)
+    salary_min = db.Column(db.Integer, nullable=True)
+    salary_max = db.Column(db.Integer, nullable=True)
+    is_active = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     employer_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     
     # Relationships
     employer = db.relationship('User', backref='posted_jobs')
+    # Only read when a job is (re)indexed, so not loaded with every job
+    skills = db.relationship('Skill', secondary=job_skills, lazy=True, backref=db.backref('jobs', lazy=True))
     # Applications relationship is handled by backref in Application model
     
-    def to_dict(self):
-        return {
+    # Fields of to_dict, for sparse fieldsets (?fields=)
+    FIELDS = ('id', 'title', 'company', 'description', 'requirements', 'location',
+              'salary_range', 'job_type', 'experience_level', 'salary_min', 'salary_max', 'is_active',
+              'created_at', 'employer_id')
+    
+    def to_dict(self, fields=None):
+        return select_fields({
             'id': self.id,
             'title': self.title,
             'company': self.company,
@@ -32,6 +58,10 @@ class Job(db.Model):
             'location': self.location,
             'salary_range': self.salary_range,
             'job_type': self.job_type,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'experience_level': self.experience_level,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'is_active': self.is_active,
+            'created_at': isoformat(self.created_at),
             'employer_id': self.employer_id
-        }
\ No newline at end of file
+        }, fields)
\ No newline at end of file
@@ -0,0 +1,14 @@
+from models.db import db
+from datetime import datetime
+
+class JobDeletion(db.Model):
+    """
+    Tombstone of a deleted job
+
+    Lets every worker process drop deleted jobs from its recommendation
+    index (see RecommendationService.sync_jobs); the jobs row itself is gone.
+    """
+    __tablename__ = 'job_deletions'
+    
+    job_id = db.Column(db.String(36), primary_key=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
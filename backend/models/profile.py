@@ -1,4 +1,5 @@
 from models.db import db
+from utils.serialization import isoformat
 from datetime import datetime
 import uuid
 
@@ -43,6 +44,6 @@ class Profile(db.Model):
             'remote_preference': self.remote_preference,
             'skills': [skill.name for skill in self.skills],
             'experiences': [exp.to_dict() for exp in self.experiences],
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': isoformat(self.created_at),
+            'updated_at': isoformat(self.updated_at),
         }
\ No newline at end of file
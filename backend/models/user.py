@@ -1,4 +1,5 @@
 from models.db import db
+from utils.serialization import isoformat
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import uuid
@@ -12,6 +13,7 @@ class User(db.Model):
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='job_seeker')  # job_seeker, employer, admin
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # bumped to revoke tokens
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -31,7 +33,7 @@ class User(db.Model):
             'first_name': self.first_name,
             'last_name': self.last_name,
             'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': isoformat(self.created_at),
         }
 
 
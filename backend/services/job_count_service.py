@@ -0,0 +1,52 @@
+from sqlalchemy import func
+from models.job import Job
+from services.recommendation_cache import MemoryCacheBackend
+from utils.metrics import metrics
+
+class JobCountCache:
+    """
+    Totals of job listings, cached per set of filters
+
+    Counting the filtered jobs costs as much as the page itself, and the
+    total of a listing rarely matters to the row, so listings only count
+    when asked and reuse a count for JOB_COUNT_CACHE_TTL seconds. Job writes
+    in this process clear the cache; writes in other processes show up when
+    the entries expire.
+    """
+
+    def __init__(self, max_entries=1000, ttl=60):
+        self.hits = 0
+        self.misses = 0
+        self._backend = MemoryCacheBackend(max_entries, ttl)
+
+    def init_app(self, app):
+        self._backend = MemoryCacheBackend(
+            app.config.get('JOB_COUNT_CACHE_SIZE', 1000),
+            app.config.get('JOB_COUNT_CACHE_TTL', 60),
+        )
+        metrics.register_collector('job_counts', self.collect_metrics)
+
+    def clear(self):
+        self._backend.clear()
+
+    def collect_metrics(self):
+        yield 'job_count_cache_events_total', {'event': 'hits'}, self.hits
+        yield 'job_count_cache_events_total', {'event': 'misses'}, self.misses
+
+    def count(self, query, filters):
+        """
+        Number of rows of a Job query, cached under filters (a mapping of
+        the listing arguments that shaped the query)
+        """
+        key = repr(sorted(filters.items()))
+        total = self._backend.get(key)
+        if total is not None:
+            self.hits += 1
+            return total
+
+        self.misses += 1
+        total = query.order_by(None).with_entities(func.count(Job.id)).scalar()
+        self._backend.set(key, total)
+        return total
+
+job_counts = JobCountCache()
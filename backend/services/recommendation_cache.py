@@ -0,0 +1,241 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteCacheBackend:
+    """
+    Cache in a local SQLite file, shared by all worker processes on a host
+
+    Values are stored as JSON. Entries expire after ttl seconds, and the
+    least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=300):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        now = time.time()
+        connection = self._connect()
+        row = connection.execute(
+            'SELECT value FROM cache WHERE key = ? AND expires_at >= ?', (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        connection = self._connect()
+        connection.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+            (key, json.dumps(value), now + self.ttl, now),
+        )
+        connection.execute('DELETE FROM cache WHERE expires_at < ?', (now,))
+        connection.execute(
+            'DELETE FROM cache WHERE key IN ('
+            'SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,),
+        )
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        self._connect().execute('DELETE FROM cache')
+
+class RedisCacheBackend:
+    """Cache in Redis (or any client with get/set(ex=)/delete/scan_iter)"""
+
+    def __init__(self, client, ttl=300, prefix='smarthire:recommendations:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+def create_cache_backend(url, max_entries=10000, ttl=300, prefix='smarthire:recommendations:', processes=1):
+    """
+    Build a cache backend from a URL
+
+    - 'memory' (default): in-process LRU
+    - 'sqlite:///path/to/cache.db': SQLite file shared by local processes
+    - 'redis://host:port/db': Redis server (requires the redis package),
+      with keys under prefix
+    - 'none': caching disabled
+
+    processes: Number of worker processes sharing the cache's contents. A
+        memory cache is private to its process, so deleting an entry in one
+        worker leaves the others serving it; with processes > 1 a SQLite
+        file in the temporary directory, shared by the workers of this
+        host, is used instead and a warning is logged.
+    """
+    if not url or url == 'memory':
+        if processes > 1:
+            path = os.path.join(tempfile.gettempdir(), f"{prefix.strip(':').replace(':', '-')}.db")
+            logger.warning(
+                f'The memory cache cannot be invalidated across {processes} workers; '
+                f'caching in sqlite:///{path} instead (configure sqlite:/// or redis:// to choose)'
+            )
+            return SQLiteCacheBackend(path, max_entries=max_entries, ttl=ttl)
+        return MemoryCacheBackend(max_entries=max_entries, ttl=ttl)
+    if url == 'none':
+        return None
+    if url.startswith('sqlite:///'):
+        return SQLiteCacheBackend(url[len('sqlite:///'):], max_entries=max_entries, ttl=ttl)
+    if url.startswith(('redis://', 'rediss://')):
+        import redis
+        return RedisCacheBackend(redis.Redis.from_url(url), ttl=ttl, prefix=prefix)
+    raise ValueError(f'Unsupported cache backend: {url}')
+
+class RecommendationCache:
+    """
+    Per-user recommendation results, keyed on user ID and model version
+
+    One entry per user holds the results for each requested variant (limit
+    and filters), so a profile change invalidates the user with a single
+    delete. Entries computed with another model version are treated as
+    misses. Invalidation only reaches other worker processes through a
+    shared backend (SQLite or Redis); see create_cache_backend.
+
+    Results computed while the user (or the whole cache) was invalidated
+    must not be stored, or they would be served until they expire. Callers
+    therefore read the user's generation() before computing, and pass it
+    to get and set: invalidate_user and clear change the generation, set
+    drops results computed under an older one, and get misses on entries
+    stored under an older one.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def generation(self, user_id):
+        """Current invalidation generation of a user's entry"""
+        return [self.backend.get('generation'), self.backend.get(f'{user_id}:generation')]
+
+    def get(self, user_id, model_version, variant, generation):
+        entry = self.backend.get(str(user_id))
+        if (entry is not None and entry['model_version'] == model_version
+                and entry.get('generation') == generation):
+            results = entry['results'].get(str(variant))
+            if results is not None:
+                self._count('hits')
+                return results
+        self._count('misses')
+        return None
+
+    def set(self, user_id, model_version, variant, recommendations, generation):
+        if self.generation(user_id) != generation:
+            # Invalidated while the results were computed
+            self._count('stale_writes')
+            return
+        key = str(user_id)
+        entry = self.backend.get(key)
+        if entry is None or entry['model_version'] != model_version or entry.get('generation') != generation:
+            entry = {'model_version': model_version, 'generation': generation, 'results': {}}
+        entry['results'][str(variant)] = recommendations
+        self.backend.set(key, entry)
+
+    def invalidate_user(self, user_id):
+        self.backend.set(f'{user_id}:generation', uuid.uuid4().hex)
+        self.backend.delete(str(user_id))
+        self._count('invalidations')
+
+    def clear(self):
+        self.backend.clear()
+        self.backend.set('generation', uuid.uuid4().hex)
+        self._count('invalidations')
+
+    def stats(self):
+        """Hit/miss counters of this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'stale_writes': self.stale_writes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -1,33 +1,404 @@
-import numpy as np
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+from sqlalchemy.orm import joinedload, selectinload
 from models.db import db
-from models.skill import Skill
+from models.profile import Profile
+from models.job import Job
+from models.job_deletion import JobDeletion
+from models.application import Application
+from services.recommendation_cache import RecommendationCache, MemoryCacheBackend, create_cache_backend
+from services.scoring_pool import CoalescingScorer
+from utils.metrics import metrics
+
+# The ml package lives next to backend/ at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Job attributes the model can filter on (see ml/models/job_attributes.py)
+JOB_ATTRIBUTES = ['location', 'job_type', 'experience_level', 'salary_min', 'salary_max']
+
+# Job writes are re-read this far back on each sync, so a write that
+# commits after a later-stamped one is not missed
+SYNC_OVERLAP = timedelta(seconds=30)
+
+class StageTimer:
+    """Collect wall-clock durations (ms) of named stages"""
+
+    def __init__(self):
+        self.timings = {}
+
+    def stage(self, name):
+        return _Stage(self.timings, name)
+
+class _Stage:
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings[self.name] = (time.perf_counter() - self.start) * 1000
 
 class RecommendationService:
     def __init__(self):
         self.model = None
-    
-    def get_recommendations(self, user_profile):
-        # Basic recommendation logic
-        return []
+        self.model_path = None
+        self.model_version = None
+        self.cache = RecommendationCache(MemoryCacheBackend())
+        self.scorer = None
+        self.scoring_timeout = 10.0
+        self.sync_interval = 0
+        self._app = None
+        self._synced_at = None
+        self._synced_versions = {}
+        self._sync_pid = None
+        self._lock = threading.RLock()
 
-recommendation_service = RecommendationService()
+    def init_app(self, app):
+        """Configure the model location and result cache, and warm the model up"""
+        self._app = app
+        self.model_path = app.config.get('ML_MODEL_PATH')
+        self.sync_interval = app.config.get('JOB_INDEX_SYNC_INTERVAL', 5.0)
+
+        backend = create_cache_backend(
+            app.config.get('RECOMMENDATION_CACHE', 'memory'),
+            max_entries=app.config.get('RECOMMENDATION_CACHE_SIZE', 10000),
+            ttl=app.config.get('RECOMMENDATION_CACHE_TTL', 300),
+            # Invalidations must reach every worker process
+            processes=app.config.get('WEB_CONCURRENCY', 1),
+        )
+        self.cache = RecommendationCache(backend) if backend is not None else None
+        metrics.register_collector('recommendations', self.collect_metrics)
+
+        # 'coalesced' scores on dedicated threads, batching concurrent requests
+        if app.config.get('RECOMMENDATION_SERVING', 'inline') == 'coalesced':
+            self.scorer = CoalescingScorer(
+                workers=app.config.get('RECOMMENDATION_SCORING_WORKERS', 1),
+                max_batch=app.config.get('RECOMMENDATION_BATCH_SIZE', 64),
+                window_ms=app.config.get('RECOMMENDATION_BATCH_WINDOW_MS', 2.0),
+                max_queue=app.config.get('RECOMMENDATION_QUEUE_SIZE', 1024),
+                matmul_batch=app.config.get('RECOMMENDATION_MATMUL_BATCH', 8),
+            )
+            self.scoring_timeout = app.config.get('RECOMMENDATION_SCORING_TIMEOUT', 10.0)
+            metrics.register_collector('scoring', self.scorer.collect_metrics)
+        else:
+            self.scorer = None
+
+        if app.config.get('ML_WARMUP', True):
+            try:
+                self.warmup()
+            except Exception as e:
+                # The API still serves everything else without a model
+                app.logger.warning(f'Recommendation model not loaded: {e}')
+
+    def collect_metrics(self):
+        """Model and result cache gauges for /api/metrics"""
+        model = self.model
+        yield 'model_loaded', {}, int(model is not None)
+        if model is not None:
+            yield 'model_active_jobs', {}, self._content_model(model).n_active_jobs
+        if self.cache is not None:
+            stats = self.cache.stats()
+            for name in ('hits', 'misses', 'invalidations', 'stale_writes'):
+                yield 'recommendation_cache_events_total', {'event': name}, stats[name]
+
+    def _resolve_model_path(self):
+        path = os.path.abspath(self.model_path)
+
+        # A plain directory holds a joblib model file
+        if os.path.isdir(path) and not os.path.exists(os.path.join(path, 'metadata.json')):
+            path = os.path.join(path, 'model.joblib')
+        return path
+
+    def load_model(self, model_path=None):
+        """Load (or reload) the recommender model from disk"""
+        if model_path is not None:
+            self.model_path = model_path
+        if not self.model_path:
+            raise ValueError('ML_MODEL_PATH is not configured')
+
+        if REPO_ROOT not in sys.path:
+            sys.path.append(REPO_ROOT)
+        from ml.models.content_based_recommender import ContentBasedRecommender
+        from ml.models.hybrid_recommender import HybridRecommender
+
+        path = self._resolve_model_path()
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'Recommendation model not found at {path}')
+
+        # A collaborative filtering sidecar means the model is hybrid
+        if os.path.exists(HybridRecommender.cf_model_path(path)):
+            model = HybridRecommender().load_model(path)
+        else:
+            model = ContentBasedRecommender().load_model(path)
+
+        with self._lock:
+            reloaded = self.model is not None
+            self.model = model
+            self.model_version = f'{os.path.basename(path)}@{os.path.getmtime(path):.0f}'
+            # Jobs written after the model was saved are indexed by sync_jobs
+            self._synced_at = datetime.utcfromtimestamp(os.path.getmtime(path))
+            self._synced_versions = {}
+
+        # Results of the previous model are stale
+        if reloaded and self.cache is not None:
+            self.cache.clear()
+
+        return model
+
+    def get_model(self):
+        """Return the loaded model, loading it once per process on first use"""
+        if self.model is None:
+            with self._lock:
+                if self.model is None:
+                    self.load_model()
+        self._ensure_sync_thread()
+        return self.model
+
+    def _ensure_sync_thread(self):
+        # Threads do not survive a fork; start one in each serving process
+        if not self.sync_interval or self._app is None or self._sync_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sync_pid == os.getpid():
+                return
+            threading.Thread(target=self._sync_loop, name='job-index-sync', daemon=True).start()
+            self._sync_pid = os.getpid()
+
+    def _sync_loop(self):
+        while True:
+            time.sleep(self.sync_interval)
+            with self._app.app_context():
+                try:
+                    self.sync_jobs()
+                except Exception as e:
+                    self._app.logger.warning(f'Job index sync failed: {e}')
+
+    def sync_jobs(self):
+        """
+        Apply the job writes of every worker process to this process's index
+
+        Each process holds its own copy of the model, and add_job and
+        remove_jobs only update the process that handled the write. Every
+        JOB_INDEX_SYNC_INTERVAL seconds, each process re-reads the jobs
+        updated and the deletions (JobDeletion) recorded since its last
+        sync, minus SYNC_OVERLAP, and applies the versions it has not
+        indexed yet.
+
+        Returns (indexed, removed): the numbers of jobs added and dropped.
+        """
+        with self._lock:
+            model, since = self.model, self._synced_at
+        if model is None or since is None:
+            return 0, 0
+        since -= SYNC_OVERLAP
+
+        jobs = Job.query.options(selectinload(Job.skills)).filter(Job.updated_at >= since).all()
+        deletions = db.session.query(JobDeletion.job_id, JobDeletion.deleted_at).filter(
+            JobDeletion.deleted_at >= since
+        ).all()
+
+        versions = {job.id: job.updated_at for job in jobs}
+        versions.update(deletions)
+        with self._lock:
+            changed = {job_id for job_id, version in versions.items() if self._synced_versions.get(job_id) != version}
 
+        rows = [
+            self._job_row(job.to_dict(), [skill.name for skill in job.skills])
+            for job in jobs if job.id in changed and job.is_active
+        ]
+        removed = [job.id for job in jobs if job.id in changed and not job.is_active]
+        removed.extend(job_id for job_id, _ in deletions if job_id in changed)
 
-# backend/controllers/recommendation_controller.py
-from flask import jsonify
-from services.recommendation_service import recommendation_service
-
-def get_recommendations(current_user, args):
-    """Get job recommendations for the current user"""
-    try:
-        limit = int(args.get('limit', 10))
-        recommendations = recommendation_service.get_recommendations_for_user(current_user['id'], limit)
-        return jsonify({
-            'success': True,
-            'recommendations': recommendations
-        }), 200
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': str(e)
-        }), 500
+        if rows:
+            self._content_model(model).add_jobs(pd.DataFrame(rows))
+        if removed:
+            self._content_model(model).remove_jobs(removed)
+            if self.cache is not None:
+                self.cache.clear()
+
+        with self._lock:
+            if self.model is model:
+                self._record_versions(versions)
+        return len(rows), len(removed)
+
+    def _record_versions(self, versions):
+        """Remember indexed job versions; call with self._lock held"""
+        self._synced_versions.update(versions)
+        self._synced_at = max([self._synced_at, *versions.values()])
+        # Older versions are no longer re-read
+        horizon = self._synced_at - SYNC_OVERLAP
+        self._synced_versions = {
+            job_id: version for job_id, version in self._synced_versions.items() if version >= horizon
+        }
+
+    def warmup(self):
+        """Load the model and run one recommendation so the first request is fast"""
+        model = self.get_model()
+        self._score(model, 'software engineer python sql', None, 1)
+
+    @staticmethod
+    def _content_model(model):
+        """The content-based part of a model (itself unless hybrid)"""
+        return getattr(model, 'content_based', model)
+
+    def _score(self, model, user_document, user_id, limit, filters=None, timings=None, applied_job_ids=None):
+        if hasattr(model, 'content_based'):
+            return model.get_recommendations(
+                user_document, user_id=user_id, top_n=limit, filters=filters, timings=timings,
+                applied_job_ids=applied_job_ids
+            )
+        return model.get_recommendations(user_document, top_n=limit, filters=filters, timings=timings)
+
+    @staticmethod
+    def build_user_document(profile):
+        """Text document describing a profile: titles, summary, skills and experience"""
+        parts = [profile.job_title, profile.headline, profile.summary, profile.education]
+        parts.extend(skill.name for skill in profile.skills)
+        for experience in profile.experiences:
+            parts.extend([experience.title, experience.description])
+        return ' '.join(part for part in parts if part)
+
+    def get_recommendations_for_user(self, user_id, limit=10, filters=None):
+        """
+        Recommend jobs for a user from their profile
+
+        filters: Optional job attribute filters (location, job_type,
+        experience_level, salary_min, salary_max), applied by the model
+        before top-N selection.
+
+        Returns (recommendations, timings). Each recommendation is the job
+        dictionary plus its similarity_score; timings maps each stage (model,
+        cache, profile_query, applications_query, then the model's
+        preprocess, transform, similarity and, for hybrid models,
+        collaborative stages, and job_query) to milliseconds. Jobs the user
+        has applied to are not recommended; a hybrid model folds them into
+        the user's collaborative filtering interactions. With coalesced serving, the model stages
+        are replaced by scoring_queue and batch_scoring.
+        """
+        timer = StageTimer()
+
+        # Filtered results are cached next to the unfiltered ones
+        variant = limit
+        if filters:
+            variant = f'{limit}:{json.dumps(filters, sort_keys=True)}'
+
+        with timer.stage('model'):
+            model = self.get_model()
+
+        if self.cache is not None:
+            with timer.stage('cache'):
+                generation = self.cache.generation(user_id)
+                cached = self.cache.get(user_id, self.model_version, variant, generation)
+            if cached is not None:
+                return cached, timer.timings
+
+        # Profile, skills and experiences in one query
+        with timer.stage('profile_query'):
+            profile = Profile.query.options(
+                joinedload(Profile.skills), joinedload(Profile.experiences)
+            ).filter_by(user_id=user_id).first()
+
+        if profile is None:
+            return [], timer.timings
+
+        user_document = self.build_user_document(profile)
+        if not user_document:
+            return [], timer.timings
+
+        with timer.stage('applications_query'):
+            applied_job_ids = [
+                job_id for job_id, in Application.query.with_entities(Application.job_id).filter_by(user_id=user_id)
+            ]
+
+        # Score enough jobs to fill the limit once applied jobs are dropped
+        top_n = limit + len(applied_job_ids)
+        if self.scorer is not None:
+            # Raise ScoringOverloaded when the scoring queue is full, and
+            # ScoringTimeout (a ScoringOverloaded) when it is not served in time
+            future = self.scorer.submit(model, user_document, user_id, top_n, filters, applied_job_ids)
+            scored = self.scorer.wait(future, self.scoring_timeout)
+            timer.timings.update(future.timings)
+        else:
+            scored = self._score(model, user_document, user_id, top_n, filters, timer.timings, applied_job_ids)
+
+        applied = set(applied_job_ids)
+        scored = [rec for rec in scored if str(rec['job_id']) not in applied][:limit]
+
+        with timer.stage('job_query'):
+            job_ids = [str(rec['job_id']) for rec in scored]
+            jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+
+        recommendations = []
+        for job_id, rec in zip(job_ids, scored):
+            job = jobs.get(job_id)
+            if job is not None:
+                job_data = job.to_dict()
+                job_data['similarity_score'] = rec['similarity_score']
+                recommendations.append(job_data)
+
+        if self.cache is not None:
+            self.cache.set(user_id, self.model_version, variant, recommendations, generation)
+
+        return recommendations, timer.timings
+
+    def invalidate_user(self, user_id):
+        """Drop cached recommendations of a user whose profile changed"""
+        if self.cache is not None:
+            self.cache.invalidate_user(user_id)
+
+    @staticmethod
+    def _job_row(job, skills=None):
+        """Model input row of a job dictionary"""
+        row = {
+            'id': job['id'],
+            'title': job['title'],
+            'description': job['description'],
+            'skills': skills if isinstance(skills, list) else [],
+            'is_active': job.get('is_active', True),
+        }
+        row.update({name: job[name] for name in JOB_ATTRIBUTES if name in job})
+        return row
+
+    def _written(self, job_ids, version):
+        # Versions indexed here are skipped by this process's next sync
+        if version is not None:
+            with self._lock:
+                self._record_versions({job_id: version for job_id in job_ids})
+
+    def add_job(self, job, skills=None, version=None):
+        """
+        Index a new or updated job so it can be recommended without a
+        retrain; an inactive job replaces its previous row and is not
+        recommended. Cached results pick it up when they expire. Other
+        processes index it on their next sync_jobs.
+        version: updated_at of the job, if known
+        """
+        if self.model is None:
+            return
+
+        self._content_model(self.model).add_jobs(pd.DataFrame([self._job_row(job, skills)]))
+        self._written([job['id']], version)
+
+    def remove_jobs(self, job_ids, version=None):
+        """
+        Stop recommending deleted or deactivated jobs, including cached
+        results; other processes drop them on their next sync_jobs
+        version: updated_at (or deleted_at) of the jobs, if known
+        """
+        if self.model is None:
+            return
+
+        self._content_model(self.model).remove_jobs(job_ids)
+        if self.cache is not None:
+            self.cache.clear()
+        self._written(job_ids, version)
+
+recommendation_service = RecommendationService()
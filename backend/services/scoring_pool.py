@@ -0,0 +1,185 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from utils.metrics import metrics
+
+class ScoringOverloaded(RuntimeError):
+    """The scoring queue is full; the client should retry later"""
+
+class ScoringTimeout(ScoringOverloaded):
+    """A queued request was not scored in time and was abandoned"""
+
+class _ScoringRequest:
+    __slots__ = ('model', 'user_document', 'user_id', 'limit', 'filters', 'applied_job_ids', 'future', 'enqueued_at')
+
+    def __init__(self, model, user_document, user_id, limit, filters, applied_job_ids):
+        self.model = model
+        self.user_document = user_document
+        self.user_id = user_id
+        self.limit = limit
+        self.filters = filters
+        self.applied_job_ids = applied_job_ids
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+class CoalescingScorer:
+    """
+    Dedicated scoring threads that batch concurrent recommendation requests
+
+    Request threads submit a user document and wait on a future. A worker
+    takes the first queued request, keeps collecting requests for up to
+    window_ms (or until max_batch), then scores each group sharing a model,
+    filters and limit with a single get_recommendations_batch call, which
+    preprocesses and transforms the whole group together:
+
+    - groups of at least matmul_batch requests are scored against every job
+      with one sparse matrix product, and exact top-N selection
+    - smaller groups use the ANN or inverted index search per user, like
+      single-request scoring
+
+    On the synthetic corpus (ml/benchmarks), the matrix product scored 260
+    users/s in groups of 8 against 150 for the per-user index search (20k
+    jobs), and 250 against 70 users/s in groups of 64 (100k jobs); below
+    about 8 users the index search is faster. With 16 concurrent clients
+    (benchmark_concurrent_scoring, 20k jobs, one core), coalescing served
+    395 requests/s against 145 scoring inline; a lone client pays the
+    batching window and gets about half the inline throughput.
+
+    Both paths return the same jobs, except that the matrix product is
+    exact where a model's ANN index, or the hybrid model's candidate
+    search, approximates.
+
+    The queue holds at most max_queue requests; submit raises
+    ScoringOverloaded beyond that, so a burst is shed with 503s instead of
+    piling up unbounded latency. A request whose caller stopped waiting is
+    cancelled (see wait) and skipped by the workers.
+    """
+
+    def __init__(self, workers=1, max_batch=64, window_ms=2.0, max_queue=1024, matmul_batch=8):
+        self.workers = workers
+        self.max_batch = max_batch
+        self.matmul_batch = matmul_batch
+        self.window = window_ms / 1000
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.rejected = 0
+        self.abandoned = 0
+
+    def collect_metrics(self):
+        yield 'recommendation_scoring_queue_depth', {}, self._queue.qsize()
+        yield 'recommendation_scoring_batches_total', {}, self.batches
+        yield 'recommendation_scoring_requests_total', {'outcome': 'scored'}, self.requests
+        yield 'recommendation_scoring_requests_total', {'outcome': 'rejected'}, self.rejected
+        yield 'recommendation_scoring_requests_total', {'outcome': 'abandoned'}, self.abandoned
+
+    def _ensure_started(self):
+        # Threads do not survive a fork; start them in the serving process
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f'recommendation-scorer-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, model, user_document, user_id, limit, filters=None, applied_job_ids=None):
+        """Queue a request; returns a Future of its scored recommendations"""
+        self._ensure_started()
+        request = _ScoringRequest(model, user_document, user_id, limit, filters, applied_job_ids)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise ScoringOverloaded('Recommendation scoring is overloaded, retry later')
+        return request.future
+
+    def wait(self, future, timeout):
+        """
+        Result of a submitted request, waiting at most timeout seconds
+
+        On timeout the request is cancelled so no worker scores it for
+        nobody, and ScoringTimeout is raised.
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.abandoned += 1
+            raise ScoringTimeout('Recommendation scoring timed out, retry later')
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+
+            groups = {}
+            for request in batch:
+                # False if the waiting thread gave up and cancelled it
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                key = (id(request.model), json.dumps(request.filters or {}, sort_keys=True), request.limit)
+                groups.setdefault(key, []).append(request)
+
+            for group in groups.values():
+                self._score_group(group)
+
+    def _score_group(self, group):
+        start = time.perf_counter()
+        model = group[0].model
+        documents = [request.user_document for request in group]
+        top_n = group[0].limit
+        use_index = len(group) < self.matmul_batch
+        try:
+            if hasattr(model, 'content_based'):
+                results = model.get_recommendations_batch(
+                    documents, [request.user_id for request in group], top_n=top_n, filters=group[0].filters,
+                    applied_job_ids=[request.applied_job_ids or [] for request in group], use_index=use_index
+                )
+            else:
+                results = model.get_recommendations_batch(
+                    documents, top_n=top_n, filters=group[0].filters, use_index=use_index
+                )
+        except Exception as e:
+            for request in group:
+                request.future.timings = {}
+                request.future.set_exception(e)
+            return
+
+        duration = time.perf_counter() - start
+        metrics.observe('recommendation_scoring_batch_seconds', duration)
+        with self._lock:
+            self.batches += 1
+            self.requests += len(group)
+        for request, recommendations in zip(group, results):
+            # Stage timings of the request, read by the waiting thread
+            request.future.timings = {
+                'scoring_queue': (start - request.enqueued_at) * 1000,
+                'batch_scoring': duration * 1000,
+            }
+            request.future.set_result(recommendations)
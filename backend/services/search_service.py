@@ -0,0 +1,202 @@
+import re
+import threading
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func, literal_column, text
+from models.db import db
+from models.job import Job
+
+# Indexed job columns, with their bm25 weight (SQLite) and tsvector weight
+# label (PostgreSQL); matches in titles count the most
+SEARCH_COLUMNS = [('title', 10.0, 'A'), ('location', 4.0, 'B'), ('company', 2.0, 'C'), ('description', 1.0, 'D')]
+
+# Search terms kept from a query string
+MAX_TERMS = 16
+
+SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, location, company, description,
+        content='jobs', content_rowid='rowid', tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, location, company, description)
+        VALUES (new.rowid, new.title, new.location, new.company, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, location, company, description)
+        VALUES ('delete', old.rowid, old.title, old.location, old.company, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, location, company, description ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, location, company, description)
+        VALUES ('delete', old.rowid, old.title, old.location, old.company, old.description);
+        INSERT INTO jobs_fts(rowid, title, location, company, description)
+        VALUES (new.rowid, new.title, new.location, new.company, new.description);
+    END""",
+]
+
+POSTGRESQL_INDEX = [
+    """ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(company, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'D')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+def search_terms(value):
+    """Words of a query string; anything else (quotes, operators) is dropped"""
+    return re.findall(r'\w+', value or '')[:MAX_TERMS]
+
+class JobSearch:
+    """
+    Full-text search over jobs, backed by the database's own text index
+
+    SQLite uses an FTS5 table over the jobs rows, kept in sync by triggers
+    and ranked with bm25; PostgreSQL uses a generated, weighted tsvector
+    column with a GIN index, ranked with ts_rank_cd. Both are created by the
+    migrations or by `flask search reindex`, so every write path (the API,
+    bulk loads, manual SQL) stays indexed. Terms are matched as prefixes, like
+    the substring filters they replace. Other databases, or databases whose
+    index was not created yet, fall back to ILIKE filters.
+
+    SQLite's VACUUM may renumber the rowids the FTS table refers to; run
+    `flask search reindex` after it.
+    """
+
+    def __init__(self):
+        self._available = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.cli.add_command(search_cli)
+
+    def _dialect(self):
+        return db.session.get_bind().dialect.name
+
+    def available(self):
+        """Whether the current database has a search index (checked once per engine)"""
+        bind = db.session.get_bind()
+        key = str(bind.url)
+        with self._lock:
+            if key in self._available:
+                return self._available[key]
+
+        dialect = bind.dialect.name
+        if dialect == 'sqlite':
+            found = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+            ).first()
+        elif dialect == 'postgresql':
+            found = db.session.execute(text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'jobs' AND column_name = 'search_vector'"
+            )).first()
+        else:
+            found = None
+
+        with self._lock:
+            self._available[key] = found is not None
+        return found is not None
+
+    def create_index(self):
+        """Create the search index of the current database if it is missing"""
+        dialect = self._dialect()
+        if dialect == 'sqlite':
+            statements = SQLITE_INDEX
+        elif dialect == 'postgresql':
+            statements = POSTGRESQL_INDEX
+        else:
+            raise NotImplementedError(f'Full-text search is not supported on {dialect}')
+        for statement in statements:
+            db.session.execute(text(statement))
+        db.session.commit()
+        with self._lock:
+            self._available.clear()
+
+    def reindex(self):
+        """Create the search index if needed and rebuild it from the jobs table"""
+        self.create_index()
+        if self._dialect() == 'sqlite':
+            db.session.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+            # Merge the index b-trees, as after a bulk load
+            db.session.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('optimize')"))
+        else:
+            db.session.execute(text('REINDEX INDEX ix_jobs_search_vector'))
+        db.session.commit()
+        return db.session.query(func.count(Job.id)).scalar()
+
+    def search(self, query, q=None, title=None, location=None):
+        """
+        Restrict a Job query to matches of q (any indexed column), title and
+        location
+
+        Returns (query, relevance): relevance is an ORDER BY clause ranking
+        the matches of q, or None when q has no terms or there is no index.
+        """
+        q, title, location = search_terms(q), search_terms(title), search_terms(location)
+        if not (q or title or location):
+            return query, None
+
+        if not self.available():
+            return self._search_like(query, q, title, location), None
+        if self._dialect() == 'sqlite':
+            return self._search_sqlite(query, q, title, location)
+        return self._search_postgresql(query, q, title, location)
+
+    @staticmethod
+    def _search_like(query, q, title, location):
+        for term in q:
+            query = query.filter(db.or_(*[
+                getattr(Job, column).ilike(f'%{term}%') for column, _, _ in SEARCH_COLUMNS
+            ]))
+        for column, terms in ((Job.title, title), (Job.location, location)):
+            for term in terms:
+                query = query.filter(column.ilike(f'%{term}%'))
+        return query
+
+    @staticmethod
+    def _search_sqlite(query, q, title, location):
+        def group(terms, column=None):
+            expression = '(' + ' AND '.join(f'"{term}"*' for term in terms) + ')'
+            return f'{column} : {expression}' if column else expression
+
+        groups = [group(q)] if q else []
+        groups += [group(terms, column) for column, terms in (('title', title), ('location', location)) if terms]
+
+        fts = literal_column('jobs_fts')
+        relevance = func.bm25(fts, *[weight for _, weight, _ in SEARCH_COLUMNS]).label('relevance')
+        matches = (
+            db.select(literal_column('jobs_fts.rowid').label('job_rowid'), relevance)
+            .select_from(text('jobs_fts'))
+            .where(fts.op('MATCH')(' AND '.join(groups)))
+            .subquery('matches')
+        )
+        query = query.join(matches, matches.c.job_rowid == literal_column('jobs.rowid'))
+        # bm25 scores are negative, better matches first
+        return query, (matches.c.relevance.asc() if q else None)
+
+    @staticmethod
+    def _search_postgresql(query, q, title, location):
+        def tsquery(terms, weight=''):
+            return func.to_tsquery(literal_column("'english'::regconfig"),
+                                   ' & '.join(f'{term}:*{weight}' for term in terms))
+
+        vector = literal_column('jobs.search_vector')
+        for terms, weight in ((q, ''), (title, 'A'), (location, 'B')):
+            if terms:
+                query = query.filter(vector.op('@@')(tsquery(terms, weight)))
+        return query, (func.ts_rank_cd(vector, tsquery(q)).desc() if q else None)
+
+job_search = JobSearch()
+
+search_cli = AppGroup('search', help='Job full-text search index')
+
+@search_cli.command('reindex')
+def reindex_command():
+    """Create the job search index if needed and rebuild it"""
+    try:
+        count = job_search.reindex()
+    except NotImplementedError as e:
+        raise click.ClickException(str(e))
+    click.echo(f'Indexed {count} jobs')
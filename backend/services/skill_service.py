@@ -0,0 +1,135 @@
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import make_transient_to_detached
+from models.db import db
+from models.skill import Skill
+from utils.metrics import metrics
+
+# Names per IN clause, well below SQLite's bound parameter limit
+IN_CHUNK_SIZE = 500
+
+class SkillResolver:
+    """
+    Resolve lists of skill names to Skill rows in a constant number of queries
+
+    Names are looked up with one IN query; the missing ones are inserted
+    with a single multi-row INSERT that skips names another request created
+    concurrently, then read back. A process-wide LRU cache of name -> id
+    covers the hot skill vocabulary, so resolving known skills usually runs
+    no query at all. Skills are never deleted or renamed by the app; call
+    clear() if that changes.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('SKILL_CACHE_SIZE', 50000)
+        self.clear()
+        metrics.register_collector('skills', self.collect_metrics)
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+    def collect_metrics(self):
+        yield 'skill_cache_events_total', {'event': 'hits'}, self.hits
+        yield 'skill_cache_events_total', {'event': 'misses'}, self.misses
+
+    def _cached_ids(self, names):
+        with self._lock:
+            ids = {}
+            for name in names:
+                skill_id = self._ids.get(name)
+                if skill_id is not None:
+                    self._ids.move_to_end(name)
+                    ids[name] = skill_id
+            self.hits += len(ids)
+            self.misses += len(names) - len(ids)
+            return ids
+
+    def _cache(self, ids):
+        with self._lock:
+            self._ids.update(ids)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+
+    @staticmethod
+    def _select_ids(names):
+        ids = {}
+        for start in range(0, len(names), IN_CHUNK_SIZE):
+            chunk = names[start:start + IN_CHUNK_SIZE]
+            ids.update(db.session.execute(
+                db.select(Skill.name, Skill.id).where(Skill.name.in_(chunk))
+            ).all())
+        return ids
+
+    @staticmethod
+    def _insert_missing(names):
+        """Insert skills, skipping names that already exist"""
+        now = datetime.utcnow()
+        rows = [{'id': str(uuid.uuid4()), 'name': name, 'created_at': now} for name in names]
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            dialect_insert = None
+
+        if dialect_insert is not None:
+            statement = dialect_insert(Skill.__table__).on_conflict_do_nothing(index_elements=['name'])
+        elif dialect in ('mysql', 'mariadb'):
+            statement = insert(Skill.__table__).prefix_with('IGNORE')
+        else:
+            statement = insert(Skill.__table__)
+        db.session.execute(statement, rows)
+
+    def resolve_ids(self, names):
+        """
+        Dictionary of skill name -> id for names, creating missing skills in
+        the current transaction (committed by the caller)
+        """
+        names = list(dict.fromkeys(names))
+        ids = self._cached_ids(names)
+        missing = [name for name in names if name not in ids]
+        if not missing:
+            return ids
+
+        found = self._select_ids(missing)
+        # Skills inserted below are cached once a later request finds them,
+        # as this transaction may still roll back
+        self._cache(found)
+        ids.update(found)
+
+        missing = [name for name in missing if name not in found]
+        if missing:
+            self._insert_missing(missing)
+            ids.update(self._select_ids(missing))
+        return ids
+
+    def resolve(self, names):
+        """
+        Skill instances for a list of names, in order, without duplicates
+
+        Names are stripped and empty ones dropped. The instances are
+        attached to the session from their known id and name, without
+        loading the rows.
+        """
+        names = [name.strip() for name in names if isinstance(name, str) and name.strip()]
+        ids = self.resolve_ids(names)
+        skills = []
+        for name in dict.fromkeys(names):
+            skill = Skill(id=ids[name], name=name)
+            make_transient_to_detached(skill)
+            skills.append(db.session.merge(skill, load=False))
+        return skills
+
+skill_resolver = SkillResolver()
@@ -0,0 +1,116 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+import pytest
+
+# The backend imports its packages (models, services, ...) from its own directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('JWT_SECRET_KEY', 'smarthire-test-signing-key-0000000')
+
+from app import create_app
+from models.db import db
+from models.user import User
+from models.job import Job
+from models.skill import Skill
+from models.profile import Profile
+from models.experience import Experience
+from models.application import Application
+from controllers.auth_controller import generate_token
+from services.recommendation_service import recommendation_service
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'smarthire.db'}",
+        'ML_WARMUP': False,
+        # Every request reaches the views and their queries
+        'RECOMMENDATION_CACHE': 'none',
+        'RESPONSE_CACHE': 'none',
+        'JOB_INDEX_SYNC_INTERVAL': 0,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def make_user():
+    def make(role='job_seeker'):
+        user = User(email=f'{role}-{User.query.count()}@example.com', first_name='Test', last_name=role, role=role)
+        user.set_password('password')
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+@pytest.fixture
+def auth_headers():
+    def headers(user):
+        return {'Authorization': f'Bearer {generate_token(user.id)}'}
+    return headers
+
+@pytest.fixture
+def make_jobs():
+    def make(employer, n):
+        # A minute apart, later calls posting later, so listings have a stable order
+        posted = datetime(2024, 1, 1) + timedelta(days=Job.query.count())
+        jobs = [
+            Job(title=f'Python developer {i}', company='SmartHire', description='Build APIs with Flask',
+                requirements='Python, SQL', location='Remote', job_type='full-time',
+                experience_level='mid', salary_min=50000, salary_max=90000,
+                employer_id=employer.id, created_at=posted + timedelta(minutes=i))
+            for i in range(n)
+        ]
+        db.session.add_all(jobs)
+        db.session.commit()
+        return jobs
+    return make
+
+@pytest.fixture
+def make_applications():
+    def make(user, jobs):
+        applications = [Application(user_id=user.id, job_id=job.id) for job in jobs]
+        db.session.add_all(applications)
+        db.session.commit()
+        return applications
+    return make
+
+@pytest.fixture
+def make_profile():
+    def make(user, n_skills=1, n_experiences=1):
+        profile = Profile(user_id=user.id, job_title='Backend engineer', summary='Python and SQL')
+        profile.skills = [Skill(name=f'{user.id}-skill-{i}') for i in range(n_skills)]
+        profile.experiences = [
+            Experience(title=f'Engineer {i}', company='Acme', start_date=date(2020, 1, 1))
+            for i in range(n_experiences)
+        ]
+        db.session.add(profile)
+        db.session.commit()
+        return profile
+    return make
+
+class StaticModel:
+    """Recommendation model returning the given jobs in order"""
+
+    def __init__(self, job_ids):
+        self.job_ids = job_ids
+
+    def get_recommendations(self, user_document, top_n=10, filters=None, timings=None):
+        return [{'job_id': job_id, 'similarity_score': 1.0} for job_id in self.job_ids[:top_n]]
+
+@pytest.fixture
+def recommend_jobs():
+    """Serve recommendations of the given jobs instead of a trained model"""
+    def serve(jobs):
+        recommendation_service.model = StaticModel([job.id for job in jobs])
+        recommendation_service.model_version = 'test'
+    yield serve
+    recommendation_service.model = None
+    recommendation_service.model_version = None
@@ -0,0 +1,38 @@
+from models.db import db
+from services.recommendation_cache import MemoryCacheBackend
+from utils.http_cache import response_cache
+
+def test_unchanged_listing_is_not_modified(client, make_user, make_jobs):
+    make_jobs(make_user('employer'), 2)
+    etag = client.get('/api/jobs').headers['ETag']
+
+    response = client.get('/api/jobs', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+def test_deleting_a_job_changes_the_listing_etag(client, make_user, make_jobs, auth_headers):
+    employer = make_user('employer')
+    older, newer = make_jobs(employer, 2)
+    etag = client.get('/api/jobs').headers['ETag']
+
+    assert client.delete(f'/api/jobs/{older.id}', headers=auth_headers(employer)).status_code == 200
+
+    response = client.get('/api/jobs', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert [job['id'] for job in response.get_json()['jobs']] == [newer.id]
+
+def test_cached_listing_follows_writes_of_other_processes(client, make_user, make_jobs):
+    # Writes through the session stand in for another worker: they do not
+    # clear this process's response cache
+    response_cache.backend = MemoryCacheBackend()
+    older, newer = make_jobs(make_user('employer'), 2)
+    assert len(client.get('/api/jobs').get_json()['jobs']) == 2
+
+    db.session.delete(older)
+    db.session.commit()
+    assert [job['id'] for job in client.get('/api/jobs').get_json()['jobs']] == [newer.id]
+
+    newer.title = 'Renamed'
+    db.session.commit()
+    assert client.get(f'/api/jobs/{newer.id}').get_json()['job']['title'] == 'Renamed'
+    assert client.get('/api/jobs').get_json()['jobs'][0]['title'] == 'Renamed'
@@ -0,0 +1,65 @@
+import os
+import sys
+from datetime import datetime
+import pandas as pd
+import pytest
+from models.db import db
+from models.job import Job
+from models.job_deletion import JobDeletion
+from services.recommendation_service import recommendation_service
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def job_index(app):
+    """A content-based model indexing one job, synced as of 2000"""
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+    from ml.models.content_based_recommender import ContentBasedRecommender
+
+    model = ContentBasedRecommender()
+    model.fit(pd.DataFrame([
+        {'id': 'trained', 'title': 'Accountant', 'description': 'Audit ledgers and taxes', 'skills': ['accounting']},
+        {'id': 'other', 'title': 'Nurse', 'description': 'Care for hospital patients', 'skills': ['nursing']},
+    ]))
+    recommendation_service.model = model
+    recommendation_service._synced_at = datetime(2000, 1, 1)
+    recommendation_service._synced_versions = {}
+    yield model
+    recommendation_service.model = None
+    recommendation_service._synced_at = None
+    recommendation_service._synced_versions = {}
+
+def _recommended(model, document):
+    return {row['job_id'] for row in model.get_recommendations(document, top_n=10)}
+
+def test_sync_indexes_jobs_written_by_other_processes(job_index, make_user, make_jobs):
+    # Jobs written through the session stand in for another worker's writes
+    job, = make_jobs(make_user('employer'), 1)
+    assert job.id not in _recommended(job_index, 'python flask apis')
+
+    assert recommendation_service.sync_jobs() == (1, 0)
+    assert job.id in _recommended(job_index, 'python flask apis')
+    # Versions already indexed are skipped
+    assert recommendation_service.sync_jobs() == (0, 0)
+
+    job.is_active = False
+    db.session.commit()
+    assert recommendation_service.sync_jobs() == (0, 1)
+    assert job.id not in _recommended(job_index, 'python flask apis')
+
+def test_sync_drops_jobs_deleted_by_other_processes(job_index):
+    db.session.add(JobDeletion(job_id='trained'))
+    db.session.commit()
+
+    assert recommendation_service.sync_jobs() == (0, 1)
+    assert 'trained' not in _recommended(job_index, 'accountant audit ledgers')
+    assert recommendation_service.sync_jobs() == (0, 0)
+
+def test_deleting_a_job_records_a_tombstone(client, make_user, make_jobs, auth_headers):
+    employer = make_user('employer')
+    job, = make_jobs(employer, 1)
+
+    assert client.delete(f'/api/jobs/{job.id}', headers=auth_headers(employer)).status_code == 200
+    assert db.session.get(JobDeletion, job.id) is not None
+    assert db.session.get(Job, job.id) is None
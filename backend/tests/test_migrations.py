@@ -0,0 +1,50 @@
+import os
+import pytest
+from flask_migrate import downgrade, stamp, upgrade
+from sqlalchemy import text
+from app import create_app
+from models.db import db
+from conftest import BACKEND_DIR
+
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations')
+
+# Schema the first migration applies to; earlier tables are not migrated
+BASE_REVISION = 'ae6180ec25d8'
+
+@pytest.fixture
+def migrated_app(tmp_path):
+    """App on a database upgraded through every migration from BASE_REVISION"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'migrated.db'}",
+        'ML_WARMUP': False,
+        'RECOMMENDATION_CACHE': 'none',
+        'RESPONSE_CACHE': 'none',
+    })
+    with app.app_context():
+        db.create_all()
+        stamp(MIGRATIONS_DIR, 'head')
+        downgrade(MIGRATIONS_DIR, BASE_REVISION)
+        upgrade(MIGRATIONS_DIR)
+        yield app
+        db.session.remove()
+
+def test_upgrade_keeps_search_triggers(migrated_app):
+    triggers = {
+        name for name, in db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))
+    }
+    assert triggers == {'jobs_fts_insert', 'jobs_fts_delete', 'jobs_fts_update'}
+
+def test_jobs_created_after_upgrade_are_searchable(migrated_app, make_user, auth_headers):
+    client = migrated_app.test_client()
+    employer = make_user('employer')
+    response = client.post('/api/jobs', headers=auth_headers(employer), json={
+        'title': 'Senior Python Engineer', 'company': 'SmartHire', 'location': 'Lagos',
+        'description': 'Build hiring APIs', 'job_type': 'full-time', 'experience_level': 'senior',
+    })
+    assert response.status_code == 201
+    job_id = response.get_json()['job']['id']
+
+    for query in ('q=python', 'title=python', 'location=lagos'):
+        jobs = client.get(f'/api/jobs?{query}').get_json()['jobs']
+        assert [job['id'] for job in jobs] == [job_id], query
@@ -0,0 +1,48 @@
+from datetime import datetime
+from models.db import db
+
+def _walk(client, url):
+    """IDs of every job listed by following next_cursor from url"""
+    job_ids = []
+    cursor = None
+    while True:
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        job_ids.extend(job['id'] for job in body['jobs'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return job_ids
+
+def test_cursor_pages_list_every_job_once_in_order(client, make_user, make_jobs):
+    employer = make_user('employer')
+    jobs = make_jobs(employer, 7)
+    # Jobs posted at the same time are ordered by ID
+    for job in jobs[2:5]:
+        job.created_at = datetime(2024, 6, 1)
+    db.session.commit()
+    expected = [job.id for job in sorted(jobs, key=lambda job: (job.created_at, job.id), reverse=True)]
+
+    for limit in (1, 3, 7, 50):
+        assert _walk(client, f'/api/jobs?limit={limit}') == expected
+
+def test_cursor_pages_match_numbered_pages(client, make_user, make_jobs):
+    make_jobs(make_user('employer'), 5)
+    numbered = []
+    for page in (1, 2, 3):
+        numbered.extend(job['id'] for job in client.get(f'/api/jobs?limit=2&page={page}').get_json()['jobs'])
+
+    assert _walk(client, '/api/jobs?limit=2') == numbered
+
+def test_cursor_pages_keep_filters(client, make_user, make_jobs):
+    jobs = make_jobs(make_user('employer'), 6)
+    for job in jobs[::2]:
+        job.job_type = 'contract'
+    db.session.commit()
+
+    assert set(_walk(client, '/api/jobs?limit=2&job_type=contract')) == {job.id for job in jobs[::2]}
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get('/api/jobs?cursor=not-a-cursor')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid cursor'
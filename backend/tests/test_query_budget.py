@@ -0,0 +1,91 @@
+import pytest
+from models.db import db
+from models.user import User
+from utils.query_budget import QueryBudgetExceeded, QueryCounter, query_budget
+
+def count_queries(client, method, url, **kwargs):
+    """Statements run by one request, which must succeed"""
+    with QueryCounter(db.engine) as counter:
+        response = client.open(url, method=method, **kwargs)
+    assert response.status_code == 200, response.get_json()
+    return counter.count
+
+def test_query_counter_counts_statements_of_the_block(app):
+    with QueryCounter(db.engine) as counter:
+        User.query.all()
+        User.query.count()
+    User.query.all()
+    assert counter.count == 2
+    assert all('users' in statement for statement in counter.statements)
+
+def test_query_budget_fails_over_budget(app, client):
+    @app.route('/over-budget')
+    @query_budget(1)
+    def over_budget():
+        User.query.all()
+        User.query.all()
+        return {}
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/over-budget')
+
+def test_job_listing_queries_do_not_grow_with_jobs(client, make_user, make_jobs):
+    employer = make_user('employer')
+    make_jobs(employer, 2)
+    few = count_queries(client, 'GET', '/api/jobs?limit=50')
+    make_jobs(employer, 40)
+    many = count_queries(client, 'GET', '/api/jobs?limit=50')
+    assert many == few
+
+def test_job_detail_queries(client, make_user, make_jobs):
+    employer = make_user('employer')
+    job, = make_jobs(employer, 1)
+    assert count_queries(client, 'GET', f'/api/jobs/{job.id}') <= 2
+
+def test_user_applications_queries_do_not_grow_with_applications(
+        client, make_user, make_jobs, make_applications, auth_headers):
+    employer = make_user('employer')
+    seeker = make_user()
+    headers = auth_headers(seeker)
+
+    make_applications(seeker, make_jobs(employer, 2))
+    few = count_queries(client, 'GET', '/api/applications?limit=100', headers=headers)
+    make_applications(seeker, make_jobs(employer, 40))
+    many = count_queries(client, 'GET', '/api/applications?limit=100', headers=headers)
+    assert many == few
+
+def test_job_applications_queries_do_not_grow_with_applications(
+        client, make_user, make_jobs, make_applications, auth_headers):
+    employer = make_user('employer')
+    job, = make_jobs(employer, 1)
+    url = f'/api/jobs/{job.id}/applications?limit=100'
+
+    make_applications(make_user(), [job])
+    few = count_queries(client, 'GET', url, headers=auth_headers(employer))
+    for _ in range(20):
+        make_applications(make_user(), [job])
+    many = count_queries(client, 'GET', url, headers=auth_headers(employer))
+    assert many == few
+
+def test_application_status_update_queries(client, make_user, make_jobs, make_applications, auth_headers):
+    employer = make_user('employer')
+    application, = make_applications(make_user(), make_jobs(employer, 1))
+    count = count_queries(
+        client, 'PUT', f'/api/applications/{application.id}/status',
+        json={'status': 'reviewed'}, headers=auth_headers(employer)
+    )
+    assert count <= 3
+
+def test_recommendation_queries_do_not_grow_with_results(
+        client, make_user, make_jobs, make_profile, make_applications, recommend_jobs, auth_headers):
+    employer = make_user('employer')
+    seeker = make_user()
+    headers = auth_headers(seeker)
+    make_profile(seeker, n_skills=5, n_experiences=3)
+    jobs = make_jobs(employer, 40)
+    recommend_jobs(jobs)
+
+    few = count_queries(client, 'GET', '/api/recommendations?limit=2', headers=headers)
+    make_applications(seeker, jobs[:10])
+    many = count_queries(client, 'GET', '/api/recommendations?limit=25', headers=headers)
+    assert many == few
@@ -0,0 +1,49 @@
+import logging
+import tempfile
+from services import recommendation_cache
+from services.recommendation_cache import (
+    MemoryCacheBackend, RecommendationCache, SQLiteCacheBackend, create_cache_backend
+)
+
+RESULTS = [{'id': 'job-1', 'similarity_score': 0.5}]
+
+def test_memory_cache_of_several_workers_falls_back_to_sqlite(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    # Alembic's logging configuration (see test_migrations) disables existing loggers
+    monkeypatch.setattr(recommendation_cache.logger, 'disabled', False)
+    with caplog.at_level(logging.WARNING):
+        backend = create_cache_backend('memory', processes=4)
+
+    assert isinstance(backend, SQLiteCacheBackend)
+    assert backend.path.startswith(str(tmp_path))
+    assert 'cannot be invalidated across 4 workers' in caplog.text
+    assert isinstance(create_cache_backend('memory', processes=1), MemoryCacheBackend)
+
+def test_results_are_served_until_the_user_is_invalidated():
+    cache = RecommendationCache(MemoryCacheBackend())
+    generation = cache.generation('user-1')
+    cache.set('user-1', 'v1', 10, RESULTS, generation)
+    assert cache.get('user-1', 'v1', 10, cache.generation('user-1')) == RESULTS
+
+    cache.invalidate_user('user-1')
+    assert cache.get('user-1', 'v1', 10, cache.generation('user-1')) is None
+
+def test_results_computed_before_an_invalidation_are_not_stored():
+    cache = RecommendationCache(MemoryCacheBackend())
+    for invalidate in (lambda: cache.invalidate_user('user-1'), cache.clear):
+        generation = cache.generation('user-1')
+        invalidate()
+        cache.set('user-1', 'v1', 10, RESULTS, generation)
+
+        assert cache.get('user-1', 'v1', 10, cache.generation('user-1')) is None
+    assert cache.stats()['stale_writes'] == 2
+
+def test_entries_stored_under_an_older_generation_are_misses(tmp_path):
+    # A write that checked the generation just before an invalidation
+    cache = RecommendationCache(SQLiteCacheBackend(str(tmp_path / 'cache.db')))
+    generation = cache.generation('user-1')
+    cache.backend.set('user-1', {'model_version': 'v1', 'generation': generation, 'results': {'10': RESULTS}})
+    cache.invalidate_user('user-1')
+    cache.backend.set('user-1', {'model_version': 'v1', 'generation': generation, 'results': {'10': RESULTS}})
+
+    assert cache.get('user-1', 'v1', 10, cache.generation('user-1')) is None
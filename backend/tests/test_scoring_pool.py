@@ -0,0 +1,35 @@
+import os
+import sys
+import pandas as pd
+import pytest
+from services.scoring_pool import CoalescingScorer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DOCUMENTS = ['python sql', 'hospital nurse', 'audit taxes', '', 'python', 'sales excel']
+
+@pytest.fixture(scope='module')
+def model():
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+    from ml.models.content_based_recommender import ContentBasedRecommender
+
+    words = ['python', 'sql', 'excel', 'nurse', 'hospital', 'audit', 'taxes', 'sales']
+    return ContentBasedRecommender().fit(pd.DataFrame([
+        {'id': f'job-{i}', 'title': words[i % 8], 'description': f'{words[i * 3 % 8]} {words[i * 5 % 8]}', 'skills': []}
+        for i in range(64)
+    ]))
+
+def _job_ids(recommendations):
+    return [recommendation['job_id'] for recommendation in recommendations]
+
+@pytest.mark.parametrize('matmul_batch', [1, 1000])
+def test_coalesced_requests_get_their_own_recommendations(model, matmul_batch):
+    # A long window batches every request, scored with one matrix product
+    # (matmul_batch=1) or one index search each
+    scorer = CoalescingScorer(window_ms=200, matmul_batch=matmul_batch)
+    requests = [(document, limit) for document in DOCUMENTS for limit in (3, 10)]
+    futures = [scorer.submit(model, document, None, limit) for document, limit in requests]
+
+    for (document, limit), future in zip(requests, futures):
+        assert _job_ids(scorer.wait(future, 10)) == _job_ids(model.get_recommendations(document, top_n=limit))
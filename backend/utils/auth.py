@@ -1,8 +1,127 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from functools import wraps
+from collections import OrderedDict
 import jwt
 import os
+import threading
+import time
 from models.user import User
+from utils.metrics import metrics, stage
+
+# User fields embedded in tokens, so the principal can be built without a query
+PRINCIPAL_CLAIMS = ['email', 'first_name', 'last_name', 'role', 'created_at']
+
+class PrincipalCache:
+    """
+    Short-lived, per-process cache of user principals and token versions
+
+    An entry is trusted for ttl seconds. Revoking a user's tokens bumps
+    users.token_version, which this process sees immediately (the entry is
+    dropped) and other processes within ttl seconds.
+    """
+
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """(token_version, principal) of a user, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def set(self, user_id, token_version, principal):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, token_version, principal)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def collect_metrics(self):
+        yield 'auth_principal_cache_events_total', {'event': 'hits'}, self.hits
+        yield 'auth_principal_cache_events_total', {'event': 'misses'}, self.misses
+
+principal_cache = PrincipalCache()
+
+def init_auth(app):
+    """Configure the principal cache from AUTH_PRINCIPAL_CACHE_TTL"""
+    principal_cache.ttl = app.config.get('AUTH_PRINCIPAL_CACHE_TTL', 30)
+    principal_cache.clear()
+    metrics.register_collector('auth', principal_cache.collect_metrics)
+
+def token_claims(user):
+    """Claims describing user, to embed in its tokens (see generate_token)"""
+    principal = user.to_dict()
+    claims = {name: principal[name] for name in PRINCIPAL_CLAIMS}
+    claims['ver'] = user.token_version or 0
+    return claims
+
+def revoke_tokens(user):
+    """
+    Invalidate every token issued to user so far
+
+    The caller commits the session. Other processes reject the old tokens
+    once their cached entry expires.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    principal_cache.invalidate(user.id)
+
+def _load_principal(user_id):
+    """(token_version, principal) from the database, or None if the user is gone"""
+    with stage('auth_user_query'):
+        user = User.query.filter_by(id=user_id).first()
+    if not user:
+        return None
+    return user.token_version or 0, user.to_dict()
+
+def _authenticate(data):
+    """
+    Principal of a decoded token, or None if the user is gone or the token
+    was revoked
+
+    With AUTH_STATELESS, principals and token versions come from the
+    principal cache and only a cache miss queries the database; tokens
+    carrying claims (see token_claims) are turned into the principal
+    directly. Otherwise the user is loaded on every request.
+    """
+    user_id = data['user_id']
+    stateless = current_app.config.get('AUTH_STATELESS')
+    if stateless:
+        entry = principal_cache.get(user_id)
+        if entry is None:
+            entry = _load_principal(user_id)
+            if entry is not None:
+                principal_cache.set(user_id, *entry)
+    else:
+        entry = _load_principal(user_id)
+
+    if entry is None:
+        return None
+    token_version, principal = entry
+    # Tokens issued before claims were embedded have no version
+    if data.get('ver', 0) != token_version:
+        return None
+
+    if stateless and 'role' in data:
+        principal = {'id': user_id}
+        principal.update({name: data.get(name) for name in PRINCIPAL_CLAIMS})
+    return principal
 
 def token_required(f):
     @wraps(f)
@@ -23,18 +142,18 @@ def token_required(f):
         
         try:
             # Verify token
-            data = jwt.decode(token, os.environ.get('JWT_SECRET_KEY'), algorithms=['HS256'])
-            user = User.query.filter_by(id=data['user_id']).first()
+            with stage('auth_decode'):
+                data = jwt.decode(token, os.environ.get('JWT_SECRET_KEY'), algorithms=['HS256'])
+            
+            # Return user info for controller use
+            current_user = _authenticate(data)
             
-            if not user:
+            if not current_user:
                 return jsonify({
                     'success': False,
                     'message': 'Invalid token'
                 }), 401
             
-            # Return user info for controller use
-            current_user = user.to_dict()
-            
         except jwt.ExpiredSignatureError:
             return jsonify({
                 'success': False,
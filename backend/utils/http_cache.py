@@ -0,0 +1,113 @@
+import hashlib
+import threading
+from functools import wraps
+from flask import Response, make_response, request
+from services.recommendation_cache import MemoryCacheBackend, create_cache_backend
+from utils.metrics import metrics, stage
+
+class ResponseCache:
+    """
+    Cache of anonymous GET responses, validated by a version of their data
+
+    Each cached view names a version function returning a cheap fingerprint
+    of the rows it renders, which every insert, update and delete of them
+    changes (e.g. their count and latest updated_at), or None when there is
+    nothing to render. The response gets a weak ETag derived from the
+    canonical request (path and sorted query arguments) and that version:
+
+    - an If-None-Match carrying the current ETag is answered with 304
+    - a cached body with the current ETag is served without calling the view
+    - otherwise the view runs and its 200 response is cached
+
+    A changed version therefore invalidates by itself, whichever process
+    wrote the rows; clear() frees the entries early. Bodies larger than
+    RESPONSE_CACHE_MAX_BODY bytes are not cached, which bounds the memory of
+    the in-process store to about RESPONSE_CACHE_SIZE times that.
+    """
+
+    def __init__(self):
+        self.backend = MemoryCacheBackend()
+        self.max_body = 256 * 1024
+        self.max_age = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        # Entries are checked against the current version on every request,
+        # so a per-process memory cache is safe with several workers
+        self.backend = create_cache_backend(
+            app.config.get('RESPONSE_CACHE', 'memory'),
+            max_entries=app.config.get('RESPONSE_CACHE_SIZE', 2000),
+            ttl=app.config.get('RESPONSE_CACHE_TTL', 300),
+            prefix='smarthire:responses:',
+        )
+        self.max_body = app.config.get('RESPONSE_CACHE_MAX_BODY', 256 * 1024)
+        self.max_age = app.config.get('RESPONSE_CACHE_MAX_AGE', 0)
+        metrics.register_collector('responses', self.collect_metrics)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def collect_metrics(self):
+        yield 'response_cache_events_total', {'event': 'hits'}, self.hits
+        yield 'response_cache_events_total', {'event': 'misses'}, self.misses
+        yield 'response_cache_events_total', {'event': 'not_modified'}, self.not_modified
+
+    @staticmethod
+    def request_key():
+        """Path and query arguments, in a canonical order"""
+        args = '&'.join(f'{name}={value}' for name, value in sorted(request.args.items(multi=True)))
+        return f'{request.path}?{args}'
+
+    def _finish(self, response, etag):
+        response.set_etag(etag, weak=True)
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        return response
+
+    def cached(self, version):
+        """
+        Cache a view's responses, validated by version(**view_kwargs)
+
+        Only 200 responses are cached; a None version (e.g. an unknown job)
+        leaves the request to the view.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                with stage('response_cache'):
+                    current = version(**kwargs)
+                if current is None:
+                    return f(*args, **kwargs)
+
+                key = self.request_key()
+                etag = hashlib.sha1(f'{key}\n{current}'.encode()).hexdigest()[:20]
+
+                if request.if_none_match.contains_weak(etag):
+                    self._count('not_modified')
+                    return self._finish(Response(status=304), etag)
+
+                entry = self.backend.get(key) if self.backend is not None else None
+                if entry is not None and entry['etag'] == etag:
+                    self._count('hits')
+                    return self._finish(Response(entry['body'], mimetype=entry['mimetype']), etag)
+
+                self._count('misses')
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data(as_text=True)
+                if self.backend is not None and len(body) <= self.max_body:
+                    self.backend.set(key, {'etag': etag, 'body': body, 'mimetype': response.mimetype})
+                return self._finish(response, etag)
+            return decorated
+        return decorator
+
+response_cache = ResponseCache()
@@ -0,0 +1,182 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+METRIC_HELP = {
+    'http_requests_total': ('counter', 'HTTP requests by endpoint, method and status'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request duration by endpoint'),
+    'stage_duration_seconds': ('histogram', 'Duration of request stages by endpoint and stage'),
+    'model_loaded': ('gauge', 'Whether the recommendation model is loaded'),
+    'model_active_jobs': ('gauge', 'Jobs the loaded model can recommend'),
+    'recommendation_cache_events_total': ('counter', 'Recommendation cache hits, misses and invalidations'),
+    'auth_principal_cache_events_total': ('counter', 'Principal cache hits and misses'),
+    'skill_cache_events_total': ('counter', 'Skill name cache hits and misses'),
+    'job_count_cache_events_total': ('counter', 'Job listing total cache hits and misses'),
+    'response_cache_events_total': ('counter', 'Response cache hits, misses and 304 responses'),
+    'recommendation_scoring_queue_depth': ('gauge', 'Recommendation requests waiting for a scoring worker'),
+    'recommendation_scoring_batches_total': ('counter', 'Coalesced recommendation scoring batches'),
+    'recommendation_scoring_requests_total': ('counter', 'Coalesced recommendation requests scored, rejected or abandoned'),
+    'recommendation_scoring_batch_seconds': ('histogram', 'Duration of coalesced scoring batches'),
+}
+
+def record_stage(name, duration_ms):
+    """Add the duration of a stage to the current request's timings"""
+    if has_request_context():
+        timings = g.setdefault('stage_timings', {})
+        timings[name] = timings.get(name, 0.0) + duration_ms
+
+def record_stages(timings):
+    """Add a dictionary of stage durations (ms) to the current request's timings"""
+    for name, duration_ms in timings.items():
+        record_stage(name, duration_ms)
+
+@contextmanager
+def stage(name):
+    """Time a block as a stage of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, (time.perf_counter() - start) * 1000)
+
+class Histogram:
+    """Counts of observations per bucket, plus their sum"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        # Buckets are inclusive upper bounds; the last one is +Inf
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and latency histograms, exported in the Prometheus
+    text format
+
+    Each request records the duration of its stages (token decoding, user
+    and profile queries, preprocessing, vectorization, similarity scan, JSON
+    serialization, ...) in flask.g; after the request they are added to the
+    stage_duration_seconds histogram and sent as a Server-Timing header.
+    Collectors registered with register_collector add gauges computed at
+    scrape time.
+    """
+
+    def __init__(self, prefix='smarthire'):
+        self.prefix = prefix
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Time every request of app and record its stages"""
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def register_collector(self, name, collect):
+        """
+        Register (or replace) a callable returning scrape-time gauges as
+        (metric name, labels dictionary, value) tuples
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def _start_request(self):
+        g.request_start = time.perf_counter()
+        g.stage_timings = {}
+
+    def _finish_request(self, response):
+        start = g.pop('request_start', None)
+        if start is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        self.inc('http_requests_total', {
+            'endpoint': endpoint, 'method': request.method, 'status': response.status_code,
+        })
+        self.observe('http_request_duration_seconds', time.perf_counter() - start, {'endpoint': endpoint})
+
+        timings = g.pop('stage_timings', {})
+        for name, duration_ms in timings.items():
+            self.observe('stage_duration_seconds', duration_ms / 1000, {'endpoint': endpoint, 'stage': name})
+
+        # Expose per-stage timings to clients and browser dev tools
+        if timings:
+            response.headers['Server-Timing'] = ', '.join(
+                f'{name};dur={duration_ms:.2f}' for name, duration_ms in timings.items()
+            )
+        return response
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, list(histogram.counts), histogram.sum, histogram.buckets)
+                for key, histogram in self._histograms.items()
+            )
+            collectors = list(self._collectors.values())
+
+        lines = []
+        described = set()
+
+        def describe(name, default_type):
+            if name not in described:
+                metric_type, help_text = METRIC_HELP.get(name, (default_type, name.replace('_', ' ')))
+                lines.append(f'# HELP {self.prefix}_{name} {help_text}')
+                lines.append(f'# TYPE {self.prefix}_{name} {metric_type}')
+                described.add(name)
+
+        for (name, labels), value in counters:
+            describe(name, 'counter')
+            lines.append(f'{self.prefix}_{name}{_format_labels(labels)} {value}')
+
+        for (name, labels), counts, total, buckets in histograms:
+            describe(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += count
+                lines.append(f'{self.prefix}_{name}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{self.prefix}_{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{self.prefix}_{name}_count{_format_labels(labels)} {cumulative}')
+
+        for collect in collectors:
+            for name, labels, value in collect():
+                describe(name, 'gauge')
+                lines.append(f'{self.prefix}_{name}{_format_labels(sorted(labels.items()))} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
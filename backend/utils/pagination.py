@@ -0,0 +1,69 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+class InvalidCursor(ValueError):
+    pass
+
+def parse_limit(args, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Page size from the limit query argument, clamped to [1, maximum]"""
+    try:
+        limit = int(args.get('limit', default))
+    except ValueError:
+        limit = default
+    return max(1, min(limit, maximum))
+
+def encode_cursor(values):
+    """Opaque cursor holding the sort key of the last row of a page"""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """Sort key values of a cursor, converted to the types of columns"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursor('Invalid cursor')
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime and value is not None else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+def _after(columns, values):
+    """Rows sorting after values in descending (columns) order"""
+    conditions = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        conditions.append(and_(*equal_prefix, column < value))
+    return or_(*conditions)
+
+def keyset_page(query, columns, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of query in descending order of columns, after cursor
+
+    Keyset pagination: instead of an OFFSET that scans and discards every
+    earlier row, the page starts right after the sort key of the previous
+    page's last row, so deep pages cost the same as the first one. columns
+    must end with a unique column (e.g. created_at, id) and should be backed
+    by an index.
+
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns)))
+
+    # One extra row tells whether there is a next page, without a count query
+    items = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column in columns])
+    return items, next_cursor
@@ -0,0 +1,68 @@
+import cProfile
+import itertools
+import logging
+import os
+import time
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+class SampledProfiler:
+    """
+    Profile one request in every sample_every with cProfile
+
+    Each sampled request is dumped to <directory>/<time>-<endpoint>-<n>.prof,
+    readable with pstats or snakeviz. Nothing is registered on the app when
+    no directory is configured, so a disabled profiler costs nothing.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.sample_every = 100
+        self.max_files = 100
+        self._requests = itertools.count()
+        self._dumped = 0
+
+    def init_app(self, app):
+        """Enable sampling when PROFILE_DIR is configured"""
+        self.directory = app.config.get('PROFILE_DIR')
+        if not self.directory:
+            return
+        self.sample_every = max(1, int(app.config.get('PROFILE_SAMPLE_EVERY', 100)))
+        self.max_files = int(app.config.get('PROFILE_MAX_FILES', 100))
+        os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(self._start)
+        app.teardown_request(self._stop)
+
+    def _start(self):
+        n = next(self._requests)
+        if n % self.sample_every or self._dumped >= self.max_files:
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active (e.g. a concurrent request)
+            return
+        g.profiler = profiler
+        g.profiled_request = n
+
+    def _stop(self, exc=None):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return
+        profiler.disable()
+
+        endpoint = (request.endpoint or 'unmatched').replace('.', '_')
+        path = os.path.join(
+            self.directory,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{endpoint}-{g.pop('profiled_request')}.prof"
+        )
+        try:
+            profiler.dump_stats(path)
+            self._dumped += 1
+        except OSError as e:
+            logger.warning(f'Could not write profile {path}: {e}')
+
+profiler = SampledProfiler()
@@ -0,0 +1,75 @@
+import threading
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryCounter:
+    """
+    Count the SQL statements run on an engine inside a with block
+
+    Only statements of the current thread are counted, so tests can measure
+    one request while other threads use the same engine:
+
+        with QueryCounter(db.engine) as counter:
+            client.get('/api/applications')
+        assert counter.count <= 2, counter.statements
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self._thread = None
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread:
+            self.statements.append(statement)
+
+    def __enter__(self):
+        self._thread = threading.get_ident()
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+def _count_request_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+def init_query_budget(app, db):
+    """Count the statements each request runs, for query_budget"""
+    with app.app_context():
+        if not event.contains(db.engine, 'before_cursor_execute', _count_request_query):
+            event.listen(db.engine, 'before_cursor_execute', _count_request_query)
+
+def query_budget(max_queries):
+    """
+    Limit the number of SQL statements a view may run
+
+    Place it above token_required so authentication counts too. Going over
+    budget raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is set (by
+    default when TESTING), so any test hitting the endpoint fails on an N+1
+    regression; otherwise it logs a warning.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            start = g.get('query_count', 0)
+            result = f(*args, **kwargs)
+            used = g.get('query_count', 0) - start
+            if used > max_queries:
+                message = f'{request.endpoint} ran {used} queries (budget {max_queries})'
+                if current_app.config.get('QUERY_BUDGET_STRICT', current_app.testing):
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(message)
+            return result
+        decorated.query_budget = max_queries
+        return decorated
+    return decorator
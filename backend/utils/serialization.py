@@ -0,0 +1,28 @@
+class InvalidFields(ValueError):
+    pass
+
+def isoformat(value):
+    """ISO 8601 string of a date or datetime, or None"""
+    return value.isoformat() if value is not None else None
+
+def parse_fields(args, allowed):
+    """
+    Sparse fieldset requested with ?fields=id,title,company, or None for
+    every field
+
+    id is always included. Unknown names raise InvalidFields.
+    """
+    value = args.get('fields')
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(['id'] + fields))
+
+def select_fields(data, fields):
+    """The fields of a serialized record, in the requested order (all of them if fields is None)"""
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields if name in data}
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+import argparse
+import logging
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.collaborative_filtering import CollaborativeFilteringRecommender
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def generate_interactions(n_users, n_jobs, n_interactions, seed=42):
+    """Synthetic applications with Zipf-like job popularity"""
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, n_jobs + 1) ** 0.8
+    popularity /= popularity.sum()
+
+    statuses = np.array(['applied', 'reviewed', 'interview', 'offer', 'rejected'])
+    return pd.DataFrame({
+        'user_id': rng.integers(0, n_users, n_interactions),
+        'job_id': rng.choice(n_jobs, size=n_interactions, p=popularity),
+        'status': statuses[rng.integers(0, len(statuses), n_interactions)],
+    })
+
+def timed(fn, repeats=1):
+    """Return (result, list of latencies in milliseconds)"""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return result, latencies
+
+def benchmark_collaborative(n_users, n_jobs, n_interactions, n_factors=64, batch_size=1000, repeats=20):
+    """
+    Measure CF training time and scoring latency
+
+    Returns:
+    - Dictionary of timings in milliseconds
+    """
+    interactions = generate_interactions(n_users, n_jobs, n_interactions)
+    job_ids = np.arange(n_jobs)
+
+    model = CollaborativeFilteringRecommender(n_factors=n_factors)
+    _, fit_ms = timed(lambda: model.fit(interactions, job_ids))
+
+    rng = np.random.default_rng(0)
+    user_ids = interactions['user_id'].unique()
+    single_users = [[user_id] for user_id in rng.choice(user_ids, repeats)]
+    batch_users = rng.choice(user_ids, batch_size).tolist()
+
+    single_ms = [timed(lambda users=users: model.score(users))[1][0] for users in single_users]
+    _, batch_ms = timed(lambda: model.score(batch_users), repeats=3)
+
+    # Vectorized blend of content-based and CF score matrices
+    cb_scores = rng.random((batch_size, n_jobs)).astype(np.float32)
+    cf_scores = model.score(batch_users)
+    _, blend_ms = timed(lambda: 0.7 * cb_scores + 0.3 * cf_scores, repeats=3)
+
+    results = {
+        'n_users': n_users,
+        'n_jobs': n_jobs,
+        'n_interactions': n_interactions,
+        'n_factors': n_factors,
+        'fit_ms': fit_ms[0],
+        'score_single_p50_ms': float(np.percentile(single_ms, 50)),
+        'score_single_p99_ms': float(np.percentile(single_ms, 99)),
+        f'score_batch_{batch_size}_ms': float(np.median(batch_ms)),
+        f'blend_batch_{batch_size}_ms': float(np.median(blend_ms)),
+        'item_factors_mb': model.item_factors.nbytes / 1e6,
+    }
+    for name, value in results.items():
+        logger.info(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collaborative filtering training and scoring")
+    parser.add_argument('--users', type=int, default=200000, help='Number of users')
+    parser.add_argument('--jobs', type=int, default=100000, help='Number of jobs')
+    parser.add_argument('--interactions', type=int, default=1000000, help='Number of interactions')
+    parser.add_argument('--factors', type=int, default=64, help='Number of latent factors')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Users per batched scoring call')
+
+    args = parser.parse_args()
+
+    benchmark_collaborative(args.users, args.jobs, args.interactions, args.factors, args.batch_size)
+
+if __name__ == "__main__":
+    main()
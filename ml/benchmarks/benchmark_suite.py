@@ -0,0 +1,420 @@
+import numpy as np
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import resource
+import tempfile
+import argparse
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Imported through the repository root, so ml.* and the backend's models
+# package can be loaded in one process
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.join(REPO_ROOT, 'backend')
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from ml.models.content_based_recommender import ContentBasedRecommender
+from ml.benchmarks.synthetic_corpus import SyntheticCorpus, profile_documents
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Model artifact formats measured by save/load
+ARTIFACT_FORMATS = {'joblib': 'model.joblib', 'mmap': 'model_artifact'}
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory, in MB"""
+    # On Linux ru_maxrss survives exec, so a child would report its
+    # parent's peak; VmHWM belongs to the current process image only
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+def latency_summary(latencies_ms):
+    """Percentiles of a list of latencies in milliseconds"""
+    latencies_ms = np.asarray(latencies_ms)
+    return {
+        'count': int(len(latencies_ms)),
+        'mean_ms': float(latencies_ms.mean()),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'max_ms': float(latencies_ms.max()),
+    }
+
+def timed(fn):
+    """Return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def path_size_mb(path):
+    """Size of a file, or of all files under a directory, in MB"""
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    ) / 1e6
+
+def measure_load(model_path):
+    """Load time and peak RSS of a fresh process loading model_path"""
+    model, load_seconds = timed(lambda: ContentBasedRecommender().load_model(model_path))
+    # Scoring once pages in what a serving process actually touches
+    model.get_recommendations('engineer', top_n=10)
+    return {'load_seconds': load_seconds, 'peak_rss_mb': peak_rss_mb()}
+
+def _load_in_subprocess(model_path):
+    """Run measure_load in a new interpreter, so its RSS is the model's alone"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--measure-load', model_path],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def benchmark_model(jobs, documents, work_dir, max_features=5000, top_n=10, n_queries=200,
+                    batch_sizes=(100, 1000), fit_jobs=1, clients=16):
+    """
+    Measure training, persistence and scoring of the content-based model
+
+    Returns:
+    - (results, model paths by artifact format)
+    """
+    results = {}
+
+    model = ContentBasedRecommender(max_features=max_features)
+    _, fit_seconds = timed(lambda: model.fit(jobs, n_jobs=fit_jobs))
+    results['fit'] = {'seconds': fit_seconds, 'peak_rss_mb': peak_rss_mb()}
+    logger.info(f"fit: {fit_seconds:.2f} s, peak RSS {results['fit']['peak_rss_mb']:.0f} MB")
+
+    model_paths = {}
+    for artifact_format, file_name in ARTIFACT_FORMATS.items():
+        path = os.path.join(work_dir, file_name)
+        _, save_seconds = timed(lambda: model.save_model(path, artifact_format=artifact_format))
+        load = _load_in_subprocess(path)
+        results[f'artifact_{artifact_format}'] = {
+            'save_seconds': save_seconds,
+            'size_mb': path_size_mb(path),
+            'load_seconds': load['load_seconds'],
+            'load_peak_rss_mb': load['peak_rss_mb'],
+        }
+        model_paths[artifact_format] = path
+        logger.info(f"{artifact_format}: {results[f'artifact_{artifact_format}']}")
+
+    # Single-user latency, with and without an attribute filter
+    queries = documents[:n_queries]
+    for name, filters in [('single', None), ('single_filtered', {'job_type': 'full-time'})]:
+        latencies = []
+        for document in queries:
+            _, seconds = timed(lambda: model.get_recommendations(document, top_n=top_n, filters=filters))
+            latencies.append(seconds * 1000)
+        results[name] = latency_summary(latencies)
+        logger.info(f"{name}: p50={results[name]['p50_ms']:.2f} ms p99={results[name]['p99_ms']:.2f} ms")
+
+    for batch_size in batch_sizes:
+        batches = [documents[start:start + batch_size]
+                   for start in range(0, len(documents) - batch_size + 1, batch_size)]
+        if not batches:
+            logger.warning(f"Skipping batch size {batch_size}: only {len(documents)} profiles")
+            continue
+        latencies = []
+        for batch in batches:
+            _, seconds = timed(lambda: model.get_recommendations_batch(batch, top_n=top_n))
+            latencies.append(seconds * 1000)
+        summary = latency_summary(latencies)
+        summary['users_per_second'] = batch_size * len(latencies) / (sum(latencies) / 1000)
+        results[f'batch_{batch_size}'] = summary
+        logger.info(f"batch {batch_size}: p50={summary['p50_ms']:.1f} ms, "
+                    f"{summary['users_per_second']:.0f} users/s")
+
+    if clients > 0:
+        results['concurrent'] = benchmark_concurrent_scoring(model, documents[:n_queries * 5], top_n, clients)
+
+    return results, model_paths
+
+def benchmark_concurrent_scoring(model, documents, top_n=10, clients=16):
+    """
+    Throughput and latency of concurrent clients scoring inline (one
+    transform and index search per request, as served by default) versus
+    through the backend's CoalescingScorer (one transform per batch, then
+    one matrix product for batches of at least its matmul_batch requests)
+    """
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from services.scoring_pool import CoalescingScorer
+
+    scorer = CoalescingScorer()
+    modes = {
+        'inline': lambda document: model.get_recommendations(document, top_n=top_n),
+        'coalesced': lambda document: scorer.submit(model, document, None, top_n).result(),
+    }
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for name, score in modes.items():
+            def request(document):
+                start = time.perf_counter()
+                score(document)
+                return (time.perf_counter() - start) * 1000
+
+            latencies, seconds = timed(lambda: list(pool.map(request, documents)))
+            summary = latency_summary(latencies)
+            summary['requests_per_second'] = len(documents) / seconds
+            results[name] = summary
+            logger.info(f"{clients} clients, {name}: p50={summary['p50_ms']:.2f} ms, "
+                        f"p95={summary['p95_ms']:.2f} ms, {summary['requests_per_second']:.0f} requests/s")
+
+    results['batches'] = scorer.batches
+    results['throughput_ratio'] = results['coalesced']['requests_per_second'] / results['inline']['requests_per_second']
+    logger.info(f"Coalescing: {results['throughput_ratio']:.2f}x inline throughput, "
+                f"{len(documents) / max(scorer.batches, 1):.1f} requests per batch")
+    return results
+
+def _insert_chunks(db, table, rows, chunksize=10000):
+    for start in range(0, len(rows), chunksize):
+        db.session.execute(table.insert(), rows[start:start + chunksize])
+    db.session.commit()
+
+def _populate_database(db, jobs, profiles):
+    """Insert jobs, users, profiles and skills with bulk inserts"""
+    from models.user import User
+    from models.job import Job
+    from models.skill import Skill
+    from models.profile import Profile, profile_skills
+
+    _insert_chunks(db, User.__table__, [{
+        'id': user_id, 'email': f'{user_id}@example.com', 'password_hash': '-',
+        'first_name': 'Bench', 'last_name': user_id, 'role': role,
+    } for user_id, role in [('employer', 'employer')] + [(user_id, 'job_seeker') for user_id in profiles['user_id']]])
+
+    # Jobs are posted a minute apart, newest last
+    posted = datetime(2024, 1, 1)
+    _insert_chunks(db, Job.__table__, [{
+        'id': job.id, 'title': job.title, 'company': job.company, 'description': job.description,
+        'requirements': ', '.join(job.skills), 'location': job.location,
+        'salary_range': f'{job.salary_min}-{job.salary_max}', 'job_type': job.job_type,
+        'experience_level': job.experience_level, 'salary_min': int(job.salary_min),
+        'salary_max': int(job.salary_max), 'is_active': True,
+        'employer_id': 'employer', 'created_at': posted + timedelta(minutes=i),
+        'updated_at': posted + timedelta(minutes=i),
+    } for i, job in enumerate(jobs.itertuples(index=False))])
+
+    skill_names = sorted({skill for skills in profiles['skills'] for skill in skills})
+    skill_ids = {name: f'skill-{i}' for i, name in enumerate(skill_names)}
+    _insert_chunks(db, Skill.__table__, [{'id': skill_id, 'name': name} for name, skill_id in skill_ids.items()])
+
+    _insert_chunks(db, Profile.__table__, [{
+        'id': f'profile-{profile.user_id}', 'user_id': profile.user_id, 'job_title': profile.job_title,
+        'headline': profile.headline, 'summary': profile.summary,
+    } for profile in profiles.itertuples(index=False)])
+    _insert_chunks(db, profile_skills, [
+        {'profile_id': f'profile-{profile.user_id}', 'skill_id': skill_ids[skill]}
+        for profile in profiles.itertuples(index=False) for skill in set(profile.skills)
+    ])
+
+def _time_requests(client, requests):
+    """
+    Latency summary of GET requests, the number of non-200 responses and the
+    mean duration of each stage reported in the Server-Timing header
+    requests: List of (url, headers) pairs
+    """
+    latencies = []
+    errors = 0
+    stage_totals = {}
+    for url, headers in requests:
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            errors += 1
+        for entry in response.headers.get('Server-Timing', '').split(','):
+            if ';dur=' in entry:
+                name, duration = entry.strip().split(';dur=')
+                stage_totals[name] = stage_totals.get(name, 0.0) + float(duration)
+    summary = latency_summary(latencies)
+    summary['errors'] = errors
+    summary['stages_mean_ms'] = {name: total / len(requests) for name, total in stage_totals.items()}
+    return summary
+
+def benchmark_api(jobs, profiles, model_path, work_dir, n_requests=200, vocabulary=None):
+    """
+    Measure end-to-end latency of /api/recommendations and /api/jobs
+
+    The Flask app runs in-process against a SQLite database holding jobs and
+    profiles, and requests go through the Flask test client (routing, auth,
+    queries, scoring and JSON encoding; no network).
+    """
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault('JWT_SECRET_KEY', 'smarthire-benchmark-signing-key-000')
+
+    from app import create_app
+    from models.db import db
+    from controllers.auth_controller import generate_token
+    from services.search_service import job_search
+
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(work_dir, 'benchmark.db')}",
+        'ML_MODEL_PATH': model_path,
+        'RECOMMENDATION_CACHE': 'memory',
+        # Job requests repeat the same URLs; time the queries, not the response cache
+        'RESPONSE_CACHE': 'none',
+    })
+
+    results = {}
+    with app.app_context():
+        db.create_all()
+        _, results['populate_seconds'] = timed(lambda: _populate_database(db, jobs, profiles))
+        _, results['search_index_seconds'] = timed(job_search.reindex)
+
+    client = app.test_client()
+    rng = np.random.default_rng(0)
+    user_ids = rng.choice(profiles['user_id'].to_numpy(), size=min(n_requests, len(profiles)), replace=False)
+    requests = [
+        ('/api/recommendations?limit=10', {'Authorization': f'Bearer {generate_token(user_id)}'})
+        for user_id in user_ids
+    ]
+    # First pass scores every user, the second is served from the result cache
+    results['recommendations'] = _time_requests(client, requests)
+    results['recommendations_cached'] = _time_requests(client, requests)
+
+    # Default listings: active jobs only, as clients request them
+    n_pages = max(1, len(jobs) // 20)
+    words = vocabulary if vocabulary is not None else ['engineer']
+    job_queries = {
+        'jobs_first_page': lambda i: '/api/jobs?limit=20',
+        'jobs_deep_page': lambda i: f'/api/jobs?limit=20&page={n_pages - i % 10}',
+        'jobs_first_page_total': lambda i: '/api/jobs?limit=20&total=true',
+        'jobs_title_search': lambda i: f'/api/jobs?limit=20&title={words[i % len(words)]}',
+        'jobs_sparse_fields': lambda i: '/api/jobs?limit=50&fields=id,title,company',
+        'jobs_location_filter': lambda i: '/api/jobs?limit=20&location=Remote',
+        'jobs_full_text': lambda i: f'/api/jobs?limit=20&q={words[i % len(words)]}+{words[(i * 7 + 3) % len(words)]}',
+    }
+    for name, make_url in job_queries.items():
+        results[name] = _time_requests(client, [(make_url(i), None) for i in range(n_requests)])
+
+    for name, summary in results.items():
+        if isinstance(summary, dict):
+            logger.info(f"{name}: p50={summary['p50_ms']:.2f} ms p99={summary['p99_ms']:.2f} ms "
+                        f"errors={summary['errors']}")
+    return results
+
+def compare_results(results, baseline):
+    """Log the ratio of every timing in results to the same timing in baseline"""
+    def flatten(tree, prefix=''):
+        for key, value in tree.items():
+            if isinstance(value, dict):
+                yield from flatten(value, f'{prefix}{key}.')
+            elif isinstance(value, (int, float)) and (
+                    key.endswith(('_ms', 'seconds', '_mb')) or prefix.endswith('_ms.')):
+                yield f'{prefix}{key}', value
+
+    previous = dict(flatten(baseline))
+    for key, value in flatten(results):
+        if previous.get(key):
+            logger.info(f"{key:60s} {previous[key]:12.3f} -> {value:12.3f}  ({value / previous[key]:.2f}x)")
+
+def run_benchmarks(args):
+    """Run the suite configured by the parsed command line arguments"""
+    results = {
+        'config': vars(args).copy(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        },
+    }
+
+    corpus = SyntheticCorpus(vocabulary_size=args.vocabulary_size, seed=args.seed)
+    (jobs, profiles), generate_seconds = timed(
+        lambda: (corpus.generate_jobs(args.n_jobs), corpus.generate_profiles(args.n_profiles))
+    )
+    results['corpus'] = {
+        'n_jobs': args.n_jobs,
+        'n_profiles': args.n_profiles,
+        'generate_seconds': generate_seconds,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    logger.info(f"Generated {args.n_jobs} jobs and {args.n_profiles} profiles in {generate_seconds:.1f} s")
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='smarthire-benchmark-')
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        results['model'], model_paths = benchmark_model(
+            jobs, profile_documents(profiles), work_dir,
+            max_features=args.max_features, top_n=args.top_n, n_queries=args.n_queries,
+            batch_sizes=args.batch_sizes, fit_jobs=args.fit_jobs, clients=args.clients,
+        )
+        if args.api_jobs > 0:
+            results['api'] = benchmark_api(
+                jobs.iloc[:args.api_jobs], profiles, model_paths['mmap'], work_dir,
+                n_requests=args.api_requests, vocabulary=corpus.vocabulary[:100].tolist(),
+            )
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recommender and the API on a synthetic corpus")
+    parser.add_argument('--n-jobs', type=int, default=10000, help='Number of synthetic jobs (10k to 5M)')
+    parser.add_argument('--n-profiles', type=int, default=2000, help='Number of synthetic user profiles')
+    parser.add_argument('--vocabulary-size', type=int, default=20000, help='Number of distinct corpus words')
+    parser.add_argument('--max-features', type=int, default=5000, help='TF-IDF vocabulary size of the model')
+    parser.add_argument('--fit-jobs', type=int, default=1, help='Worker processes used by fit')
+    parser.add_argument('--top-n', type=int, default=10, help='Recommendations per user')
+    parser.add_argument('--n-queries', type=int, default=200, help='Single-user queries timed')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000], help='Batch sizes timed')
+    parser.add_argument('--clients', type=int, default=16,
+                        help='Concurrent clients of the inline vs coalesced scoring benchmark (0 to skip)')
+    parser.add_argument('--api-jobs', type=int, default=20000,
+                        help='Jobs stored in the benchmark database, the first of the corpus '
+                             '(0 skips the API benchmark)')
+    parser.add_argument('--api-requests', type=int, default=200, help='Requests timed per endpoint')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed of the synthetic corpus')
+    parser.add_argument('--work-dir', type=str, default=None,
+                        help='Directory for model artifacts and the database (kept); default is a temporary directory')
+    parser.add_argument('--output', type=str, default='benchmark_results.json', help='Path of the JSON results')
+    parser.add_argument('--baseline', type=str, default=None, help='Previous JSON results to compare against')
+    parser.add_argument('--measure-load', type=str, default=None, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.measure_load:
+        # Child process of benchmark_model
+        print(json.dumps(measure_load(args.measure_load)))
+        return
+
+    results = run_benchmarks(args)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare_results(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
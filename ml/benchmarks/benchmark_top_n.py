@@ -0,0 +1,92 @@
+import numpy as np
+import os
+import sys
+import time
+import argparse
+import logging
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.content_based_recommender import select_top_n
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def full_sort_top_n(similarities, top_n):
+    """Previous selection: full argsort of every score"""
+    return similarities.argsort()[-top_n:][::-1]
+
+def partial_top_n(similarities, top_n):
+    """Current selection: argpartition, then sort only the top N"""
+    return select_top_n(similarities[np.newaxis, :], top_n)[0]
+
+def time_selection(select_fn, similarities, top_n, repeats):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        select_fn(similarities, top_n)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+def benchmark_top_n(corpus_sizes, top_n=10, repeats=20, seed=42):
+    """
+    Compare full-sort and partial top-N selection latency
+
+    Parameters:
+    - corpus_sizes: Number of jobs to score in each run
+    - top_n: Number of recommendations selected
+    - repeats: Timed calls per corpus size
+    - seed: Random seed for the synthetic similarity scores
+
+    Returns:
+    - List of result dictionaries, one per corpus size
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+
+    for n_jobs in corpus_sizes:
+        # TF-IDF similarities are mostly zero with a small non-zero tail
+        similarities = np.zeros(n_jobs)
+        nonzero = rng.choice(n_jobs, size=max(1, n_jobs // 20), replace=False)
+        similarities[nonzero] = rng.random(len(nonzero))
+
+        # Both methods must agree on the selected scores
+        expected = np.sort(similarities)[::-1][:top_n]
+        assert np.array_equal(similarities[partial_top_n(similarities, top_n)], expected)
+
+        full = time_selection(full_sort_top_n, similarities, top_n, repeats)
+        partial = time_selection(partial_top_n, similarities, top_n, repeats)
+
+        result = {
+            'n_jobs': n_jobs,
+            'full_sort_p50_ms': float(np.percentile(full, 50)),
+            'partial_p50_ms': float(np.percentile(partial, 50)),
+            'speedup': float(np.percentile(full, 50) / np.percentile(partial, 50)),
+        }
+        results.append(result)
+        logger.info(
+            f"n_jobs={n_jobs:>9}  full sort p50={result['full_sort_p50_ms']:8.3f} ms  "
+            f"partial p50={result['partial_p50_ms']:8.3f} ms  speedup={result['speedup']:.1f}x"
+        )
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark top-N selection against corpus size")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000, 5000000],
+                        help='Corpus sizes (number of jobs) to benchmark')
+    parser.add_argument('--top-n', type=int, default=10, help='Number of recommendations selected')
+    parser.add_argument('--repeats', type=int, default=20, help='Timed calls per corpus size')
+
+    args = parser.parse_args()
+
+    benchmark_top_n(args.sizes, top_n=args.top_n, repeats=args.repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import os
+import sys
+import argparse
+import logging
+
+# Imported through the repository root (as the backend does), so the suite
+# can load ml.* and the backend's models package in one process
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from ml.data.job_data_io import JobDataWriter
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+LOCATIONS = [
+    'New York, NY', 'San Francisco, CA', 'Austin, TX', 'Seattle, WA', 'Chicago, IL',
+    'Boston, MA', 'Denver, CO', 'Atlanta, GA', 'London, UK', 'Berlin, Germany', 'Remote',
+]
+JOB_TYPES = ['full-time', 'part-time', 'contract', 'internship']
+EXPERIENCE_LEVELS = ['entry', 'mid', 'senior', 'lead']
+
+# Pseudo-words are built from consonant-vowel syllables, so they are never
+# stop words or numbers and survive preprocessing unchanged
+CONSONANTS = list('bdfgklmnprstvz')
+VOWELS = list('aeiou')
+
+class SyntheticCorpus:
+    """
+    Deterministic generator of job postings and user profiles
+
+    Words follow a Zipf distribution over a pseudo-word vocabulary, like term
+    frequencies in real postings. Each job and profile belongs to one of
+    n_topics topics and draws most of its words from that topic's own
+    distribution, so profiles have clearly related jobs and posting list
+    lengths range from a few jobs to most of the corpus.
+    """
+
+    def __init__(self, vocabulary_size=20000, n_skills=500, n_topics=50, zipf_exponent=1.1,
+                 description_words=60, topic_share=0.7, seed=42):
+        self.vocabulary_size = vocabulary_size
+        self.n_topics = n_topics
+        self.description_words = description_words
+        self.topic_share = topic_share
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self.vocabulary = self._pseudo_words(rng, vocabulary_size, n_syllables=3)
+        self.skills = self._pseudo_words(rng, n_skills, n_syllables=2)
+
+        # Global word weights, and one shuffled copy of them per topic
+        weights = 1.0 / np.arange(1, vocabulary_size + 1) ** zipf_exponent
+        self.word_weights = weights / weights.sum()
+        self.topic_words = np.array([rng.permutation(vocabulary_size) for _ in range(n_topics)])
+        skill_weights = 1.0 / np.arange(1, n_skills + 1)
+        self.skill_weights = skill_weights / skill_weights.sum()
+        self.topic_skills = np.array([rng.permutation(n_skills) for _ in range(n_topics)])
+
+    @staticmethod
+    def _pseudo_words(rng, n_words, n_syllables):
+        """n_words distinct words of n_syllables syllables (one more if needed)"""
+        syllables = np.array([c + v for c in CONSONANTS for v in VOWELS])
+        while len(syllables) ** n_syllables < n_words:
+            n_syllables += 1
+        codes = rng.choice(len(syllables) ** n_syllables, size=n_words, replace=False)
+        words = np.full(n_words, '', dtype=object)
+        for _ in range(n_syllables):
+            words = words + syllables[codes % len(syllables)].astype(object)
+            codes = codes // len(syllables)
+        return words.astype(str)
+
+    def _sample_words(self, rng, topics, n_words):
+        """(len(topics) x n_words) matrix of words, mostly from each row's topic"""
+        ranks = rng.choice(self.vocabulary_size, size=(len(topics), n_words), p=self.word_weights)
+        from_topic = rng.random((len(topics), n_words)) < self.topic_share
+        word_ids = np.where(from_topic, self.topic_words[topics[:, np.newaxis], ranks], ranks)
+        return self.vocabulary[word_ids]
+
+    def _sample_skills(self, rng, topics, n_skills):
+        ranks = rng.choice(len(self.skills), size=(len(topics), n_skills), p=self.skill_weights)
+        return self.skills[self.topic_skills[topics[:, np.newaxis], ranks]]
+
+    @staticmethod
+    def _join(words):
+        return [' '.join(row) for row in words.tolist()]
+
+    def iter_jobs(self, n_jobs, chunksize=100000):
+        """Yield DataFrames of job postings (prepared schema) of up to chunksize rows"""
+        for start in range(0, n_jobs, chunksize):
+            size = min(chunksize, n_jobs - start)
+            rng = np.random.default_rng([self.seed, 0, start])
+            topics = rng.integers(0, self.n_topics, size)
+
+            skills = self._sample_skills(rng, topics, 8)
+            n_job_skills = rng.integers(3, 9, size)
+            salary_min = rng.integers(30, 150, size) * 1000
+
+            yield pd.DataFrame({
+                'id': [f'job-{i}' for i in range(start, start + size)],
+                'title': self._join(self._sample_words(rng, topics, 3)),
+                'company': self._join(self._sample_words(rng, topics, 2)),
+                'description': self._join(self._sample_words(rng, topics, self.description_words)),
+                'skills': [list(row[:n]) for row, n in zip(skills.tolist(), n_job_skills)],
+                'location': np.array(LOCATIONS)[rng.integers(0, len(LOCATIONS), size)],
+                'job_type': np.array(JOB_TYPES)[rng.integers(0, len(JOB_TYPES), size)],
+                'experience_level': np.array(EXPERIENCE_LEVELS)[rng.integers(0, len(EXPERIENCE_LEVELS), size)],
+                'salary_min': salary_min,
+                'salary_max': salary_min + rng.integers(10, 60, size) * 1000,
+            })
+
+    def generate_jobs(self, n_jobs):
+        """DataFrame of n_jobs job postings"""
+        return pd.concat(list(self.iter_jobs(n_jobs)), ignore_index=True)
+
+    def generate_profiles(self, n_profiles):
+        """
+        DataFrame of user profiles: user_id, job_title, headline, summary and
+        skills, drawn from the same topics as the jobs
+        """
+        rng = np.random.default_rng([self.seed, 1])
+        topics = rng.integers(0, self.n_topics, n_profiles)
+        return pd.DataFrame({
+            'user_id': [f'user-{i}' for i in range(n_profiles)],
+            'job_title': self._join(self._sample_words(rng, topics, 3)),
+            'headline': self._join(self._sample_words(rng, topics, 6)),
+            'summary': self._join(self._sample_words(rng, topics, 25)),
+            'skills': self._sample_skills(rng, topics, 5).tolist(),
+        })
+
+def profile_documents(profiles):
+    """Text documents of profiles, built like the backend builds them"""
+    return [
+        ' '.join([row.job_title, row.headline, row.summary] + list(row.skills))
+        for row in profiles.itertuples(index=False)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic job corpus")
+    parser.add_argument('--n-jobs', type=int, required=True, help='Number of job postings')
+    parser.add_argument('--output', type=str, required=True,
+                        help='Output file; the extension selects CSV, Parquet or Arrow')
+    parser.add_argument('--vocabulary-size', type=int, default=20000, help='Number of distinct words')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--chunksize', type=int, default=100000, help='Jobs generated and written at a time')
+
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(vocabulary_size=args.vocabulary_size, seed=args.seed)
+    with JobDataWriter(args.output) as writer:
+        for chunk in corpus.iter_jobs(args.n_jobs, args.chunksize):
+            writer.write(chunk)
+    logger.info(f"Wrote {args.n_jobs} jobs to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import ast
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# Columnar formats keep skills as a native list<string> column
+PARQUET_EXTENSIONS = ['.parquet', '.pq']
+ARROW_EXTENSIONS = ['.arrow', '.feather']
+
+def data_format(path):
+    """'parquet', 'arrow' or 'csv', from the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in PARQUET_EXTENSIONS:
+        return 'parquet'
+    if ext in ARROW_EXTENSIONS:
+        return 'arrow'
+    return 'csv'
+
+def file_sha256(path, block_size=1 << 20):
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def manifest_path(output_path):
+    return os.path.normpath(output_path) + '.manifest.json'
+
+def is_up_to_date(input_paths, output_path, params=None):
+    """
+    Check whether output_path was built from the same inputs and parameters
+
+    input_paths: Input file path, or list of paths
+    params: JSON-serializable parameters that also affect the output
+
+    Returns (up_to_date, manifest); write the manifest with write_manifest
+    once the output is rebuilt.
+    """
+    if isinstance(input_paths, str):
+        input_paths = [input_paths]
+    manifest = {
+        'inputs': {os.path.abspath(path): file_sha256(path) for path in input_paths},
+        'params': params or {},
+    }
+
+    path = manifest_path(output_path)
+    if not os.path.exists(output_path) or not os.path.exists(path):
+        return False, manifest
+    with open(path) as f:
+        previous = json.load(f)
+    return previous == manifest, manifest
+
+def write_manifest(output_path, manifest):
+    with open(manifest_path(output_path), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def _arrow_schema(data):
+    """Arrow schema for a prepared job frame: strings for mixed or empty columns"""
+    import pyarrow as pa
+
+    fields = []
+    for column in data.columns:
+        if column == 'skills':
+            fields.append(pa.field(column, pa.list_(pa.string())))
+        elif data[column].dtype.kind == 'O' or pd.api.types.is_string_dtype(data[column].dtype):
+            fields.append(pa.field(column, pa.string()))
+        else:
+            fields.append(pa.field(column, pa.from_numpy_dtype(data[column].dtype)))
+    return pa.schema(fields)
+
+def _arrow_table(data, schema):
+    import pyarrow as pa
+
+    data = data.copy()
+    for field in schema:
+        column = data[field.name]
+        if pa.types.is_string(field.type) and column.dtype.kind == 'O':
+            # Mixed JSON values (e.g. numeric and string IDs) are stored as text
+            data[field.name] = column.where(column.isna(), column.astype(str))
+    return pa.Table.from_pandas(data, schema=schema, preserve_index=False)
+
+class JobDataWriter:
+    """
+    Write prepared job data incrementally, as CSV, Parquet or Arrow IPC
+
+    The first frame fixes the schema of columnar outputs; each later frame
+    is appended (a new Parquet row group or Arrow record batch).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = data_format(path)
+        self._writer = None
+        self._schema = None
+        self._first = True
+
+    def write(self, data):
+        if self.format == 'csv':
+            data.to_csv(self.path, index=False, mode='w' if self._first else 'a', header=self._first)
+        else:
+            if self._schema is None:
+                self._schema = _arrow_schema(data)
+            table = _arrow_table(data, self._schema)
+            if self._writer is None:
+                self._writer = self._open_writer()
+            self._writer.write_table(table)
+        self._first = False
+
+    def _open_writer(self):
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.path, self._schema)
+        import pyarrow as pa
+        return pa.ipc.new_file(self.path, self._schema)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def save_job_data(data, path):
+    """Write a prepared job frame in the format given by the path extension"""
+    with JobDataWriter(path) as writer:
+        writer.write(data)
+
+def _parse_skills(value):
+    """Skills from a CSV cell: a stringified list, or comma-separated names"""
+    if not isinstance(value, str):
+        return []
+    if value.startswith('['):
+        try:
+            return [str(skill) for skill in ast.literal_eval(value)]
+        except (ValueError, SyntaxError):
+            pass
+    return [skill.strip() for skill in value.split(',') if skill.strip()]
+
+def load_job_data(path, columns=None):
+    """
+    Load prepared job data, reading only the requested columns
+
+    path: CSV, Parquet or Arrow IPC file
+    columns: Columns to load (missing ones are skipped); None loads all
+
+    skills is returned as a column of Python lists. Columnar formats store
+    it natively; CSV cells are parsed from their stringified lists.
+    """
+    fmt = data_format(path)
+    if fmt == 'csv':
+        usecols = (lambda column: column in columns) if columns is not None else None
+        data = pd.read_csv(path, usecols=usecols)
+        if 'skills' in data.columns:
+            data['skills'] = data['skills'].map(_parse_skills)
+        return data
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        available = pq.read_schema(path).names
+        if columns is not None:
+            columns = [column for column in columns if column in available]
+        table = pq.read_table(path, columns=columns)
+    else:
+        import pyarrow as pa
+        # Memory-mapped: only the selected columns are paged in
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        if columns is not None:
+            table = table.select([column for column in columns if column in table.column_names])
+
+    column_order = table.column_names
+    skills = None
+    if 'skills' in column_order:
+        skills = table.column('skills').to_pylist()
+        table = table.drop_columns(['skills'])
+    data = table.to_pandas()
+    if skills is not None:
+        data['skills'] = [skill_list if skill_list is not None else [] for skill_list in skills]
+    return data[column_order]
@@ -2,10 +2,18 @@ import pandas as pd
 import numpy as np
 import argparse
 import os
+import sys
 import json
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.job_data_io import JobDataWriter, save_job_data, is_up_to_date, write_manifest
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,67 +21,89 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def clean_text(text):
-    """Basic text cleaning function"""
-    if not isinstance(text, str):
-        return ""
-    # Remove extra whitespace
-    text = ' '.join(text.split())
-    return text
-
-def process_skills(skills):
-    """Process skills array or string"""
-    if isinstance(skills, list):
-        return [s.strip() for s in skills if s.strip()]
-    elif isinstance(skills, str):
-        # Handle comma-separated skills
-        if ',' in skills:
-            return [s.strip() for s in skills.split(',') if s.strip()]
-        # Handle space-separated skills
-        return [s.strip() for s in skills.split() if s.strip()]
-    return []
+# Characters str.split() treats as whitespace (regex engines differ on \s)
+WHITESPACE_RE = '[\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+'
 
-def prepare_job_data(input_file, output_file):
+def clean_text_column(texts):
     """
-    Process and clean job data
+    Clean a Series of text with vectorized string operations
     
-    Parameters:
-    - input_file: Path to raw data file (CSV or JSON)
-    - output_file: Path to save processed data (CSV)
+    Runs of whitespace become one space and ends are stripped (the same
+    characters str.split() splits on); non-string values become "".
     """
-    logger.info(f"Processing file: {input_file}")
-    
-    # Determine file type from extension
-    file_ext = os.path.splitext(input_file)[1].lower()
+    if texts.dtype.kind != 'O' and not pd.api.types.is_string_dtype(texts.dtype):
+        return pd.Series('', index=texts.index, dtype=object)
+    cleaned = texts.str.replace(WHITESPACE_RE, ' ', regex=True).str.strip(' ')
+    return cleaned.where(cleaned.notna(), '').astype(object)
+
+def process_skills_column(skills):
+    """
+    Normalize a Series of skills (lists or strings) into lists of skill names
     
-    # Load data based on file type
-    if file_ext == '.csv':
-        data = pd.read_csv(input_file)
-    elif file_ext in ['.json', '.jsonl']:
-        data = pd.read_json(input_file, lines=(file_ext == '.jsonl'))
-    else:
-        raise ValueError(f"Unsupported file format: {file_ext}")
+    Strings containing a comma are split on commas, other strings on
+    whitespace; lists are kept. Items are stripped and empty items dropped.
+    Other values become an empty list.
+    """
+    is_string = skills.map(type) == str
+    is_list = skills.map(type) == list
+    strings = skills[is_string]
+    has_comma = strings.str.contains(',', regex=False)
     
-    logger.info(f"Loaded {len(data)} records")
+    pieces = pd.concat([
+        strings[has_comma].str.split(','),
+        strings[~has_comma].str.split(),
+        skills[is_list],
+    ]).explode()
+    pieces = pieces[pieces.notna()].str.strip()
+    pieces = pieces[pieces.notna() & (pieces != '')]
     
-    # Handle different column naming conventions
-    column_mappings = {
-        'job_id': 'id',
-        'jobId': 'id',
-        'job_title': 'title',
-        'jobTitle': 'title',
-        'position': 'title',
-        'job_description': 'description',
-        'jobDescription': 'description',
-        'desc': 'description',
-        'required_skills': 'skills',
-        'requiredSkills': 'skills',
-        'skillset': 'skills',
-        'skill_tags': 'skills'
-    }
+    result = pd.Series([[] for _ in range(len(skills))], index=skills.index, dtype=object)
+    if len(pieces):
+        grouped = pieces.groupby(level=0, sort=False).agg(list)
+        result[grouped.index] = grouped
+    return result
+
+# Handle different column naming conventions
+COLUMN_MAPPINGS = {
+    'job_id': 'id',
+    'jobId': 'id',
+    'job_title': 'title',
+    'jobTitle': 'title',
+    'position': 'title',
+    'job_description': 'description',
+    'jobDescription': 'description',
+    'desc': 'description',
+    'required_skills': 'skills',
+    'requiredSkills': 'skills',
+    'skillset': 'skills',
+    'skill_tags': 'skills'
+}
+
+def _read_input(input_file, file_ext, chunksize=None, dtype=None):
+    """Read a raw data file whole, or as an iterator of chunks"""
+    if file_ext == '.csv':
+        return pd.read_csv(input_file, chunksize=chunksize, dtype=dtype)
+    if file_ext == '.jsonl':
+        return pd.read_json(input_file, lines=True, chunksize=chunksize)
+    if file_ext == '.json' and chunksize is None:
+        return pd.read_json(input_file)
+    if file_ext == '.json':
+        raise ValueError("Streaming requires CSV or JSONL input")
+    raise ValueError(f"Unsupported file format: {file_ext}")
+
+def _check_skills_column(columns):
+    skills_columns = ['skills'] + [old for old, new in COLUMN_MAPPINGS.items() if new == 'skills']
+    if not any(column in columns for column in skills_columns):
+        logger.warning("No skills column found. Using empty skills list.")
+
+def normalize_job_data(data):
+    """
+    Rename, validate and clean a frame of raw job records
     
+    Applied to the whole file, or to each chunk when streaming.
+    """
     # Rename columns if needed
-    data = data.rename(columns={old: new for old, new in column_mappings.items() 
+    data = data.rename(columns={old: new for old, new in COLUMN_MAPPINGS.items() 
                               if old in data.columns and new not in data.columns})
     
     # Ensure required columns exist
@@ -89,23 +119,157 @@ def prepare_job_data(input_file, output_file):
         data['id'] = [f"job_{i}" for i in range(len(data))]
     
     # Clean text fields
-    data['title'] = data['title'].apply(clean_text)
-    data['description'] = data['description'].apply(clean_text)
+    data['title'] = clean_text_column(data['title'])
+    data['description'] = clean_text_column(data['description'])
     
     # Process skills
     if 'skills' in data.columns:
-        data['skills'] = data['skills'].apply(process_skills)
+        data['skills'] = process_skills_column(data['skills'])
     else:
         # If no skills column, extract from description (simplified)
         data['skills'] = [[]] * len(data)
-        logger.warning("No skills column found. Using empty skills list.")
     
     # Remove rows with missing essential data
-    data = data.dropna(subset=['title', 'description'])
+    return data.dropna(subset=['title', 'description'])
+
+def _unify_dtypes(chunk_dtypes, n_chunks, numeric_kinds):
+    """
+    Column dtypes a whole-file read would infer, from the per-chunk dtypes
+    
+    A mix of numeric kinds (numeric_kinds: integer and float, plus bool for
+    JSON) widens to float, as does a column missing from some chunks (JSONL).
+    Any other mix falls back to strings/objects.
+    """
+    unified = {}
+    for column, dtypes in chunk_dtypes.items():
+        kinds = {dtype.kind for dtype in dtypes}
+        if len(dtypes) < n_chunks:
+            # Rows without the column are NaN
+            kinds.add('f')
+        if len(set(dtypes)) == 1 and len(dtypes) == n_chunks:
+            unified[column] = dtypes[0]
+        elif kinds <= numeric_kinds:
+            unified[column] = np.dtype('float64')
+        else:
+            unified[column] = None
+    return unified
+
+def _scan_schema(input_file, file_ext, chunksize):
+    """First pass: column order and unified dtypes, without keeping any rows"""
+    columns = []
+    chunk_dtypes = {}
+    n_chunks = 0
+    for chunk in _read_input(input_file, file_ext, chunksize):
+        n_chunks += 1
+        for column, dtype in chunk.dtypes.items():
+            if column not in chunk_dtypes:
+                columns.append(column)
+                chunk_dtypes[column] = []
+            chunk_dtypes[column].append(dtype)
+    # pandas casts JSON booleans mixed with nulls to float, CSV ones to objects
+    numeric_kinds = {'i', 'u', 'f'} if file_ext == '.csv' else {'b', 'i', 'u', 'f'}
+    return columns, _unify_dtypes(chunk_dtypes, n_chunks, numeric_kinds)
+
+def _conform_chunk(chunk, columns, dtypes):
+    """Give a chunk the columns and dtypes of a whole-file read"""
+    chunk = chunk.reindex(columns=columns)
+    for column, dtype in dtypes.items():
+        if dtype is None:
+            chunk[column] = chunk[column].astype(object)
+        elif chunk[column].dtype != dtype:
+            chunk[column] = chunk[column].astype(dtype)
+    return chunk
+
+def prepare_job_data_streaming(input_file, output_file, chunksize=100000, n_jobs=1):
+    """
+    Process and clean job data in chunks, with bounded memory
+    
+    Parameters:
+    - input_file: Path to raw data file (CSV or JSONL)
+    - output_file: Path to save processed data (CSV, Parquet or Arrow, by extension)
+    - chunksize: Records read and processed at a time
+    - n_jobs: Worker processes normalizing chunks (at most 2 * n_jobs
+      chunks are in flight)
+    
+    A first pass reads only the schema, so every chunk is parsed with the
+    column types a whole-file read would infer and the output is row for
+    row identical to prepare_job_data.
+    
+    Returns:
+    - Number of records written
+    """
+    logger.info(f"Streaming file: {input_file} (chunks of {chunksize} records)")
+    file_ext = os.path.splitext(input_file)[1].lower()
+    
+    columns, dtypes = _scan_schema(input_file, file_ext, chunksize)
+    _check_skills_column(columns)
+    
+    # Re-read text-like columns as strings, so values keep their exact text
+    read_dtype = None
+    if file_ext == '.csv':
+        read_dtype = {column: str for column, dtype in dtypes.items() if dtype is None}
+    chunks = (
+        _conform_chunk(chunk, columns, dtypes)
+        for chunk in _read_input(input_file, file_ext, chunksize, dtype=read_dtype)
+    )
+    
+    n_records = 0
+    n_chunks = 0
+    writer = JobDataWriter(output_file)
+    
+    def write(data):
+        nonlocal n_records, n_chunks
+        writer.write(data)
+        n_records += len(data)
+        n_chunks += 1
+        logger.info(f"Wrote {n_records} records")
+    
+    with writer:
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                # Keep a bounded queue of chunks in flight, written in order
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(normalize_job_data, chunk))
+                    if len(pending) >= 2 * n_jobs:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+        else:
+            for chunk in chunks:
+                write(normalize_job_data(chunk))
+    
+    if n_chunks == 0:
+        raise ValueError(f"No records found in {input_file}")
+    
+    logger.info(f"Processed data saved to {output_file}")
+    return n_records
+
+def prepare_job_data(input_file, output_file):
+    """
+    Process and clean job data
+    
+    Parameters:
+    - input_file: Path to raw data file (CSV or JSON)
+    - output_file: Path to save processed data (CSV, Parquet or Arrow, by
+      extension). Columnar formats store skills as a native list column.
+    """
+    logger.info(f"Processing file: {input_file}")
+    
+    # Determine file type from extension
+    file_ext = os.path.splitext(input_file)[1].lower()
+    
+    # Load data based on file type
+    data = _read_input(input_file, file_ext)
+    
+    logger.info(f"Loaded {len(data)} records")
+    
+    _check_skills_column(data.columns)
+    data = normalize_job_data(data)
     logger.info(f"Cleaned data: {len(data)} records remaining")
     
     # Save processed data
-    data.to_csv(output_file, index=False)
+    save_job_data(data, output_file)
     logger.info(f"Processed data saved to {output_file}")
     
     return data
@@ -113,7 +277,16 @@ def prepare_job_data(input_file, output_file):
 def main():
     parser = argparse.ArgumentParser(description="Prepare job data for SmartHire recommender")
     parser.add_argument('--input', type=str, required=True, help='Path to raw data file (CSV or JSON)')
-    parser.add_argument('--output', type=str, help='Path to save processed data (CSV)')
+    parser.add_argument('--output', type=str,
+                        help='Path to save processed data (.csv, .parquet or .arrow)')
+    parser.add_argument('--format', type=str, default='csv', choices=['csv', 'parquet', 'arrow'],
+                        help='Output format when --output is not given')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild the output even if the input is unchanged')
+    parser.add_argument('--chunksize', type=int,
+                        help='Stream the input in chunks of this many records (CSV or JSONL)')
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help='Worker processes normalizing chunks when streaming')
     
     args = parser.parse_args()
     
@@ -121,14 +294,24 @@ def main():
     if not args.output:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_dir = os.path.dirname(args.input) or '.'
-        filename = f"processed_jobs_{timestamp}.csv"
+        filename = f"processed_jobs_{timestamp}.{args.format}"
         args.output = os.path.join(output_dir, filename)
     
     # Create output directory if needed
     os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
     
     try:
-        prepare_job_data(args.input, args.output)
+        # Skip the run when the output was built from identical input
+        up_to_date, manifest = is_up_to_date(args.input, args.output)
+        if up_to_date and not args.force:
+            logger.info(f"{args.output} is up to date with {args.input}, skipping")
+            return 0
+        
+        if args.chunksize:
+            prepare_job_data_streaming(args.input, args.output, args.chunksize, args.n_jobs)
+        else:
+            prepare_job_data(args.input, args.output)
+        write_manifest(args.output, manifest)
     except Exception as e:
         logger.error(f"Error preparing data: {e}")
         return 1
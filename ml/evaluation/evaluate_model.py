@@ -4,12 +4,15 @@ import os
 import sys
 import argparse
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.model_selection import train_test_split
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.content_based_recommender import ContentBasedRecommender
+from data.job_data_io import load_job_data
 
 # Configure logging
 logging.basicConfig(
@@ -28,56 +31,184 @@ def calculate_metrics(recommendations, ground_truth):
     
     Returns:
     - Dictionary of metrics (precision, recall, ndcg)
+    
+    Metrics are computed with array operations over a (n_users x k) hits
+    matrix instead of per-user set operations.
     """
-    precision_at_k = []
-    recall_at_k = []
-    ndcg_at_k = []
-    
-    # Calculate metrics for each user
-    for user_recs, user_truth in zip(recommendations, ground_truth):
-        # Skip users with no relevant items
-        if not user_truth:
-            continue
-        
-        # Precision@k
-        hits = len(set(user_recs) & set(user_truth))
-        precision = hits / len(user_recs) if user_recs else 0
-        precision_at_k.append(precision)
-        
-        # Recall@k
-        recall = hits / len(user_truth) if user_truth else 0
-        recall_at_k.append(recall)
-        
-        # NDCG@k (Normalized Discounted Cumulative Gain)
-        dcg = 0
-        for i, job_id in enumerate(user_recs):
-            if job_id in user_truth:
-                # Calculate DCG (using binary relevance 0/1)
-                dcg += 1 / np.log2(i + 2)  # +2 because i is 0-indexed
-        
-        # Calculate ideal DCG
-        idcg = sum(1 / np.log2(i + 2) for i in range(min(len(user_truth), len(user_recs))))
-        ndcg = dcg / idcg if idcg > 0 else 0
-        ndcg_at_k.append(ndcg)
+    # Skip users with no relevant items
+    users = [u for u, user_truth in enumerate(ground_truth) if user_truth]
+    if not users:
+        return {'precision': 0, 'recall': 0, 'ndcg': 0}
+    
+    n_recs = np.array([len(recommendations[u]) for u in users])
+    n_truth = np.array([len(ground_truth[u]) for u in users])
+    k = max(n_recs.max(), 1)
+    
+    # Integer codes for job IDs, shared by recommendations and ground truth
+    rec_ids = [job_id for u in users for job_id in recommendations[u]]
+    truth_ids = [job_id for u in users for job_id in ground_truth[u]]
+    codes, uniques = pd.factorize(pd.Series(rec_ids + truth_ids, dtype=object))
+    n_codes = len(uniques)
+    rec_codes, truth_codes = codes[:len(rec_ids)], codes[len(rec_ids):]
+    
+    # (user, job) pairs encoded as user * n_codes + job
+    user_index = np.arange(len(users))
+    rec_users = np.repeat(user_index, n_recs)
+    truth_pairs = np.unique(np.repeat(user_index, n_truth) * n_codes + truth_codes)
+    rec_hits = np.isin(rec_users * n_codes + rec_codes, truth_pairs)
+    
+    # Scatter hits into the (n_users x k) matrix by rank
+    ranks = np.arange(len(rec_ids)) - np.repeat(np.cumsum(n_recs) - n_recs, n_recs)
+    hits = np.zeros((len(users), k), dtype=bool)
+    hits[rec_users, ranks] = rec_hits
+    n_hits = hits.sum(axis=1)
+    
+    # Precision@k and Recall@k
+    precision = np.divide(n_hits, n_recs, out=np.zeros(len(users)), where=n_recs > 0)
+    recall = n_hits / n_truth
+    
+    # NDCG@k (Normalized Discounted Cumulative Gain, binary relevance)
+    discounts = 1 / np.log2(np.arange(k) + 2)
+    dcg = hits @ discounts
+    ideal_discounts = np.concatenate([[0], np.cumsum(discounts)])
+    idcg = ideal_discounts[np.minimum(n_truth, n_recs)]
+    ndcg = np.divide(dcg, idcg, out=np.zeros(len(users)), where=idcg > 0)
     
     # Calculate average metrics
     metrics = {
-        'precision': np.mean(precision_at_k) if precision_at_k else 0,
-        'recall': np.mean(recall_at_k) if recall_at_k else 0,
-        'ndcg': np.mean(ndcg_at_k) if ndcg_at_k else 0
+        'precision': precision.mean(),
+        'recall': recall.mean(),
+        'ndcg': ndcg.mean()
     }
     
     return metrics
 
-def evaluate_model(model, test_data, user_profiles=None, k=10):
+class TitleIndex:
+    """
+    Lowercased job titles indexed for substring lookups
+    
+    Distinct titles are indexed by character trigrams, so finding the jobs
+    whose title contains a query only verifies the titles sharing the
+    query's rarest trigram instead of scanning every job.
+    """
+    
+    def __init__(self, titles):
+        codes, self.titles = pd.factorize(titles.str.lower())
+        self.titles = list(self.titles)
+        
+        # Job rows of each distinct title, in row order
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self.titles) + 1))
+        self.rows = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.titles))]
+        
+        postings = {}
+        for title_code, title in enumerate(self.titles):
+            for gram in {title[i:i + 3] for i in range(len(title) - 2)}:
+                postings.setdefault(gram, []).append(title_code)
+        self.postings = {gram: np.array(codes) for gram, codes in postings.items()}
+        self._cache = {}
+    
+    def matching_rows(self, query):
+        """Sorted rows of the jobs whose lowercased title contains query"""
+        query = query.lower()
+        rows = self._cache.get(query)
+        if rows is None:
+            if len(query) >= 3:
+                grams = {query[i:i + 3] for i in range(len(query) - 2)}
+                candidates = min(
+                    (self.postings.get(gram, np.array([], dtype=int)) for gram in grams), key=len
+                )
+            else:
+                candidates = range(len(self.titles))
+            matching = [self.rows[c] for c in candidates if query in self.titles[c]]
+            rows = np.sort(np.concatenate(matching)) if matching else np.array([], dtype=int)
+            self._cache[query] = rows
+        return rows
+
+def simulate_users(test_data, n_users=50, seed=42):
+    """
+    Simulate user profiles and their relevant jobs from job data
+    
+    Each simulated user is a sampled job: its title, description and skills
+    form the profile, and jobs whose title contains its title are the
+    ground truth (a few random jobs when no other title matches).
+    
+    Returns:
+    - (user_profiles, ground_truth) lists
+    """
+    rng = np.random.default_rng(seed)
+    num_users = min(n_users, len(test_data))
+    
+    # Randomly select jobs to create synthetic user profiles
+    sample_indices = rng.choice(len(test_data), num_users, replace=False)
+    
+    title_index = TitleIndex(test_data['title'])
+    job_ids = test_data['id'].to_numpy()
+    titles = test_data['title'].to_numpy()
+    descriptions = test_data['description'].to_numpy()
+    skills = test_data['skills'].to_numpy()
+    
+    user_profiles = []
+    ground_truth = []
+    for idx in sample_indices:
+        # Find similar jobs to this one to use as ground truth
+        similar_rows = title_index.matching_rows(titles[idx])
+        if len(similar_rows) > 1:  # Ensure we have more than just the sample job
+            profile_job_ids = job_ids[similar_rows].tolist()
+        else:
+            # If no similar jobs by title, just use a few random jobs
+            random_rows = rng.choice(len(test_data), min(5, len(test_data)), replace=False)
+            profile_job_ids = [job_ids[idx]] + job_ids[random_rows].tolist()
+        
+        # Create user document from the main job
+        job_skills = skills[idx]
+        job_skills = ' '.join(job_skills) if isinstance(job_skills, list) else job_skills
+        user_profiles.append(f"{titles[idx]} {descriptions[idx]} {job_skills}")
+        ground_truth.append(profile_job_ids)
+    
+    return user_profiles, ground_truth
+
+_worker_model = None
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+def _recommend_ids(user_documents, k, model=None):
+    """Recommended job IDs for a batch of user documents"""
+    model = model if model is not None else _worker_model
+    batches = model.get_recommendations_batch(user_documents, top_n=k)
+    return [[rec['job_id'] for rec in recs] for recs in batches]
+
+def recommend_all(model, user_documents, k=10, n_jobs=1, batch_size=1000):
+    """
+    Top-k job IDs for every user document
+    
+    Users are scored batch_size at a time with get_recommendations_batch;
+    with n_jobs > 1 the batches are spread over a process pool (the model
+    is sent once to each worker).
+    """
+    batches = [user_documents[i:i + batch_size] for i in range(0, len(user_documents), batch_size)]
+    if n_jobs > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(model,)) as executor:
+            results = executor.map(_recommend_ids, batches, [k] * len(batches))
+            return [ids for batch in results for ids in batch]
+    return [ids for batch in batches for ids in _recommend_ids(batch, k, model)]
+
+def evaluate_model(model, test_data, user_profiles=None, k=10, ground_truth=None, n_users=50,
+                   n_jobs=1, batch_size=1000):
     """
     Evaluate recommender model performance
     
     Parameters:
     - model: Trained recommender model
     - test_data: DataFrame of job data for evaluation
-    - user_profiles: DataFrame of user profiles (if None, we simulate users)
+    - user_profiles: List of user profile documents (if None, we simulate users)
     - k: Number of recommendations to generate
+    - ground_truth: Relevant job IDs of each user (required with user_profiles)
+    - n_users: Number of users to simulate
+    - n_jobs: Worker processes for scoring
+    - batch_size: Users scored per batch
     
     Returns:
     - Dictionary of evaluation metrics
@@ -85,71 +216,95 @@ def evaluate_model(model, test_data, user_profiles=None, k=10):
     # If no user profiles provided, simulate by using job descriptions as user profiles
     if user_profiles is None:
         logger.info("No user profiles provided. Simulating user profiles from job data.")
-        
-        # Create synthetic user profiles based on job clusters
-        np.random.seed(42)
-        num_users = min(50, len(test_data))
-        
-        # Randomly select jobs to create synthetic user profiles
-        sample_indices = np.random.choice(len(test_data), num_users, replace=False)
-        
-        user_profiles = []
-        ground_truth = []
-        
-        for idx in sample_indices:
-            job = test_data.iloc[idx]
-            # Create user profile from job title and skills
-            profile_job_ids = []
-            
-            # Find similar jobs to this one to use as ground truth
-            job_titles = test_data['title'].str.lower()
-            similar_job_mask = job_titles.str.contains(job['title'].lower())
-            
-            # Add the sample job and similar jobs to ground truth
-            similar_jobs = test_data[similar_job_mask]
-            if len(similar_jobs) > 1:  # Ensure we have more than just the sample job
-                profile_job_ids = similar_jobs['id'].tolist()
-            else:
-                # If no similar jobs by title, just use a few random jobs
-                random_ids = test_data.sample(min(5, len(test_data)))['id'].tolist()
-                profile_job_ids = [job['id']] + random_ids
-            
-            # Create user document from the main job
-            user_document = f"{job['title']} {job['description']} {' '.join(job['skills']) if isinstance(job['skills'], list) else job['skills']}"
-            
-            user_profiles.append(user_document)
-            ground_truth.append(profile_job_ids)
-    
-    # Generate recommendations for each user
-    all_recommendations = []
-    
-    for user_doc in user_profiles:
-        try:
-            # Get top-k recommendations
-            recs = model.get_recommendations(user_doc, top_n=k)
-            rec_ids = [rec['job_id'] for rec in recs]
-            all_recommendations.append(rec_ids)
-        except Exception as e:
-            logger.error(f"Error getting recommendations: {e}")
-            all_recommendations.append([])
+        user_profiles, ground_truth = simulate_users(test_data, n_users)
+    elif ground_truth is None:
+        raise ValueError("ground_truth is required with user_profiles")
+    
+    # Generate recommendations for all users in batches
+    all_recommendations = recommend_all(model, list(user_profiles), k, n_jobs, batch_size)
     
     # Calculate evaluation metrics
     metrics = calculate_metrics(all_recommendations, ground_truth)
     
     return metrics
 
+
+def evaluate_ann(model, user_documents, k=10, n_probes=(1, 4, 8, 16), n_candidates=1000):
+    """
+    Measure the recall/latency trade-off of the ANN index against exact search
+    
+    Parameters:
+    - model: Trained ContentBasedRecommender with an ANN index built
+    - user_documents: List of user profile documents used as queries
+    - k: Number of recommendations to compare
+    - n_probes: Values of n_probe to evaluate
+    - n_candidates: Candidates re-ranked per query
+    
+    Returns:
+    - List of dictionaries (one for exact search, then one per n_probe) with
+      recall@k against exact search and p50/p99 latency in milliseconds
+    """
+    def run(use_ann):
+        latencies = []
+        results = []
+        for user_doc in user_documents:
+            start = time.perf_counter()
+            recs = model.get_recommendations(user_doc, top_n=k, use_ann=use_ann)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append([rec['job_id'] for rec in recs])
+        return results, latencies
+    
+    def summarize(name, results, latencies, exact_results):
+        recall = [
+            len(set(found) & set(truth)) / len(truth)
+            for found, truth in zip(results, exact_results) if truth
+        ]
+        return {
+            'search': name,
+            'recall': float(np.mean(recall)) if recall else 0.0,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+        }
+    
+    exact_results, exact_latencies = run(use_ann=False)
+    report = [summarize('exact', exact_results, exact_latencies, exact_results)]
+    
+    index = model.ann_index
+    default_n_probe, default_n_candidates = index.n_probe, index.n_candidates
+    try:
+        index.n_candidates = n_candidates
+        for n_probe in n_probes:
+            index.n_probe = n_probe
+            results, latencies = run(use_ann=True)
+            report.append(summarize(f'ann n_probe={n_probe}', results, latencies, exact_results))
+    finally:
+        index.n_probe, index.n_candidates = default_n_probe, default_n_candidates
+    
+    return report
+
 def main():
     parser = argparse.ArgumentParser(description="Evaluate SmartHire recommender model")
-    parser.add_argument('--data', type=str, required=True, help='Path to job data CSV')
+    parser.add_argument('--data', type=str, required=True, help='Path to job data (CSV, Parquet or Arrow)')
     parser.add_argument('--model', type=str, help='Path to trained model (optional)')
     parser.add_argument('--k', type=int, default=10, help='Number of recommendations to evaluate')
+    parser.add_argument('--n-users', type=int, default=50, help='Number of users to simulate')
+    parser.add_argument('--n-jobs', type=int, default=1, help='Worker processes for scoring users')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Users scored per batch')
+    parser.add_argument('--ann', action='store_true',
+                        help='Report recall@k and latency of the ANN index against exact search')
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 4, 8, 16],
+                        help='ANN inverted lists scanned per query (one run per value)')
+    parser.add_argument('--n-candidates', type=int, default=1000,
+                        help='ANN candidates re-ranked with the exact cosine')
+    parser.add_argument('--n-components', type=int, default=128,
+                        help='ANN embedding dimension (when building a new index)')
     
     args = parser.parse_args()
     
     try:
         # Load data
         logger.info(f"Loading data from {args.data}")
-        job_data = pd.read_csv(args.data)
+        job_data = load_job_data(args.data, columns=['id', 'title', 'description', 'skills'])
         
         # Split data into train/test
         train_data, test_data = train_test_split(job_data, test_size=0.2, random_state=42)
@@ -166,7 +321,10 @@ def main():
         
         # Evaluate model
         logger.info(f"Evaluating model with k={args.k}")
-        metrics = evaluate_model(recommender, test_data, k=args.k)
+        start = time.perf_counter()
+        metrics = evaluate_model(recommender, test_data, k=args.k, n_users=args.n_users,
+                                 n_jobs=args.n_jobs, batch_size=args.batch_size)
+        logger.info(f"Evaluated {min(args.n_users, len(test_data))} users in {time.perf_counter() - start:.1f}s")
         
         # Print results
         logger.info("Evaluation results:")
@@ -174,6 +332,24 @@ def main():
         logger.info(f"Recall@{args.k}: {metrics['recall']:.4f}")
         logger.info(f"NDCG@{args.k}: {metrics['ndcg']:.4f}")
         
+        if args.ann:
+            if recommender.ann_index is None:
+                logger.info("Building ANN index")
+                recommender.build_ann_index(n_components=args.n_components)
+            
+            user_documents = (
+                test_data['title'] + ' ' + test_data['description'].fillna('')
+            ).head(200).tolist()
+            report = evaluate_ann(recommender, user_documents, k=args.k,
+                                  n_probes=args.n_probe, n_candidates=args.n_candidates)
+            
+            logger.info(f"ANN results (recall@{args.k} against exact search):")
+            for row in report:
+                logger.info(
+                    f"{row['search']:>16}: recall={row['recall']:.4f} "
+                    f"p50={row['p50_ms']:.2f}ms p99={row['p99_ms']:.2f}ms"
+                )
+        
     except Exception as e:
         logger.error(f"Error in evaluation: {e}")
         sys.exit(1)
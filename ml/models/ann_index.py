@@ -0,0 +1,106 @@
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour index over TF-IDF job vectors
+
+    Job vectors are reduced to dense embeddings with TruncatedSVD and
+    partitioned into n_lists inverted lists by k-means (IVF). A query is
+    embedded the same way, the n_probe closest lists are scanned, and the
+    n_candidates best embeddings are returned for exact re-ranking.
+
+    Raising n_probe or n_candidates improves recall at the cost of latency.
+    Recall is bounded mostly by n_candidates: on the synthetic Zipf corpus
+    (ml/benchmarks/synthetic_corpus.py, 300 profiles, evaluate_ann), recall@10
+    against exact search was
+
+        jobs      n_candidates  n_probe=4  n_probe=8  ANN / exact p50
+        20,000    200           0.91       0.91       6.1 / 5.3 ms
+        20,000    1000          0.999      1.0        5.5 / 5.3 ms
+        100,000   200           0.52       0.52       6.3 / 13.7 ms
+        100,000   1000          0.91       0.93       7.4 / 13.7 ms
+
+    so the defaults are n_probe=8 and n_candidates=1000. Search is not
+    exact and only pays off on large corpora, so the index is opt-in: it
+    is built by train_model.py --ann, and used whenever a model has one.
+    """
+
+    def __init__(self, n_components=128, n_lists=None, n_probe=8, n_candidates=1000, random_state=42):
+        """
+        n_components: Embedding dimension
+        n_lists: Number of inverted lists (default: about sqrt(n_jobs))
+        n_probe: Lists scanned per query
+        n_candidates: Candidates returned for exact re-ranking
+        random_state: Seed for SVD and k-means
+        """
+        self.n_components = n_components
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_candidates = n_candidates
+        self.random_state = random_state
+
+        self.svd = None
+        self.centroids = None
+        self.list_ptr = None
+        self.list_rows = None
+        self.list_embeddings = None
+        self.n_indexed = 0
+
+    def _embed(self, vectors):
+        return normalize(self.svd.transform(vectors)).astype(np.float32)
+
+    def build(self, job_vectors):
+        """Fit the embedding and partition job_vectors into inverted lists"""
+        n_jobs, n_features = job_vectors.shape
+        n_components = max(1, min(self.n_components, n_features - 1, n_jobs - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        self.svd.fit(job_vectors)
+        embeddings = self._embed(job_vectors)
+
+        n_lists = self.n_lists or int(np.sqrt(n_jobs))
+        n_lists = max(1, min(n_lists, n_jobs))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=self.random_state, n_init=3)
+        labels = kmeans.fit_predict(embeddings)
+        self.centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+
+        # Store each list contiguously (CSR-style offsets into list_rows)
+        self.list_rows = np.argsort(labels, kind='stable')
+        self.list_embeddings = embeddings[self.list_rows]
+        self.list_ptr = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+        self.n_indexed = n_jobs
+
+        return self
+
+    def search(self, query_vector, n_total_rows=None, n_probe=None, n_candidates=None):
+        """
+        Candidate job rows for one TF-IDF query vector
+
+        Rows at or beyond n_indexed (jobs added after the index was built)
+        are always returned as candidates.
+        """
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        n_candidates = n_candidates or self.n_candidates
+
+        query = self._embed(query_vector)[0]
+        probes = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        positions = np.concatenate([
+            np.arange(self.list_ptr[probe], self.list_ptr[probe + 1]) for probe in probes
+        ])
+
+        if len(positions) > n_candidates:
+            scores = self.list_embeddings[positions] @ query
+            positions = positions[np.argpartition(-scores, n_candidates - 1)[:n_candidates]]
+        candidates = self.list_rows[positions]
+
+        if n_total_rows is not None and n_total_rows > self.n_indexed:
+            candidates = np.concatenate([candidates, np.arange(self.n_indexed, n_total_rows)])
+        return np.sort(candidates)
+
+    def rebuild(self, job_vectors):
+        """A new index with the same parameters over job_vectors"""
+        return IVFIndex(
+            self.n_components, self.n_lists, self.n_probe, self.n_candidates, self.random_state
+        ).build(job_vectors)
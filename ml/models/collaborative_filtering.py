@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.utils.extmath import randomized_svd
+
+# Implicit-feedback strength of an application, by status
+STATUS_WEIGHTS = {
+    'pending': 1.0,
+    'applied': 1.0,
+    'reviewed': 2.0,
+    'interview': 3.0,
+    'offer': 4.0,
+    'accepted': 4.0,
+    'rejected': 1.0,
+}
+
+class CollaborativeFilteringRecommender:
+    """
+    Implicit-feedback collaborative filtering on a sparse interaction matrix
+
+    Builds a CSR user x job matrix of confidence weights (log-damped sums of
+    interaction weights) and factorizes it with a truncated randomized SVD
+    ("PureSVD"). Only the float32 item factors V are kept. A user is scored
+    by folding in their interaction row: scores = (r_u V) V^T. Interactions
+    made after training (e.g. the user's current applications) can be passed
+    to score() and are folded in the same way, so new users and new
+    applications are scored without refitting.
+    """
+
+    def __init__(self, n_factors=64, n_iter=5, random_state=42):
+        """
+        n_factors: Number of latent factors
+        n_iter: Power iterations of the randomized SVD
+        random_state: Seed for the randomized SVD
+        """
+        self.n_factors = n_factors
+        self.n_iter = n_iter
+        self.random_state = random_state
+        self.item_factors = None
+        self.job_ids = None
+        self.user_ids = None
+        self.user_interactions = None
+
+    @staticmethod
+    def interaction_weights(interactions):
+        """Weight of each interaction: 'weight' column, else mapped 'status', else 1"""
+        if 'weight' in interactions.columns:
+            return interactions['weight'].to_numpy(dtype=np.float32)
+        if 'status' in interactions.columns:
+            return interactions['status'].map(STATUS_WEIGHTS).fillna(1.0).to_numpy(dtype=np.float32)
+        return np.ones(len(interactions), dtype=np.float32)
+
+    def fit(self, interactions, job_ids):
+        """
+        Train on user-job interactions
+        interactions: DataFrame with columns [user_id, job_id] and optionally
+            weight or status (e.g. rows of the applications table)
+        job_ids: Job IDs defining the item space (the content-based job_ids);
+            interactions with other jobs are ignored
+        """
+        self.job_ids = np.asarray(job_ids)
+        job_index = pd.Index(self.job_ids)
+
+        items = job_index.get_indexer(interactions['job_id'])
+        known = items >= 0
+        user_codes, user_ids = pd.factorize(interactions['user_id'].to_numpy()[known])
+        weights = self.interaction_weights(interactions)[known]
+
+        # Duplicate (user, job) pairs are summed, then damped
+        matrix = sp.csr_matrix(
+            (weights, (user_codes, items[known])),
+            shape=(len(user_ids), len(self.job_ids)),
+            dtype=np.float32,
+        )
+        matrix.sum_duplicates()
+        matrix.data = np.log1p(matrix.data)
+
+        self.user_ids = pd.Index(user_ids)
+        self.user_interactions = matrix
+
+        n_factors = min(self.n_factors, min(matrix.shape) - 1)
+        if n_factors < 1 or matrix.nnz == 0:
+            self.item_factors = np.zeros((len(self.job_ids), 0), dtype=np.float32)
+            return self
+
+        _, _, vt = randomized_svd(
+            matrix, n_components=n_factors, n_iter=self.n_iter, random_state=self.random_state
+        )
+        self.item_factors = np.ascontiguousarray(vt.T, dtype=np.float32)
+
+        return self
+
+    def _user_rows(self, user_ids, job_ids=None):
+        """
+        Interaction rows for user_ids (empty rows for unknown users)
+        job_ids: Optional list, per user, of job IDs the user interacted with
+            since training; each counts as an application unless the
+            training row already holds that job
+        """
+        positions = self.user_ids.get_indexer(user_ids)
+        known = positions >= 0
+        selector = sp.csr_matrix(
+            (np.ones(known.sum(), dtype=np.float32), (np.where(known)[0], positions[known])),
+            shape=(len(positions), len(self.user_ids)),
+        )
+        rows = selector @ self.user_interactions
+        if job_ids is None:
+            return rows
+
+        lengths = [len(user_job_ids) for user_job_ids in job_ids]
+        items = pd.Index(self.job_ids).get_indexer([job_id for user_job_ids in job_ids for job_id in user_job_ids])
+        users = np.repeat(np.arange(len(lengths)), lengths)
+        recent = sp.csr_matrix(
+            (np.full((items >= 0).sum(), np.log1p(STATUS_WEIGHTS['applied']), dtype=np.float32),
+             (users[items >= 0], items[items >= 0])),
+            shape=rows.shape,
+        )
+        recent.sum_duplicates()
+        recent.data[:] = np.log1p(STATUS_WEIGHTS['applied'])
+        return rows.maximum(recent).tocsr()
+
+    def has_interactions(self, user_ids, job_ids=None):
+        """Boolean mask of users that have at least one interaction (see _user_rows for job_ids)"""
+        return np.diff(self._user_rows(user_ids, job_ids).indptr) > 0
+
+    def score(self, user_ids, job_ids=None):
+        """
+        Score every job for each user
+        user_ids: List of user IDs
+        job_ids: Optional list, per user, of job IDs the user interacted with
+            since training (e.g. their current applications), folded into
+            their row; users unknown at training time are scored from these
+
+        Returns a float32 array (n_users x n_jobs) of scores scaled to [0, 1]
+        per user; users without interactions get all zeros.
+        """
+        if self.item_factors is None:
+            raise ValueError("Collaborative filtering model not fitted yet")
+
+        user_factors = self._user_rows(user_ids, job_ids) @ self.item_factors
+        scores = user_factors @ self.item_factors.T
+
+        # Scale per user so the blend weights mean the same for every user
+        np.maximum(scores, 0, out=scores)
+        row_max = scores.max(axis=1, keepdims=True)
+        np.divide(scores, row_max, out=scores, where=row_max > 0)
+        return scores
+
+    def get_state(self):
+        """Arrays needed to restore the model with set_state"""
+        return {
+            'n_factors': self.n_factors,
+            'item_factors': self.item_factors,
+            'job_ids': self.job_ids,
+            'user_ids': np.asarray(self.user_ids),
+            'user_interactions': self.user_interactions,
+        }
+
+    def set_state(self, state):
+        self.n_factors = state['n_factors']
+        self.item_factors = state['item_factors']
+        self.job_ids = state['job_ids']
+        self.user_ids = pd.Index(state['user_ids'])
+        self.user_interactions = state['user_interactions']
+        return self
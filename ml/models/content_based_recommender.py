@@ -4,17 +4,104 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import joblib
 import os
-import re
+import time
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 
+from .text_preprocessor import TextPreprocessor
+from .parallel_fit import resolve_n_jobs, parallel_preprocess, parallel_fit_transform
+from .incremental_index import IncrementalJobIndex, RefitPolicy, ReadWriteLock
+from .model_artifact import save_artifact, load_artifact, is_artifact_dir
+from .ann_index import IVFIndex
+from .inverted_index import InvertedIndex
+from .job_attributes import JobAttributeStore
+
+def select_top_n(similarities, top_n):
+    """
+    Select the indices of the top_n highest scores in each row
+    
+    Uses a partial selection (argpartition) and only sorts the selected
+    candidates, so the cost is O(n + top_n log top_n) per row instead of a
+    full O(n log n) sort. Ties are ordered by ascending job index, also at
+    the top-N boundary.
+    
+    Parameters:
+    - similarities: 2D array of scores, one row per user
+    - top_n: Number of indices to return per row
+    
+    Returns:
+    - 2D array of job indices ordered by descending score
+    """
+    n_rows, n_jobs = similarities.shape
+    top_n = max(0, min(top_n, n_jobs))
+    if top_n == 0 or n_rows == 0:
+        return np.empty((n_rows, top_n), dtype=np.intp)
+    
+    if top_n < n_jobs:
+        candidates = np.argpartition(-similarities, top_n - 1, axis=1)[:, :top_n]
+    else:
+        candidates = np.broadcast_to(np.arange(n_jobs), (n_rows, n_jobs))
+    candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+    
+    # argpartition cuts ties at the boundary arbitrarily: where more scores
+    # equal the top_n-th one than it kept, take them all and cut by index
+    if top_n < n_jobs:
+        kth_scores = candidate_scores.min(axis=1)
+        n_at_least = (similarities >= kth_scores[:, np.newaxis]).sum(axis=1)
+        candidates = candidates.copy()
+        for row in np.flatnonzero(n_at_least > top_n):
+            tied = np.flatnonzero(similarities[row] >= kth_scores[row])
+            order = np.lexsort((tied, -similarities[row, tied]))[:top_n]
+            candidates[row] = tied[order]
+        candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+    
+    order = np.lexsort((candidates, -candidate_scores), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+class StageClock:
+    """
+    Add the duration (ms) of consecutive stages to an optional dictionary
+
+    With timings=None nothing is measured, so callers that do not ask for
+    timings pay no overhead. Durations accumulate when a stage repeats.
+    """
+    
+    def __init__(self, timings=None):
+        self.timings = timings
+        self.last = time.perf_counter() if timings is not None else None
+    
+    def lap(self, stage):
+        """Close the current stage under the name stage"""
+        if self.timings is not None:
+            now = time.perf_counter()
+            self.timings[stage] = self.timings.get(stage, 0.0) + (now - self.last) * 1000
+            self.last = now
+
 class ContentBasedRecommender:
     def __init__(self, max_features=5000):
         self.max_features = max_features
         self.tfidf_vectorizer = None
         self.job_vectors = None
         self.job_ids = None
+        self.active_mask = None
+        self.ann_index = None
+        self.inverted_index = None
+        self.job_attributes = None
+        
+        # Incremental updates (add_jobs/remove_jobs)
+        self.refit_policy = RefitPolicy()
+        self.refit_callback = None
+        self.refit_required = False
+        self._job_index = None
+        self._inactive_rows = None
+        self._oov_terms = 0
+        self._seen_terms = 0
+        self.oov_baseline = 0.0
+        
+        # Readers (scoring) share the job rows; add_jobs/remove_jobs replace
+        # them exclusively, so a reader never sees vectors and IDs that differ
+        self._rows_lock = ReadWriteLock()
         
         # Download nltk resources if needed
         try:
@@ -32,38 +119,47 @@ class ContentBasedRecommender:
             
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
+        self.preprocessor = TextPreprocessor(self.stop_words, self.lemmatizer)
     
-    def _preprocess_text(self, text):
-        """Clean and preprocess text data"""
-        if not isinstance(text, str):
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        
-        # Tokenize, remove stopwords, and lemmatize
-        tokens = nltk.word_tokenize(text)
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens if token not in self.stop_words]
-        
-        return ' '.join(tokens)
+    def __getstate__(self):
+        # Locks cannot be pickled; a new one is created on load
+        state = self.__dict__.copy()
+        del state['_rows_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rows_lock = ReadWriteLock()
     
-    def fit(self, job_data):
+    def reading(self):
         """
-        Train the recommender with job data
-        job_data: DataFrame with columns [id, title, description, skills]
+        Context manager under which job_vectors, job_ids, the active mask,
+        the attributes and the indexes stay consistent with each other
         """
+        return self._rows_lock.read()
+    
+    def _preprocess_text(self, text):
+        """Clean and preprocess text data"""
+        return self.preprocessor.preprocess(text)
+    
+    def _build_documents(self, job_data, n_jobs=1):
+        """Preprocess job columns and build one document per job"""
         # Preprocess text data
-        job_data['processed_title'] = job_data['title'].apply(self._preprocess_text)
-        job_data['processed_description'] = job_data['description'].apply(self._preprocess_text)
-        
-        # Process skills - ensure it's a string
-        if isinstance(job_data['skills'].iloc[0], list):
-            job_data['processed_skills'] = job_data['skills'].apply(lambda x: ' '.join(self._preprocess_text(skill) for skill in x))
+        if n_jobs > 1:
+            (
+                job_data['processed_title'],
+                job_data['processed_description'],
+                job_data['processed_skills'],
+            ) = parallel_preprocess(job_data, self.stop_words, self.preprocessor.cache_size, n_jobs)
         else:
-            job_data['processed_skills'] = job_data['skills'].apply(self._preprocess_text)
+            job_data['processed_title'] = self.preprocessor.preprocess_batch(job_data['title'])
+            job_data['processed_description'] = self.preprocessor.preprocess_batch(job_data['description'])
+            
+            # Process skills - ensure it's a string
+            if isinstance(job_data['skills'].iloc[0], list):
+                job_data['processed_skills'] = self.preprocessor.preprocess_lists(job_data['skills'])
+            else:
+                job_data['processed_skills'] = self.preprocessor.preprocess_batch(job_data['skills'])
         
         # Create document for each job
         job_data['document'] = (
@@ -72,6 +168,20 @@ class ContentBasedRecommender:
             job_data['processed_skills']
         )
         
+        return job_data['document']
+    
+    def fit(self, job_data, n_jobs=1):
+        """
+        Train the recommender with job data
+        job_data: DataFrame with columns [id, title, description, skills], and
+            optionally filterable attributes (location, job_type,
+            experience_level, salary_min, salary_max) and is_active
+        n_jobs: Number of worker processes for preprocessing and vectorization
+            (-1 uses all cores). Results are identical to the serial path.
+        """
+        n_jobs = resolve_n_jobs(n_jobs)
+        documents = self._build_documents(job_data, n_jobs)
+        
         # Initialize and fit TF-IDF vectorizer
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=self.max_features,
@@ -80,59 +190,434 @@ class ContentBasedRecommender:
         )
         
         # Create vectors for jobs
-        self.job_vectors = self.tfidf_vectorizer.fit_transform(job_data['document'])
+        if n_jobs > 1:
+            self.job_vectors = parallel_fit_transform(
+                self.tfidf_vectorizer, documents.tolist(), n_jobs
+            )
+        else:
+            self.job_vectors = self.tfidf_vectorizer.fit_transform(documents)
         self.job_ids = job_data['id'].values
+        self.ann_index = None
+        self.inverted_index = InvertedIndex(self.job_vectors)
+        self.job_attributes = JobAttributeStore.from_frame(job_data)
+        
+        # Inactive postings are indexed but never recommended
+        active_mask = None
+        if 'is_active' in job_data.columns:
+            active_mask = job_data['is_active'].fillna(True).astype(bool).to_numpy()
+        self._reset_incremental_state(active_mask)
+        
+        # Out-of-vocabulary share of the training corpus, the reference for drift
+        sample_size = min(len(documents), 1000)
+        sample = np.random.default_rng(42).choice(len(documents), sample_size, replace=False)
+        oov_terms, total_terms = self._count_oov_terms(documents.iloc[sample])
+        self.oov_baseline = oov_terms / total_terms if total_terms else 0.0
+        
+        return self
+    
+    def _count_oov_terms(self, documents):
+        """Count analyzed terms, and those missing from the vocabulary"""
+        analyze = self.tfidf_vectorizer.build_analyzer()
+        vocabulary = self.tfidf_vectorizer.vocabulary_
+        oov_terms = 0
+        total_terms = 0
+        for document in documents:
+            terms = analyze(document)
+            total_terms += len(terms)
+            oov_terms += sum(1 for term in terms if term not in vocabulary)
+        return oov_terms, total_terms
+    
+    def _reset_incremental_state(self, active_mask=None):
+        """Forget incremental updates after a fit or load"""
+        self._job_index = None
+        self._oov_terms = 0
+        self._seen_terms = 0
+        self.refit_required = False
+        self._set_active_mask(active_mask)
+    
+    def _set_active_mask(self, active_mask):
+        self.active_mask = active_mask
+        if active_mask is None or active_mask.all():
+            self._inactive_rows = None
+        else:
+            self._inactive_rows = np.where(~active_mask)[0]
+    
+    def _get_job_index(self):
+        if self._job_index is None:
+            self._job_index = IncrementalJobIndex(self.job_vectors, self.job_ids, self.active_mask)
+        return self._job_index
+    
+    def _sync_from_job_index(self):
+        """Point job_vectors/job_ids/active_mask at the incremental index"""
+        index = self._job_index
+        compacted = self.refit_policy.should_compact(index.n_tombstoned, index.n_rows)
+        if compacted:
+            kept_rows = np.flatnonzero(index.active_mask)
+            index.compact()
+            if self.job_attributes is not None:
+                self.job_attributes = self.job_attributes.take(kept_rows)
+        self.job_vectors = index.job_vectors
+        self.job_ids = index.job_ids
+        self._set_active_mask(index.active_mask)
+        
+        # Compaction renumbers rows, so the postings and ANN lists must be rebuilt
+        if compacted:
+            self.inverted_index = InvertedIndex(self.job_vectors)
+            if self.ann_index is not None:
+                self.ann_index = self.ann_index.rebuild(self.job_vectors)
+    
+    def add_jobs(self, job_data):
+        """
+        Add new or updated job postings without refitting
+        job_data: DataFrame with columns [id, title, description, skills], and
+            optionally the attribute columns and is_active (see fit)
+        
+        Postings are vectorized with the existing vocabulary and appended to
+        job_vectors/job_ids. A posting whose ID is already indexed replaces
+        the previous version. When the share of out-of-vocabulary terms in
+        added postings crosses refit_policy's threshold, refit_required is set
+        and refit_callback (if any) is called once.
+        
+        Returns the number of postings added.
+        """
+        self._check_fitted()
+        if len(job_data) == 0:
+            return 0
+        
+        documents = self._build_documents(job_data.copy())
+        job_vectors = self.tfidf_vectorizer.transform(documents)
+        
+        # Track vocabulary drift: terms the fitted vocabulary cannot represent
+        oov_terms, total_terms = self._count_oov_terms(documents)
+        self._oov_terms += oov_terms
+        self._seen_terms += total_terms
+        
+        with self._rows_lock.write():
+            job_index = self._get_job_index()
+            job_index.append(job_vectors, job_data['id'].tolist())
+            if self.job_attributes is not None:
+                self.job_attributes.append(job_data)
+            if 'is_active' in job_data.columns:
+                job_index.remove(job_data.loc[~job_data['is_active'].fillna(True).astype(bool), 'id'].tolist())
+            self._sync_from_job_index()
+        
+        if not self.refit_required and self.refit_policy.should_refit(self.vocabulary_drift, self._seen_terms):
+            self.refit_required = True
+            if self.refit_callback is not None:
+                self.refit_callback(self)
+        
+        return len(job_data)
+    
+    def remove_jobs(self, job_ids):
+        """
+        Remove (tombstone) jobs so they are no longer recommended
+        job_ids: IDs of deleted or deactivated jobs
         
+        Returns the number of jobs removed.
+        """
+        self._check_fitted()
+        with self._rows_lock.write():
+            removed = self._get_job_index().remove(job_ids)
+            self._sync_from_job_index()
+        return removed
+    
+    @property
+    def vocabulary_drift(self):
+        """Rise of the out-of-vocabulary term share of added postings over training"""
+        if not self._seen_terms:
+            return 0.0
+        return max(0.0, self._oov_terms / self._seen_terms - self.oov_baseline)
+    
+    def filter_mask(self, filters=None):
+        """
+        Boolean mask of the job rows that can be recommended
+        filters: Optional attribute filters, e.g. {'job_type': 'full-time',
+            'salary_min': 50000} (see job_attributes.FILTERS)
+        
+        Removed jobs are always excluded. Returns None when every job can be
+        recommended.
+        """
+        mask = self.active_mask if self._inactive_rows is not None else None
+        if filters:
+            if self.job_attributes is None:
+                raise ValueError("Model has no job attributes; retrain it to use filters")
+            attribute_mask = self.job_attributes.mask(filters)
+            mask = attribute_mask if mask is None else mask & attribute_mask
+        return mask
+    
+    def _count_allowed(self, mask):
+        if mask is None:
+            return self.job_vectors.shape[0]
+        return int(np.count_nonzero(mask))
+    
+    @property
+    def n_active_jobs(self):
+        """Number of jobs that can be recommended"""
+        with self.reading():
+            if self._inactive_rows is None:
+                return self.job_vectors.shape[0]
+            return self.job_vectors.shape[0] - len(self._inactive_rows)
+    
+    def _check_fitted(self):
+        """Raise if the recommender has not been fitted or loaded"""
+        if self.tfidf_vectorizer is None or self.job_vectors is None:
+            raise ValueError("Recommender model not fitted yet")
+    
+    def _format_recommendations(self, similarities, top_indices):
+        """Build the recommendation records for the selected job indices"""
+        return [
+            {"job_id": self.job_ids[i], "similarity_score": float(similarities[i])}
+            for i in top_indices
+        ]
+    
+    def _score_vectors(self, user_vectors, mask=None):
+        """Cosine similarity of user vectors to all jobs; rows outside mask score -inf"""
+        similarities = cosine_similarity(user_vectors, self.job_vectors)
+        if mask is not None:
+            similarities[:, ~mask] = -np.inf
+        return similarities
+    
+    def transform_documents(self, user_documents, timings=None):
+        """
+        TF-IDF vectors of user documents, preprocessed and transformed together
+        timings: Optional dictionary that receives the duration (ms) of the
+            preprocess and transform stages
+        """
+        self._check_fitted()
+        clock = StageClock(timings)
+        processed_user_documents = self.preprocessor.preprocess_batch(user_documents)
+        clock.lap('preprocess')
+        user_vectors = self.tfidf_vectorizer.transform(processed_user_documents)
+        clock.lap('transform')
+        return user_vectors
+    
+    def score_documents(self, user_documents, filters=None, timings=None):
+        """
+        Score every job for each user document
+        user_documents: List of text documents representing user profiles
+        filters: Optional attribute filters (see filter_mask)
+        timings: Optional dictionary that receives the duration (ms) of the
+            preprocess, transform and similarity stages
+        
+        Returns a dense (n_users x n_jobs) array of cosine similarities, with
+        -inf for removed jobs and jobs not matching the filters.
+        """
+        user_vectors = self.transform_documents(user_documents, timings)
+        clock = StageClock(timings)
+        with self.reading():
+            similarities = self._score_vectors(user_vectors, self.filter_mask(filters))
+        clock.lap('similarity')
+        return similarities
+    
+    def build_ann_index(self, **index_params):
+        """
+        Build an approximate nearest-neighbour index over the job vectors
+        index_params: IVFIndex parameters (n_components, n_lists, n_probe,
+            n_candidates) controlling the recall/latency trade-off
+        
+        Once built, get_recommendations re-ranks only the index candidates
+        with the exact TF-IDF cosine instead of scanning every job, and
+        falls back to exact search when there are fewer than top_n of them.
+        """
+        self._check_fitted()
+        self.ann_index = IVFIndex(**index_params).build(self.job_vectors)
         return self
     
-    def get_recommendations(self, user_document, top_n=10):
+    def _get_ann_recommendations(self, user_vector, top_n, mask):
+        """Rows and exact cosines of the re-ranked ANN candidates (None if they are too few)"""
+        candidates = self.ann_index.search(user_vector, n_total_rows=self.job_vectors.shape[0])
+        similarities = cosine_similarity(user_vector, self.job_vectors[candidates])
+        
+        n_candidates = len(candidates)
+        if mask is not None:
+            excluded = ~mask[candidates]
+            similarities[:, excluded] = -np.inf
+            n_candidates -= int(excluded.sum())
+        
+        # Large top_n or selective filters can leave fewer candidates than requested
+        if n_candidates < top_n and n_candidates < self._count_allowed(mask):
+            return None
+        
+        top_indices = select_top_n(similarities, min(top_n, n_candidates))[0]
+        return candidates[top_indices], similarities[0, top_indices]
+    
+    def _get_indexed_recommendations(self, user_vector, top_n, mask):
+        """Rows and exact cosines of the top jobs, scoring only jobs that share terms with the user"""
+        top_n = min(top_n, self._count_allowed(mask))
+        rows, scores = self.inverted_index.search(user_vector, self.job_vectors, top_n, mask)
+        
+        positive = scores > 0
+        rows, scores = rows[positive], scores[positive]
+        
+        # Re-score the candidates around the top-N boundary with the exact
+        # cosine, so results match a full scan bit for bit
+        if len(scores) > top_n > 0:
+            boundary = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+            near_top = scores >= boundary - 1e-9
+            rows = rows[near_top]
+        if len(rows) > 0:
+            scores = cosine_similarity(user_vector, self.job_vectors[rows])[0]
+        top_indices = select_top_n(scores[np.newaxis, :], top_n)[0]
+        rows, scores = rows[top_indices], scores[top_indices]
+        
+        # Jobs sharing no term score 0; fill up in job order, like a full scan
+        if len(rows) < top_n:
+            unscored = np.ones(self.job_vectors.shape[0], dtype=bool)
+            unscored[rows] = False
+            if mask is not None:
+                unscored &= mask
+            fill_rows = np.flatnonzero(unscored)[:top_n - len(rows)]
+            rows = np.concatenate([rows, fill_rows])
+            scores = np.concatenate([scores, np.zeros(len(fill_rows), dtype=scores.dtype)])
+        
+        return rows, scores
+    
+    def get_recommendations(self, user_document, top_n=10, use_ann=True, filters=None, timings=None):
         """
         Get job recommendations based on user profile
         user_document: Text document representing user profile
         top_n: Number of recommendations to return
+        use_ann: Use the ANN index when one is built (False forces an exact scan)
+        filters: Optional attribute filters (see filter_mask), applied before
+            top-N selection
+        timings: Optional dictionary that receives the duration (ms) of the
+            preprocess, transform and similarity (scan and top-N) stages
         """
-        if not self.tfidf_vectorizer or not self.job_vectors.any():
-            raise ValueError("Recommender model not fitted yet")
+        self._check_fitted()
+        clock = StageClock(timings)
         
         # Preprocess user document
         processed_user_document = self._preprocess_text(user_document)
+        clock.lap('preprocess')
         
         # Transform user document into vector
         user_vector = self.tfidf_vectorizer.transform([processed_user_document])
+        clock.lap('transform')
+        
+        with self.reading():
+            recommendations = self._rank(user_vector, top_n, use_ann, self.filter_mask(filters))
+        clock.lap('similarity')
+        return recommendations
+    
+    def _rank_rows(self, user_vector, top_n, use_ann, mask):
+        """Rows of the top-N jobs for one user vector, and their cosines"""
+        if use_ann and self.ann_index is not None:
+            ranked = self._get_ann_recommendations(user_vector, top_n, mask)
+            if ranked is not None:
+                return ranked
+        
+        if self.inverted_index is not None:
+            return self._get_indexed_recommendations(user_vector, top_n, mask)
         
         # Calculate similarity between user and all jobs
-        similarities = cosine_similarity(user_vector, self.job_vectors)[0]
+        similarities = self._score_vectors(user_vector, mask)[0]
         
         # Get indices of top N most similar jobs
-        top_indices = similarities.argsort()[-top_n:][::-1]
-        
-        # Return job IDs and similarity scores
-        recommendations = [
-            {"job_id": self.job_ids[i], "similarity_score": float(similarities[i])}
-            for i in top_indices
+        top_indices = select_top_n(similarities[np.newaxis, :], min(top_n, self._count_allowed(mask)))[0]
+        return top_indices, similarities[top_indices]
+    
+    def _rank(self, user_vector, top_n, use_ann, mask):
+        """Top-N recommendations for one user vector"""
+        rows, scores = self._rank_rows(user_vector, top_n, use_ann, mask)
+        return [
+            {"job_id": self.job_ids[row], "similarity_score": float(score)}
+            for row, score in zip(rows, scores)
         ]
+    
+    def get_recommendations_batch(self, user_documents, top_n=10, chunk_size=1000, filters=None, use_index=False):
+        """
+        Get job recommendations for many user profiles at once
+        user_documents: List of text documents representing user profiles
+        top_n: Number of recommendations to return per user
+        chunk_size: Number of users scored per similarity product. Bounds the
+            dense (chunk_size x n_jobs) score matrix held in memory.
+        filters: Optional attribute filters applied to every user (see filter_mask)
+        use_index: Rank each user through the ANN or inverted index, like
+            get_recommendations, instead of the dense similarity product
         
-        return recommendations
+        Returns one list of recommendations per user document, in input order,
+        identical to calling get_recommendations on each document (with an
+        exact scan unless use_index is set). Documents are preprocessed and
+        vectorized together either way.
+        """
+        # Preprocess and vectorize all user documents together
+        user_vectors = self.transform_documents(user_documents)
+        
+        all_recommendations = []
+        with self.reading():
+            mask = self.filter_mask(filters)
+            if use_index:
+                # Pruned per-user search: no (users x n_jobs) matrix is built
+                return [self._rank(user_vectors[row], top_n, True, mask) for row in range(user_vectors.shape[0])]
+            
+            top_n = min(top_n, self._count_allowed(mask))
+            for start in range(0, user_vectors.shape[0], chunk_size):
+                # One sparse matrix product scores the whole chunk against all jobs
+                chunk_similarities = self._score_vectors(user_vectors[start:start + chunk_size], mask)
+                chunk_top_indices = select_top_n(chunk_similarities, top_n)
+                for similarities, top_indices in zip(chunk_similarities, chunk_top_indices):
+                    all_recommendations.append(
+                        self._format_recommendations(similarities, top_indices)
+                    )
+        
+        return all_recommendations
     
-    def save_model(self, model_path):
-        """Save the trained model to disk"""
+    def save_model(self, model_path, artifact_format='joblib'):
+        """
+        Save the trained model to disk
+        model_path: Output file (joblib) or directory (mmap)
+        artifact_format: 'joblib' pickles the whole model into one file;
+            'mmap' writes flat arrays that load_model memory-maps, so all
+            processes on a host share one copy of the model in memory
+        """
+        if artifact_format == 'mmap':
+            save_artifact(
+                model_path, self.tfidf_vectorizer, self.job_vectors, self.job_ids,
+                active_mask=self.active_mask, extra={'oov_baseline': self.oov_baseline},
+                objects={'ann_index': self.ann_index, 'job_attributes': self.job_attributes},
+                inverted_index=self.inverted_index,
+            )
+            return
+        if artifact_format != 'joblib':
+            raise ValueError(f"Unknown artifact format: {artifact_format}")
+        
         if not os.path.exists(os.path.dirname(model_path)):
             os.makedirs(os.path.dirname(model_path))
             
         model_data = {
             'tfidf_vectorizer': self.tfidf_vectorizer,
             'job_vectors': self.job_vectors,
-            'job_ids': self.job_ids
+            'job_ids': self.job_ids,
+            'active_mask': self.active_mask,
+            'oov_baseline': self.oov_baseline,
+            'ann_index': self.ann_index,
+            'job_attributes': self.job_attributes
         }
         
         joblib.dump(model_data, model_path)
     
-    def load_model(self, model_path):
-        """Load a trained model from disk"""
-        model_data = joblib.load(model_path)
+    def load_model(self, model_path, mmap=True):
+        """
+        Load a trained model from disk
+        model_path: joblib file, or directory written with artifact_format='mmap'
+        mmap: Memory-map the arrays of a 'mmap' artifact read-only
+        """
+        if is_artifact_dir(model_path):
+            model_data = load_artifact(model_path, mmap=mmap)
+        else:
+            model_data = joblib.load(model_path)
         
         self.tfidf_vectorizer = model_data['tfidf_vectorizer']
         self.job_vectors = model_data['job_vectors']
         self.job_ids = model_data['job_ids']
+        self.oov_baseline = model_data.get('oov_baseline', 0.0)
+        self.ann_index = model_data.get('ann_index')
+        # Memory-mapped postings are shared by every process loading the
+        # artifact; older artifacts and joblib files rebuild them
+        self.inverted_index = model_data.get('inverted_index')
+        if self.inverted_index is None:
+            self.inverted_index = InvertedIndex(self.job_vectors)
+        self.job_attributes = model_data.get('job_attributes')
+        self._reset_incremental_state(model_data.get('active_mask'))
         
         return self
\ No newline at end of file
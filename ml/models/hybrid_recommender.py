@@ -1,44 +1,271 @@
 import numpy as np
+import pandas as pd
+import joblib
+import os
 from sklearn.metrics.pairwise import cosine_similarity
-from .content_based_recommender import ContentBasedRecommender
+from .content_based_recommender import ContentBasedRecommender, StageClock, select_top_n
+from .collaborative_filtering import CollaborativeFilteringRecommender
 
 class HybridRecommender:
-    def __init__(self, cb_weight=0.7, cf_weight=0.3):
+    def __init__(self, cb_weight=0.7, cf_weight=0.3, n_factors=64, candidate_factor=10):
         """
         Initialize hybrid recommender with content-based and collaborative filtering
         cb_weight: Weight for content-based recommendations
         cf_weight: Weight for collaborative filtering recommendations
+        n_factors: Number of latent factors of the collaborative filtering model
+        candidate_factor: Candidates taken from each model per recommendation
+            on the indexed path (see _rank_indexed)
         """
         self.content_based = ContentBasedRecommender()
+        self.collaborative = None
         self.cb_weight = cb_weight
         self.cf_weight = cf_weight
-        
-    def fit(self, job_data, user_job_interactions=None):
+        self.n_factors = n_factors
+        self.candidate_factor = candidate_factor
+
+        # (content-based job IDs, column of each CF job in that order), set
+        # in one assignment as concurrent readers share it
+        self._cf_alignment = None
+
+    def fit(self, job_data, user_job_interactions=None, n_jobs=1):
         """
         Train the hybrid recommender
         job_data: DataFrame with job information
-        user_job_interactions: DataFrame with user-job interactions (for collaborative filtering)
+        user_job_interactions: DataFrame with user-job interactions (for collaborative filtering),
+            columns [user_id, job_id] and optionally weight or status
+        n_jobs: Number of worker processes used to fit the content-based model
         """
         # Train content-based recommender
-        self.content_based.fit(job_data)
-        
-        # Here we could train a collaborative filtering model if we had user interaction data
-        # For now, we'll focus on content-based recommendations
-        
+        self.content_based.fit(job_data, n_jobs=n_jobs)
+
+        # Train collaborative filtering on the same job space
+        self.collaborative = None
+        if user_job_interactions is not None and len(user_job_interactions) > 0:
+            self.collaborative = CollaborativeFilteringRecommender(n_factors=self.n_factors)
+            self.collaborative.fit(user_job_interactions, self.content_based.job_ids)
+
         return self
-        
-    def get_recommendations(self, user_document, user_id=None, top_n=10):
+
+    def _cf_scores(self, user_ids, n_jobs, applied_job_ids=None):
+        """CF scores laid out in content-based job order (zeros for unknown jobs)"""
+        job_ids = self.content_based.job_ids
+        alignment = self._cf_alignment
+        if alignment is None or alignment[0] is not job_ids:
+            # Job rows move when jobs are added or compacted; realign by ID
+            alignment = (job_ids, pd.Index(job_ids).get_indexer(self.collaborative.job_ids))
+            self._cf_alignment = alignment
+        columns = alignment[1]
+
+        known = columns >= 0
+        scores = np.zeros((len(user_ids), n_jobs), dtype=np.float32)
+        scores[:, columns[known]] = self.collaborative.score(user_ids, applied_job_ids)[:, known]
+        return scores
+
+    def _has_cf(self, user_ids, applied_job_ids=None):
+        """Boolean mask of users blended with CF scores, or None if none is"""
+        if self.collaborative is None or user_ids is None or self.cf_weight == 0:
+            return None
+        has_cf = self.collaborative.has_interactions(user_ids, applied_job_ids)
+        return has_cf if has_cf.any() else None
+
+    def _blend(self, cb_scores, user_ids, applied_job_ids=None):
+        """
+        Blend content-based and CF score matrices
+
+        Users without interactions keep their pure content-based scores.
+        """
+        has_cf = self._has_cf(user_ids, applied_job_ids)
+        if has_cf is None:
+            return cb_scores, cb_scores, None
+
+        cf_scores = self._cf_scores(user_ids, cb_scores.shape[1], applied_job_ids)
+        blended = self.cb_weight * cb_scores + self.cf_weight * cf_scores
+        blended[~has_cf] = cb_scores[~has_cf]
+        return blended, cb_scores, cf_scores
+
+    def _format_recommendations(self, row, top_indices, blended, cb_scores, cf_scores):
+        job_ids = self.content_based.job_ids
+        return [
+            {
+                "job_id": job_ids[i],
+                "similarity_score": float(blended[row, i]),
+                "cb_score": float(cb_scores[row, i]),
+                "cf_score": float(cf_scores[row, i]) if cf_scores is not None else 0.0,
+            }
+            for i in top_indices
+        ]
+
+    def _rank_indexed(self, user_vector, user_id, applied_job_ids, has_cf, top_n, mask):
+        """
+        Top-N recommendations for one user vector, scoring candidate jobs only
+
+        Content-based candidates come from the ANN or inverted index of the
+        content-based model. For users with interactions, the top CF jobs are
+        added and the union is re-scored with the exact blend, so a job
+        ranks if it is near the top of either model.
+        """
+        content = self.content_based
+        job_ids = content.job_ids
+        if not has_cf:
+            rows, scores = content._rank_rows(user_vector, top_n, True, mask)
+            return [
+                {"job_id": job_ids[i], "similarity_score": float(score), "cb_score": float(score), "cf_score": 0.0}
+                for i, score in zip(rows, scores)
+            ]
+
+        n_candidates = min(top_n * self.candidate_factor, content._count_allowed(mask))
+        cb_rows, _ = content._rank_rows(user_vector, n_candidates, True, mask)
+
+        cf_scores = self._cf_scores(
+            [user_id], len(job_ids), [applied_job_ids] if applied_job_ids is not None else None
+        )
+        if mask is not None:
+            cf_scores[:, ~mask] = -np.inf
+        cf_rows = select_top_n(cf_scores, n_candidates)[0]
+
+        candidates = np.union1d(cb_rows, cf_rows)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        cb_scores = cosine_similarity(user_vector, content.job_vectors[candidates])
+        cf_scores = cf_scores[:, candidates]
+        blended = self.cb_weight * cb_scores + self.cf_weight * cf_scores
+
+        top_indices = select_top_n(blended, min(top_n, len(candidates)))[0]
+        return [
+            {
+                "job_id": job_ids[candidates[i]],
+                "similarity_score": float(blended[0, i]),
+                "cb_score": float(cb_scores[0, i]),
+                "cf_score": float(cf_scores[0, i]),
+            }
+            for i in top_indices
+        ]
+
+    def get_recommendations(self, user_document, user_id=None, top_n=10, filters=None, timings=None,
+                            applied_job_ids=None):
         """
         Get job recommendations for a user
         user_document: Text document representing user profile
         user_id: User ID for collaborative filtering (can be None)
         top_n: Number of recommendations to return
+        filters: Optional job attribute filters (see ContentBasedRecommender.filter_mask)
+        timings: Optional dictionary of stage durations (see get_recommendations_batch)
+        applied_job_ids: Job IDs the user has applied to, folded into their
+            CF interactions (see CollaborativeFilteringRecommender.score)
+
+        Candidates come from the content-based indexes (see _rank_indexed).
+        """
+        user_ids = [user_id] if user_id is not None else None
+        applied = [applied_job_ids] if applied_job_ids is not None and user_id is not None else None
+        return self.get_recommendations_batch(
+            [user_document], user_ids, top_n=top_n, filters=filters, timings=timings,
+            applied_job_ids=applied, use_index=True
+        )[0]
+
+    def get_recommendations_batch(self, user_documents, user_ids=None, top_n=10, chunk_size=1000, filters=None,
+                                  timings=None, applied_job_ids=None, use_index=False):
+        """
+        Get job recommendations for many users at once
+        user_documents: List of text documents representing user profiles
+        user_ids: List of user IDs for collaborative filtering (can be None)
+        top_n: Number of recommendations to return per user
+        chunk_size: Number of users scored per matrix product
+        filters: Optional job attribute filters applied to every user
+        timings: Optional dictionary that receives the duration (ms) of the
+            preprocess, transform and similarity stages of the content-based
+            model, and of the collaborative (blending and top-N) stage
+        applied_job_ids: Optional list, per user, of job IDs the user has
+            applied to since training, folded into their CF interactions
+        use_index: Rank candidate jobs from the content-based indexes
+            (see _rank_indexed) instead of scoring every job exactly
+
+        Removed jobs and jobs not matching the filters score -inf, so they
+        are excluded before top-N selection.
         """
-        # Get content-based recommendations
-        cb_recommendations = self.content_based.get_recommendations(user_document, top_n=top_n*2)
-        
-        # Here we would get collaborative filtering recommendations if we had that component
-        
-        # For now, just return content-based recommendations
-        # In a full implementation, we would combine the two recommendation types
-        return cb_recommendations[:top_n]
\ No newline at end of file
+        if use_index:
+            return self._get_indexed_recommendations_batch(
+                user_documents, user_ids, top_n, filters, timings, applied_job_ids
+            )
+
+        all_recommendations = []
+        # Job rows, CF alignment and results must come from one version of the index
+        with self.content_based.reading():
+            mask = self.content_based.filter_mask(filters)
+            top_n = min(top_n, self.content_based._count_allowed(mask))
+
+            for start in range(0, len(user_documents), chunk_size):
+                end = start + chunk_size
+                cb_scores = self.content_based.score_documents(
+                    user_documents[start:end], filters=filters, timings=timings
+                )
+                clock = StageClock(timings)
+                chunk_user_ids = user_ids[start:end] if user_ids is not None else None
+                chunk_applied = applied_job_ids[start:end] if applied_job_ids is not None else None
+                blended, cb_scores, cf_scores = self._blend(cb_scores, chunk_user_ids, chunk_applied)
+
+                chunk_top_indices = select_top_n(blended, top_n)
+                for row, top_indices in enumerate(chunk_top_indices):
+                    all_recommendations.append(
+                        self._format_recommendations(row, top_indices, blended, cb_scores, cf_scores)
+                    )
+                clock.lap('collaborative')
+
+        return all_recommendations
+
+    def _get_indexed_recommendations_batch(self, user_documents, user_ids, top_n, filters, timings,
+                                           applied_job_ids):
+        user_vectors = self.content_based.transform_documents(user_documents, timings)
+        clock = StageClock(timings)
+        with self.content_based.reading():
+            mask = self.content_based.filter_mask(filters)
+            top_n = min(top_n, self.content_based._count_allowed(mask))
+            has_cf = self._has_cf(user_ids, applied_job_ids)
+
+            all_recommendations = [
+                self._rank_indexed(
+                    user_vectors[row],
+                    user_ids[row] if user_ids is not None else None,
+                    applied_job_ids[row] if applied_job_ids is not None else None,
+                    has_cf is not None and has_cf[row],
+                    top_n,
+                    mask,
+                )
+                for row in range(user_vectors.shape[0])
+            ]
+        clock.lap('similarity')
+        return all_recommendations
+
+    def save_model(self, model_path, artifact_format='joblib'):
+        """
+        Save the trained model to disk
+        The content-based model is saved to model_path (see
+        ContentBasedRecommender.save_model) and the collaborative filtering
+        model next to it, in <model_path>.cf.joblib
+        """
+        self.content_based.save_model(model_path, artifact_format=artifact_format)
+
+        joblib.dump({
+            'cb_weight': self.cb_weight,
+            'cf_weight': self.cf_weight,
+            'collaborative': self.collaborative.get_state() if self.collaborative is not None else None,
+        }, self.cf_model_path(model_path))
+
+    def load_model(self, model_path, mmap=True):
+        """Load a trained model from disk"""
+        self.content_based.load_model(model_path, mmap=mmap)
+
+        self.collaborative = None
+        self._cf_alignment = None
+        cf_path = self.cf_model_path(model_path)
+        if os.path.exists(cf_path):
+            model_data = joblib.load(cf_path)
+            self.cb_weight = model_data['cb_weight']
+            self.cf_weight = model_data['cf_weight']
+            if model_data['collaborative'] is not None:
+                self.collaborative = CollaborativeFilteringRecommender().set_state(model_data['collaborative'])
+
+        return self
+
+    @staticmethod
+    def cf_model_path(model_path):
+        return os.path.normpath(model_path) + '.cf.joblib'
@@ -0,0 +1,203 @@
+import threading
+from contextlib import contextmanager
+import numpy as np
+import scipy.sparse as sp
+
+class ReadWriteLock:
+    """
+    Lock shared by readers and held exclusively by writers
+
+    Scoring threads read the job rows concurrently; add_jobs/remove_jobs
+    write them. Writers are preferred: once a writer waits, new readers wait
+    behind it, so a steady stream of requests cannot starve index updates.
+    A thread that already reads may read again (a hybrid model calling its
+    content-based part) without waiting, as it would otherwise deadlock
+    with the writer waiting for it.
+    """
+
+    def __init__(self):
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self):
+        depth = getattr(self._local, 'depth', 0)
+        with self._condition:
+            while not depth and (self._writing or self._waiting_writers):
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writing or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+class IncrementalJobIndex:
+    """
+    Growable job rows for a fitted recommender
+
+    Keeps the CSR arrays of the job vectors, the job IDs and an active mask
+    in over-allocated buffers, so appending postings copies existing rows
+    only when a buffer has to grow (amortized O(1) per row). Removed jobs
+    are tombstoned in the active mask instead of being deleted.
+    """
+
+    def __init__(self, job_vectors, job_ids, active_mask=None, growth_factor=2.0):
+        job_vectors = sp.csr_matrix(job_vectors)
+        n_rows = job_vectors.shape[0]
+
+        self.n_features = job_vectors.shape[1]
+        self.growth_factor = growth_factor
+        self.n_rows = n_rows
+        self.nnz = job_vectors.nnz
+
+        self._data = job_vectors.data.copy()
+        self._indices = job_vectors.indices.astype(np.int64)
+        self._indptr = job_vectors.indptr.astype(np.int64)
+        self._job_ids = np.asarray(job_ids, dtype=object).copy()
+        self._active = (
+            np.ones(n_rows, dtype=bool) if active_mask is None
+            else np.asarray(active_mask, dtype=bool).copy()
+        )
+
+        # Latest row for each job ID (re-added jobs shadow older rows)
+        self.row_by_id = {job_id: row for row, job_id in enumerate(self._job_ids)}
+
+    @staticmethod
+    def _reserve(buffer, size, growth_factor, fill=0):
+        """Return buffer, grown geometrically if it cannot hold size items"""
+        if size <= len(buffer):
+            return buffer
+        capacity = max(size, int(len(buffer) * growth_factor) + 1)
+        grown = np.full(capacity, fill, dtype=buffer.dtype)
+        grown[:len(buffer)] = buffer
+        return grown
+
+    @property
+    def job_vectors(self):
+        """CSR view over the used part of the buffers"""
+        return sp.csr_matrix(
+            (self._data[:self.nnz], self._indices[:self.nnz], self._indptr[:self.n_rows + 1]),
+            shape=(self.n_rows, self.n_features),
+            copy=False,
+        )
+
+    @property
+    def job_ids(self):
+        return self._job_ids[:self.n_rows]
+
+    @property
+    def active_mask(self):
+        return self._active[:self.n_rows]
+
+    @property
+    def n_tombstoned(self):
+        return int(self.n_rows - self.active_mask.sum())
+
+    def append(self, job_vectors, job_ids):
+        """
+        Append rows for new or updated jobs
+
+        Jobs whose ID is already indexed have their previous row tombstoned.
+
+        Returns the row indices of the appended jobs.
+        """
+        job_vectors = sp.csr_matrix(job_vectors)
+        n_new = job_vectors.shape[0]
+        self.remove(job_ids)
+
+        new_nnz = self.nnz + job_vectors.nnz
+        new_rows = self.n_rows + n_new
+        self._data = self._reserve(self._data, new_nnz, self.growth_factor)
+        self._indices = self._reserve(self._indices, new_nnz, self.growth_factor)
+        self._indptr = self._reserve(self._indptr, new_rows + 1, self.growth_factor)
+        self._job_ids = self._reserve(self._job_ids, new_rows, self.growth_factor, fill=None)
+        self._active = self._reserve(self._active, new_rows, self.growth_factor, fill=False)
+
+        self._data[self.nnz:new_nnz] = job_vectors.data
+        self._indices[self.nnz:new_nnz] = job_vectors.indices
+        self._indptr[self.n_rows + 1:new_rows + 1] = job_vectors.indptr[1:] + self.nnz
+        self._job_ids[self.n_rows:new_rows] = list(job_ids)
+        self._active[self.n_rows:new_rows] = True
+
+        rows = np.arange(self.n_rows, new_rows)
+        for row, job_id in zip(rows, job_ids):
+            self.row_by_id[job_id] = row
+
+        self.n_rows = new_rows
+        self.nnz = new_nnz
+        return rows
+
+    def remove(self, job_ids):
+        """
+        Tombstone jobs by ID
+
+        Returns the number of jobs that were active and are now removed.
+        """
+        removed = 0
+        for job_id in job_ids:
+            row = self.row_by_id.pop(job_id, None)
+            if row is not None and self._active[row]:
+                self._active[row] = False
+                removed += 1
+        return removed
+
+    def compact(self):
+        """Drop tombstoned rows and release unused buffer capacity"""
+        keep = np.where(self.active_mask)[0]
+        job_vectors = self.job_vectors[keep]
+        job_ids = self.job_ids[keep]
+        self.__init__(job_vectors, job_ids, growth_factor=self.growth_factor)
+
+class RefitPolicy:
+    """
+    Decide when incremental updates should give way to a full refit
+
+    Postings added with add_jobs are vectorized with the vocabulary learned
+    at fit time, so terms it has never seen are dropped. Vocabulary drift is
+    the rise of that out-of-vocabulary share above the share measured on the
+    training corpus. Once it crosses max_drift, the vectors no longer
+    describe new postings well and the model should be refitted.
+    """
+
+    def __init__(self, max_drift=0.1, min_terms=1000, max_tombstone_ratio=0.5):
+        """
+        max_drift: Rise in out-of-vocabulary term share that triggers a refit
+        min_terms: Terms that must be seen before the drift is trusted
+        max_tombstone_ratio: Tombstoned row share that triggers compaction
+        """
+        self.max_drift = max_drift
+        self.min_terms = min_terms
+        self.max_tombstone_ratio = max_tombstone_ratio
+
+    def should_refit(self, drift, total_terms):
+        """Return True when vocabulary drift crosses the threshold"""
+        return total_terms >= self.min_terms and drift > self.max_drift
+
+    def should_compact(self, n_tombstoned, n_rows):
+        """Return True when enough rows are tombstoned to rebuild the buffers"""
+        return n_rows > 0 and n_tombstoned / n_rows > self.max_tombstone_ratio
@@ -0,0 +1,114 @@
+import numpy as np
+import scipy.sparse as sp
+
+class InvertedIndex:
+    """
+    Term -> posting list index over TF-IDF job vectors
+
+    The postings are the transposed job matrix (one CSR row of job rows and
+    weights per term), plus the largest weight of each term. A query only
+    touches the postings of its own terms, so jobs sharing no term with it
+    are never scored.
+
+    Top-N search uses MaxScore pruning: query terms are ordered by their
+    score upper bound (query weight x largest posting weight). Once a
+    threshold score is known, the low-bound terms whose bounds sum to less
+    than the threshold are non-essential, since a job found only in their
+    postings cannot reach the top N. Only the postings of the essential
+    terms are gathered as candidates, and candidates are scored against all
+    query terms.
+
+    Job and query vectors are L2-normalized by the vectorizer, so scores are
+    plain dot products (equal to the cosine up to floating point rounding).
+    """
+
+    def __init__(self, job_vectors):
+        """job_vectors: Sparse (n_jobs x n_features) L2-normalized TF-IDF matrix"""
+        self.postings = sp.csr_matrix(job_vectors).T.tocsr()
+        self.postings.sort_indices()
+        self.max_weights = self.postings.max(axis=1).toarray().ravel()
+        self.n_indexed = job_vectors.shape[0]
+    
+    @classmethod
+    def from_arrays(cls, indptr, indices, data, max_weights, n_indexed):
+        """
+        Index over postings saved by a previous build (e.g. memory-mapped
+        from a model artifact), without copying or re-sorting them
+        """
+        index = cls.__new__(cls)
+        index.postings = sp.csr_matrix(
+            (data, indices, indptr), shape=(len(indptr) - 1, n_indexed), copy=False
+        )
+        index.postings.has_sorted_indices = True
+        index.max_weights = max_weights
+        index.n_indexed = n_indexed
+        return index
+
+    def _posting_rows(self, terms):
+        """Sorted, unique job rows appearing in the postings of terms"""
+        if len(terms) == 0:
+            return np.array([], dtype=int)
+        ptr = self.postings.indptr
+        return np.unique(np.concatenate(
+            [self.postings.indices[ptr[term]:ptr[term + 1]] for term in terms]
+        ))
+
+    def _score(self, query_vector, job_vectors, rows, tail_rows, active_mask):
+        """Dot product scores of the active candidate rows"""
+        rows = np.union1d(rows, tail_rows)
+        if active_mask is not None:
+            rows = rows[active_mask[rows]]
+        scores = (job_vectors[rows] @ query_vector.T).toarray().ravel()
+        return rows, scores
+
+    def search(self, query_vector, job_vectors, top_n, active_mask=None):
+        """
+        Candidate job rows and their scores for one query
+
+        Parameters:
+        - query_vector: Sparse (1 x n_features) TF-IDF vector of the user
+        - job_vectors: Current job matrix (rows beyond n_indexed, added after
+          the index was built, are always scored)
+        - top_n: Number of recommendations the candidates must cover
+        - active_mask: Boolean mask of recommendable job rows (None: all)
+
+        Returns:
+        - (rows, scores): candidate job rows in ascending order and their
+          scores. Every job that can reach the top_n is included.
+        """
+        query_vector = sp.csr_matrix(query_vector)
+        terms = query_vector.indices
+        tail_rows = np.arange(self.n_indexed, job_vectors.shape[0])
+        if len(terms) == 0:
+            return self._score(query_vector, job_vectors, self._posting_rows(terms), tail_rows, active_mask)
+
+        # Score upper bound contributed by each query term, highest first
+        bounds = query_vector.data * self.max_weights[terms]
+        order = np.argsort(-bounds, kind='stable')
+        terms, bounds = terms[order], bounds[order]
+
+        # Estimate the top-N threshold from the postings of the strongest terms
+        ptr = self.postings.indptr
+        lengths = ptr[terms + 1] - ptr[terms]
+        n_seed_terms = int(np.searchsorted(np.cumsum(lengths), top_n)) + 1
+        rows, scores = self._score(
+            query_vector, job_vectors, self._posting_rows(terms[:n_seed_terms]), tail_rows, active_mask
+        )
+        if n_seed_terms >= len(terms):
+            # The seed already covers every posting of the query
+            return rows, scores
+        threshold = 0.0
+        if 0 < top_n <= len(scores):
+            threshold = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+
+        # Lowest-bound terms whose bounds together stay under the threshold
+        # (with a small margin for floating point rounding). Jobs added since
+        # the build are not bounded and can set a threshold above every
+        # bound, leaving no essential term.
+        non_essential_bound = np.cumsum(bounds[::-1])
+        n_non_essential = int(np.searchsorted(non_essential_bound, threshold * (1 - 1e-9)))
+        essential_terms = terms[:len(terms) - n_non_essential]
+
+        return self._score(
+            query_vector, job_vectors, self._posting_rows(essential_terms), tail_rows, active_mask
+        )
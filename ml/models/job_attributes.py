@@ -0,0 +1,154 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Job columns the store keeps, by type
+CATEGORICAL_ATTRIBUTES = ['location', 'job_type', 'experience_level']
+NUMERIC_ATTRIBUTES = ['salary_min', 'salary_max']
+
+# Recommendation filters, with the same semantics as the job search API:
+# filter name -> (attribute, comparison)
+FILTERS = {
+    'location': ('location', 'contains'),
+    'job_type': ('job_type', 'equals'),
+    'experience_level': ('experience_level', 'equals'),
+    'salary_min': ('salary_min', 'at_least'),
+    'salary_max': ('salary_max', 'at_most'),
+}
+
+class JobAttributeStore:
+    """
+    Columnar job attributes, one array entry per job row
+
+    Categorical columns are dictionary-encoded (int32 codes into a list of
+    distinct values, -1 when missing), numeric columns are float64 arrays
+    (NaN when missing). Filters are evaluated as boolean masks over the job
+    rows, so recommendations can be restricted before top-N selection.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.codes = {}
+        self.categories = {}
+        self.numeric = {}
+        self._mask_cache = {}
+        self._mask_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks cannot be pickled; a new one is created on load
+        state = self.__dict__.copy()
+        state['_mask_cache'] = {}
+        del state['_mask_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._mask_lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, job_data):
+        """Build a store from the attribute columns present in job_data"""
+        return cls().append(job_data)
+
+    def _encode(self, column, values):
+        """Dictionary-encode values, extending the categories of column"""
+        categories = self.categories.setdefault(column, [])
+        local_codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        lookup = {value: code for code, value in enumerate(categories)}
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for local_code, value in enumerate(uniques):
+            if value not in lookup:
+                lookup[value] = len(categories)
+                categories.append(value)
+            mapping[local_code] = lookup[value]
+        # factorize marks missing values with -1
+        return np.where(local_codes >= 0, mapping[local_codes], -1).astype(np.int32)
+
+    def append(self, job_data):
+        """
+        Append the attributes of new job rows (in job_data order)
+
+        Columns missing from job_data are stored as missing values.
+        """
+        n_new = len(job_data)
+        for column in CATEGORICAL_ATTRIBUTES:
+            if column in job_data.columns:
+                new_codes = self._encode(column, job_data[column].values)
+            elif column in self.codes:
+                new_codes = np.full(n_new, -1, dtype=np.int32)
+            else:
+                continue
+            old_codes = self.codes.get(column, np.full(self.n_rows, -1, dtype=np.int32))
+            self.codes[column] = np.concatenate([old_codes, new_codes])
+
+        for column in NUMERIC_ATTRIBUTES:
+            if column in job_data.columns:
+                new_values = pd.to_numeric(job_data[column], errors='coerce').to_numpy(dtype=np.float64)
+            elif column in self.numeric:
+                new_values = np.full(n_new, np.nan)
+            else:
+                continue
+            old_values = self.numeric.get(column, np.full(self.n_rows, np.nan))
+            self.numeric[column] = np.concatenate([old_values, new_values])
+
+        self.n_rows += n_new
+        self._mask_cache = {}
+        return self
+
+    def take(self, rows):
+        """A new store holding only the given job rows, in that order"""
+        store = JobAttributeStore()
+        store.n_rows = len(rows)
+        store.codes = {column: codes[rows] for column, codes in self.codes.items()}
+        store.categories = {column: list(values) for column, values in self.categories.items()}
+        store.numeric = {column: values[rows] for column, values in self.numeric.items()}
+        return store
+
+    def _filter_mask(self, name, value):
+        if name not in FILTERS:
+            raise ValueError(f"Unknown filter: {name}")
+        column, comparison = FILTERS[name]
+        if column not in self.codes and column not in self.numeric:
+            raise ValueError(f"Model has no '{column}' job attribute")
+
+        if comparison == 'contains':
+            # Case-insensitive substring match, evaluated once per distinct value
+            needle = str(value).lower()
+            matching = [code for code, category in enumerate(self.categories[column])
+                        if needle in str(category).lower()]
+            return np.isin(self.codes[column], matching)
+        if comparison == 'equals':
+            categories = self.categories[column]
+            if value not in categories:
+                return np.zeros(self.n_rows, dtype=bool)
+            return self.codes[column] == categories.index(value)
+
+        # Missing salaries never match, as with NULL in SQL
+        if comparison == 'at_least':
+            return self.numeric[column] >= float(value)
+        return self.numeric[column] <= float(value)
+
+    def mask(self, filters):
+        """
+        Boolean mask of the job rows matching all filters
+        filters: Dictionary of filter name -> value (see FILTERS); None or
+            empty values are ignored
+
+        Raises ValueError for unknown filters or attributes the model lacks.
+        """
+        filters = {name: value for name, value in filters.items() if value is not None and value != ''}
+        key = json.dumps(filters, sort_keys=True, default=str)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.ones(self.n_rows, dtype=bool)
+            for name, value in filters.items():
+                mask &= self._filter_mask(name, value)
+            # Recent filter combinations are reused across users; concurrent
+            # requests evict and insert under the lock
+            with self._mask_lock:
+                if len(self._mask_cache) >= 128:
+                    self._mask_cache.pop(next(iter(self._mask_cache)), None)
+                self._mask_cache[key] = mask
+        return mask
@@ -0,0 +1,175 @@
+import json
+import os
+import shutil
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .inverted_index import InvertedIndex
+
+# Bumped whenever the on-disk layout changes
+ARTIFACT_FORMAT_VERSION = 1
+
+METADATA_FILE = 'metadata.json'
+VOCABULARY_FILE = 'vocabulary.txt'
+
+# TfidfVectorizer parameters needed to rebuild the analyzer
+VECTORIZER_PARAMS = [
+    'lowercase', 'stop_words', 'token_pattern', 'ngram_range', 'analyzer',
+    'max_df', 'min_df', 'max_features', 'binary', 'norm', 'use_idf',
+    'smooth_idf', 'sublinear_tf',
+]
+
+def is_artifact_dir(path):
+    """Return True if path is a directory written by save_artifact"""
+    return os.path.isfile(os.path.join(path, METADATA_FILE))
+
+def _save_array(directory, name, array):
+    np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(array), allow_pickle=False)
+
+def _load_array(directory, name, mmap):
+    return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r' if mmap else None, allow_pickle=False)
+
+def _job_ids_array(job_ids):
+    """Convert job IDs to a fixed-width array that can be memory-mapped"""
+    job_ids = np.asarray(job_ids)
+    if job_ids.dtype.kind in 'iuU':
+        return job_ids
+    return job_ids.astype(str)
+
+def save_artifact(artifact_dir, tfidf_vectorizer, job_vectors, job_ids, active_mask=None, extra=None,
+                  objects=None, inverted_index=None):
+    """
+    Write a model as flat, memory-mappable files
+
+    Layout of artifact_dir:
+    - data.npy, indices.npy, indptr.npy: CSR arrays of job_vectors
+    - idf.npy: IDF weights of the vectorizer
+    - job_ids.npy: Job IDs (integer or fixed-width unicode)
+    - active_mask.npy: Tombstone mask (only when some jobs are removed)
+    - postings_data.npy, postings_indices.npy, postings_indptr.npy,
+      max_weights.npy: Term postings of the inverted index, when given
+    - vocabulary.txt: One term per line, in feature index order
+    - metadata.json: Format version, shape, vectorizer parameters, extras
+    - <name>.joblib: Optional auxiliary objects (e.g. an ANN index)
+
+    The artifact is written to a temporary directory and moved into place,
+    so readers never see a partially written model.
+    """
+    artifact_dir = os.path.normpath(artifact_dir)
+    parent_dir = os.path.dirname(artifact_dir) or '.'
+    os.makedirs(parent_dir, exist_ok=True)
+
+    tmp_dir = f'{artifact_dir}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    job_vectors = sp.csr_matrix(job_vectors)
+    _save_array(tmp_dir, 'data', job_vectors.data)
+    _save_array(tmp_dir, 'indices', job_vectors.indices)
+    _save_array(tmp_dir, 'indptr', job_vectors.indptr)
+    _save_array(tmp_dir, 'idf', tfidf_vectorizer.idf_)
+    _save_array(tmp_dir, 'job_ids', _job_ids_array(job_ids))
+    if active_mask is not None and not np.all(active_mask):
+        _save_array(tmp_dir, 'active_mask', active_mask)
+
+    postings = None
+    if inverted_index is not None:
+        _save_array(tmp_dir, 'postings_data', inverted_index.postings.data)
+        _save_array(tmp_dir, 'postings_indices', inverted_index.postings.indices)
+        _save_array(tmp_dir, 'postings_indptr', inverted_index.postings.indptr)
+        _save_array(tmp_dir, 'max_weights', inverted_index.max_weights)
+        postings = {'n_indexed': inverted_index.n_indexed}
+
+    terms = tfidf_vectorizer.get_feature_names_out()
+    with open(os.path.join(tmp_dir, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(terms))
+
+    object_names = []
+    for name, obj in (objects or {}).items():
+        if obj is not None:
+            joblib.dump(obj, os.path.join(tmp_dir, f'{name}.joblib'))
+            object_names.append(name)
+
+    params = tfidf_vectorizer.get_params()
+    metadata = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'shape': list(job_vectors.shape),
+        'vectorizer_params': {name: params[name] for name in VECTORIZER_PARAMS},
+        'dtype': np.dtype(tfidf_vectorizer.dtype).name,
+        'extra': extra or {},
+        'objects': object_names,
+        'inverted_index': postings,
+    }
+    with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    # Swap the new artifact into place
+    old_dir = f'{artifact_dir}.old-{os.getpid()}'
+    if os.path.exists(artifact_dir):
+        os.rename(artifact_dir, old_dir)
+    os.rename(tmp_dir, artifact_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+def load_artifact(artifact_dir, mmap=True):
+    """
+    Load a model written by save_artifact
+
+    With mmap=True the CSR arrays, IDF weights, job IDs and inverted index
+    postings are read-only np.memmap views, so processes loading the same
+    artifact share a single page-cache copy and loading does not read the
+    arrays up front. Artifacts written without postings load with
+    inverted_index None.
+
+    Returns a dictionary with the same keys as the joblib model format.
+    """
+    with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    if metadata['format_version'] != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact version: {metadata['format_version']}")
+
+    with open(os.path.join(artifact_dir, VOCABULARY_FILE), encoding='utf-8') as f:
+        terms = f.read().split('\n')
+
+    params = metadata['vectorizer_params']
+    params['ngram_range'] = tuple(params['ngram_range'])
+    tfidf_vectorizer = TfidfVectorizer(dtype=np.dtype(metadata['dtype']).type, **params)
+    tfidf_vectorizer.vocabulary_ = {term: index for index, term in enumerate(terms)}
+    tfidf_vectorizer.idf_ = _load_array(artifact_dir, 'idf', mmap)
+
+    job_vectors = sp.csr_matrix(
+        (
+            _load_array(artifact_dir, 'data', mmap),
+            _load_array(artifact_dir, 'indices', mmap),
+            _load_array(artifact_dir, 'indptr', mmap),
+        ),
+        shape=tuple(metadata['shape']),
+        copy=False,
+    )
+
+    active_mask = None
+    if os.path.exists(os.path.join(artifact_dir, 'active_mask.npy')):
+        active_mask = np.array(_load_array(artifact_dir, 'active_mask', mmap))
+
+    model_data = {
+        'tfidf_vectorizer': tfidf_vectorizer,
+        'job_vectors': job_vectors,
+        'job_ids': _load_array(artifact_dir, 'job_ids', mmap),
+        'active_mask': active_mask,
+        'inverted_index': None,
+    }
+    postings = metadata.get('inverted_index')
+    if postings is not None:
+        model_data['inverted_index'] = InvertedIndex.from_arrays(
+            _load_array(artifact_dir, 'postings_indptr', mmap),
+            _load_array(artifact_dir, 'postings_indices', mmap),
+            _load_array(artifact_dir, 'postings_data', mmap),
+            _load_array(artifact_dir, 'max_weights', mmap),
+            postings['n_indexed'],
+        )
+    model_data.update(metadata['extra'])
+    for name in metadata.get('objects', []):
+        model_data[name] = joblib.load(os.path.join(artifact_dir, f'{name}.joblib'))
+    return model_data
@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
+from nltk.stem import WordNetLemmatizer
+
+from .text_preprocessor import TextPreprocessor
+
+# Per-process preprocessor, built once by the pool initializer
+_worker_preprocessor = None
+
+def resolve_n_jobs(n_jobs):
+    """Translate an n_jobs value (-1 = all cores) into a worker count"""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+def shard_bounds(n_items, n_shards):
+    """Split range(n_items) into at most n_shards contiguous (start, end) pairs"""
+    n_shards = max(1, min(n_shards, n_items))
+    edges = np.linspace(0, n_items, n_shards + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+def _init_preprocess_worker(stop_words, cache_size):
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(stop_words, WordNetLemmatizer(), cache_size)
+
+def _preprocess_shard(titles, descriptions, skills, skills_are_lists):
+    """Preprocess the title, description and skills columns of one shard"""
+    processed_skills = (
+        _worker_preprocessor.preprocess_lists(skills) if skills_are_lists
+        else _worker_preprocessor.preprocess_batch(skills)
+    )
+    return (
+        _worker_preprocessor.preprocess_batch(titles),
+        _worker_preprocessor.preprocess_batch(descriptions),
+        processed_skills,
+    )
+
+def _count_shard(documents, analyzer_params, dtype):
+    """
+    Count terms in one shard
+
+    Mirrors CountVectorizer's counting: terms get shard-local ids in order of
+    first occurrence, and each row's entries are sorted by that id.
+
+    Returns the shard terms in first-occurrence order and the count matrix.
+    """
+    analyze = TfidfVectorizer(**analyzer_params).build_analyzer()
+    vocabulary = {}
+    indices = []
+    values = []
+    indptr = [0]
+    for document in documents:
+        feature_counter = {}
+        for feature in analyze(document):
+            feature_idx = vocabulary.setdefault(feature, len(vocabulary))
+            feature_counter[feature_idx] = feature_counter.get(feature_idx, 0) + 1
+        indices.extend(feature_counter.keys())
+        values.extend(feature_counter.values())
+        indptr.append(len(indices))
+
+    counts = sp.csr_matrix(
+        (np.asarray(values, dtype=dtype), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary)),
+    )
+    counts.sort_indices()
+    return list(vocabulary), counts
+
+def parallel_preprocess(job_data, stop_words, cache_size, n_jobs):
+    """
+    Preprocess title, description and skills across worker processes
+
+    Returns the three processed columns as lists, in row order.
+    """
+    skills_are_lists = isinstance(job_data['skills'].iloc[0], list)
+    bounds = shard_bounds(len(job_data), n_jobs)
+
+    titles, descriptions, skills = [], [], []
+    with ProcessPoolExecutor(
+        max_workers=len(bounds),
+        initializer=_init_preprocess_worker,
+        initargs=(stop_words, cache_size),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _preprocess_shard,
+                job_data['title'].iloc[start:end].tolist(),
+                job_data['description'].iloc[start:end].tolist(),
+                job_data['skills'].iloc[start:end].tolist(),
+                skills_are_lists,
+            )
+            for start, end in bounds
+        ]
+        for future in futures:
+            shard_titles, shard_descriptions, shard_skills = future.result()
+            titles.extend(shard_titles)
+            descriptions.extend(shard_descriptions)
+            skills.extend(shard_skills)
+
+    return titles, descriptions, skills
+
+def parallel_fit_transform(vectorizer, documents, n_jobs):
+    """
+    Fit a TfidfVectorizer by merging per-shard term counts
+
+    Each worker counts its shard with a local vocabulary. The shard matrices
+    are remapped onto the merged vocabulary (first-occurrence order, then
+    alphabetical, as CountVectorizer does), features are limited to
+    max_features the same way, and the IDF weights are fitted on the merged
+    counts. The vectorizer ends up in the same state, and the returned
+    matrix is bit-for-bit equal to fit_transform.
+
+    Parameters:
+    - vectorizer: Unfitted TfidfVectorizer (default max_df/min_df)
+    - documents: List of preprocessed documents
+    - n_jobs: Number of worker processes
+
+    Returns:
+    - Sparse TF-IDF matrix for documents
+    """
+    analyzer_params = {
+        'ngram_range': vectorizer.ngram_range,
+        'stop_words': vectorizer.stop_words,
+    }
+    bounds = shard_bounds(len(documents), n_jobs)
+    with ProcessPoolExecutor(max_workers=len(bounds)) as executor:
+        futures = [
+            executor.submit(_count_shard, documents[start:end], analyzer_params, vectorizer.dtype)
+            for start, end in bounds
+        ]
+        shards = [future.result() for future in futures]
+
+    # Global ids in order of first occurrence across shards
+    vocabulary = {}
+    remapped = []
+    for shard_terms, counts in shards:
+        column_map = np.array(
+            [vocabulary.setdefault(term, len(vocabulary)) for term in shard_terms],
+            dtype=np.int64,
+        )
+        remapped.append((column_map, counts))
+    if not vocabulary:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+    counts = sp.vstack([
+        sp.csr_matrix(
+            (counts.data, column_map[counts.indices], counts.indptr),
+            shape=(counts.shape[0], len(vocabulary)),
+        )
+        for column_map, counts in remapped
+    ], format='csr')
+    counts.sort_indices()
+
+    # Renumber features alphabetically without reordering row entries
+    terms = sorted(vocabulary)
+    map_index = np.empty(len(terms), dtype=counts.indices.dtype)
+    map_index[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+    counts.indices = map_index.take(counts.indices)
+
+    # Keep the max_features most frequent terms, as CountVectorizer does
+    mask = np.ones(len(terms), dtype=bool)
+    max_features = vectorizer.max_features
+    if max_features is not None and len(terms) > max_features:
+        term_frequencies = np.asarray(counts.sum(axis=0)).ravel()
+        mask_inds = (-term_frequencies[mask]).argsort()[:max_features]
+        mask = np.zeros(len(terms), dtype=bool)
+        mask[mask_inds] = True
+    kept_indices = np.where(mask)[0]
+    counts = counts[:, kept_indices]
+
+    transformer = TfidfTransformer(
+        norm=vectorizer.norm,
+        use_idf=vectorizer.use_idf,
+        smooth_idf=vectorizer.smooth_idf,
+        sublinear_tf=vectorizer.sublinear_tf,
+    ).fit(counts)
+
+    vectorizer.vocabulary_ = {terms[old]: new for new, old in enumerate(kept_indices)}
+    vectorizer.idf_ = transformer.idf_
+
+    return transformer.transform(counts, copy=False)
@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+
+import nltk
+import pandas as pd
+
+# Characters removed before tokenization
+NON_LETTER_PATTERN = r'[^a-zA-Z\s]'
+
+# Text made only of ASCII letters and whitespace can skip nltk tokenization
+PLAIN_TEXT_RE = re.compile(r'[a-z \t\n\r\f\v]*')
+
+# Words nltk's Treebank tokenizer still splits in letter-only text
+CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+class TextPreprocessor:
+    """
+    Text cleaning, tokenization, stopword removal and lemmatization
+
+    Produces the same output as lowercasing, stripping non-letters,
+    nltk.word_tokenize and a per-token WordNet lemmatize, but memoizes
+    lemmas in a bounded LRU cache, splits plain letter/whitespace text
+    without nltk, and deduplicates values when processing whole columns.
+    """
+
+    def __init__(self, stop_words, lemmatizer, cache_size=100000):
+        """
+        stop_words: Set of tokens to drop
+        lemmatizer: Object with a lemmatize(token) method
+        cache_size: Maximum number of distinct token lemmas kept in memory
+        """
+        self.stop_words = stop_words
+        self.lemmatizer = lemmatizer
+        self.cache_size = cache_size
+        self._lemmatize = lru_cache(maxsize=cache_size)(lemmatizer.lemmatize)
+
+    def __getstate__(self):
+        # The lru_cache wrapper cannot be pickled; it is rebuilt on load
+        state = self.__dict__.copy()
+        del state['_lemmatize']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lemmatize = lru_cache(maxsize=self.cache_size)(self.lemmatizer.lemmatize)
+
+    def cache_info(self):
+        """Return hit/miss statistics of the lemma cache"""
+        return self._lemmatize.cache_info()
+
+    def _tokenize(self, text):
+        """Tokenize cleaned, lowercased text"""
+        if not PLAIN_TEXT_RE.fullmatch(text):
+            return nltk.word_tokenize(text)
+
+        # Fast path: whitespace split plus the contractions nltk would split
+        tokens = []
+        for token in text.split():
+            if token in CONTRACTIONS:
+                tokens.extend(CONTRACTIONS[token])
+            else:
+                tokens.append(token)
+        return tokens
+
+    def _tokens_to_text(self, cleaned_text):
+        """Remove stopwords and lemmatize the tokens of cleaned text"""
+        tokens = self._tokenize(cleaned_text)
+        lemmatize = self._lemmatize
+        stop_words = self.stop_words
+        return ' '.join([lemmatize(token) for token in tokens if token not in stop_words])
+
+    def preprocess(self, text):
+        """Clean and preprocess a single text"""
+        if not isinstance(text, str):
+            return ""
+
+        # Convert to lowercase and remove special characters and numbers
+        text = re.sub(NON_LETTER_PATTERN, '', text.lower())
+
+        return self._tokens_to_text(text)
+
+    def preprocess_batch(self, texts):
+        """
+        Preprocess a whole column of texts
+
+        Each distinct value is processed once, and cleaning runs as
+        vectorized pandas string operations over the distinct values.
+
+        Returns a list with one processed string per input value.
+        """
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+        if len(codes) == 0:
+            return []
+
+        uniques = pd.Series(uniques, dtype=object)
+        is_text = uniques.map(lambda value: isinstance(value, str))
+        cleaned = uniques[is_text].str.lower().str.replace(NON_LETTER_PATTERN, '', regex=True)
+
+        processed_uniques = [""] * len(uniques)
+        for position, cleaned_text in zip(cleaned.index, cleaned):
+            processed_uniques[position] = self._tokens_to_text(cleaned_text)
+
+        # Missing values (code -1) map to the trailing empty string
+        processed_uniques.append("")
+        return [processed_uniques[code] for code in codes]
+
+    def preprocess_lists(self, lists):
+        """
+        Preprocess a column of text lists (e.g. skills)
+
+        Returns one string per list, joining the processed items with spaces.
+        """
+        lengths = [len(items) for items in lists]
+        processed = self.preprocess_batch([item for items in lists for item in items])
+
+        joined = []
+        offset = 0
+        for length in lengths:
+            joined.append(' '.join(processed[offset:offset + length]))
+            offset += length
+        return joined
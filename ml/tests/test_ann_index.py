@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+from ml.models.content_based_recommender import ContentBasedRecommender
+
+WORDS = ['python', 'sql', 'excel', 'nurse', 'hospital', 'audit', 'taxes', 'java', 'cloud', 'sales']
+
+@pytest.fixture(scope='module')
+def model():
+    jobs = pd.DataFrame([
+        {
+            'id': f'job-{i}',
+            'title': f'{WORDS[i % len(WORDS)]} {WORDS[i // len(WORDS) % len(WORDS)]}',
+            'description': f'{WORDS[(i * 3) % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]}',
+            'skills': [WORDS[(i * 5) % len(WORDS)]],
+            'job_type': 'contract' if i % 10 == 0 else 'full-time',
+        }
+        for i in range(400)
+    ])
+    return ContentBasedRecommender().fit(jobs).build_ann_index(n_components=8, n_candidates=20)
+
+def _job_ids(recommendations):
+    return [recommendation['job_id'] for recommendation in recommendations]
+
+@pytest.mark.parametrize('filters', [None, {'job_type': 'contract'}])
+def test_too_few_candidates_fall_back_to_exact_search(model, filters):
+    exact = model.get_recommendations('python sql cloud', top_n=50, use_ann=False, filters=filters)
+    approximate = model.get_recommendations('python sql cloud', top_n=50, filters=filters)
+
+    assert len(exact) == (40 if filters else 50)
+    assert _job_ids(approximate) == _job_ids(exact)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml.models.content_based_recommender import ContentBasedRecommender, select_top_n
+
+WORDS = ['python', 'sql', 'excel', 'nurse', 'hospital', 'audit', 'taxes', 'java', 'cloud', 'sales', 'teacher', 'truck']
+
+QUERIES = ['python sql', 'hospital nurse care', 'audit taxes excel', 'java cloud', '', 'truck driver']
+
+def _jobs(n, start=0):
+    return pd.DataFrame([
+        {
+            'id': f'job-{i}',
+            'title': f'{WORDS[i % 12]} {WORDS[i * 5 % 12]}',
+            'description': f'{WORDS[i * 7 % 12]} {WORDS[i // 12 % 12]} and {WORDS[i * 11 % 12]}',
+            'skills': [WORDS[i * 3 % 12]],
+            'job_type': 'contract' if i % 3 == 0 else 'full-time',
+        }
+        for i in range(start, start + n)
+    ])
+
+@pytest.fixture(scope='module')
+def jobs():
+    return _jobs(300)
+
+@pytest.fixture
+def model(jobs):
+    return ContentBasedRecommender().fit(jobs)
+
+def _job_ids(recommendations):
+    return [recommendation['job_id'] for recommendation in recommendations]
+
+def _full_scan(model, top_n, filters=None):
+    similarities = model.score_documents(QUERIES, filters=filters)
+    top_n = min(top_n, model._count_allowed(model.filter_mask(filters)))
+    return [list(model.job_ids[rows]) for rows in select_top_n(similarities, top_n)]
+
+def _recommended(model, top_n, **kwargs):
+    return [_job_ids(model.get_recommendations(query, top_n=top_n, **kwargs)) for query in QUERIES]
+
+def test_parallel_fit_matches_serial_fit(jobs, model):
+    parallel = ContentBasedRecommender().fit(jobs, n_jobs=2)
+
+    assert parallel.tfidf_vectorizer.vocabulary_ == model.tfidf_vectorizer.vocabulary_
+    assert (parallel.job_vectors != model.job_vectors).nnz == 0
+    assert _recommended(parallel, 10) == _recommended(model, 10)
+
+@pytest.mark.parametrize('artifact_format', ['joblib', 'mmap'])
+def test_saved_model_loads_with_the_same_recommendations(model, tmp_path, artifact_format):
+    model.build_ann_index(n_components=8)
+    path = str(tmp_path / ('model.joblib' if artifact_format == 'joblib' else 'model'))
+    model.save_model(path, artifact_format=artifact_format)
+    loaded = ContentBasedRecommender().load_model(path)
+
+    for filters in (None, {'job_type': 'contract'}):
+        assert _recommended(loaded, 10, filters=filters) == _recommended(model, 10, filters=filters)
+    # Memory-mapped arrays are read-only; incremental updates copy them
+    loaded.add_jobs(_jobs(1, start=1000))
+    loaded.remove_jobs(['job-0'])
+    assert loaded.n_active_jobs == model.n_active_jobs
+
+def test_added_and_removed_jobs_match_a_full_scan(model):
+    model.add_jobs(_jobs(20, start=300))
+    # An update replaces the previous version of a job
+    model.add_jobs(pd.DataFrame([{'id': 'job-1', 'title': 'truck', 'description': 'truck driver', 'skills': []}]))
+    model.remove_jobs(['job-2', 'job-310'])
+
+    assert model.n_active_jobs == 318
+    for top_n in (5, 50):
+        recommended = _recommended(model, top_n)
+        assert recommended == _full_scan(model, top_n)
+        assert not {'job-2', 'job-310'} & {job_id for ids in recommended for job_id in ids}
+    assert _job_ids(model.get_recommendations('truck driver', top_n=1)) == ['job-1']
+
+def test_ann_covering_every_job_matches_a_full_scan(model):
+    model.build_ann_index(n_components=8, n_lists=4, n_probe=4, n_candidates=300)
+
+    for filters in (None, {'job_type': 'contract'}):
+        assert _recommended(model, 10, filters=filters) == _full_scan(model, 10, filters=filters)
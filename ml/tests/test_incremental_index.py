@@ -0,0 +1,57 @@
+import threading
+import time
+from ml.models.incremental_index import ReadWriteLock
+
+def test_waiting_writer_goes_before_new_readers():
+    lock = ReadWriteLock()
+    events = []
+    reading = threading.Event()
+    release = threading.Event()
+
+    def first_reader():
+        with lock.read():
+            reading.set()
+            release.wait()
+        events.append('first read done')
+
+    def writer():
+        with lock.write():
+            events.append('write')
+
+    def late_reader():
+        with lock.read():
+            events.append('late read')
+
+    threads = [threading.Thread(target=first_reader)]
+    threads[0].start()
+    reading.wait()
+    threads.append(threading.Thread(target=writer))
+    threads[1].start()
+    while not lock._waiting_writers:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=late_reader))
+    threads[2].start()
+
+    time.sleep(0.05)
+    assert events == []
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert events.index('write') < events.index('late read')
+
+def test_reader_can_read_again_while_a_writer_waits():
+    lock = ReadWriteLock()
+    done = []
+    with lock.read():
+        writer = threading.Thread(target=lambda: done.append(_write(lock)))
+        writer.start()
+        while not lock._waiting_writers:
+            time.sleep(0.001)
+        with lock.read():
+            done.append('nested read')
+    writer.join(timeout=5)
+    assert done == ['nested read', 'write']
+
+def _write(lock):
+    with lock.write():
+        return 'write'
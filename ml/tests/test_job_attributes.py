@@ -0,0 +1,42 @@
+import pickle
+import sys
+import threading
+import pandas as pd
+from ml.models.job_attributes import JobAttributeStore
+
+def _store():
+    return JobAttributeStore.from_frame(pd.DataFrame({
+        'job_type': ['full-time', 'contract', 'full-time'],
+        'salary_min': [50000, 70000, None],
+    }))
+
+def test_concurrent_filters_evict_cached_masks_safely():
+    store = _store()
+    errors = []
+
+    def filter_salaries(offset):
+        try:
+            for salary in range(offset, offset + 2000):
+                assert store.mask({'salary_min': salary}).tolist() == [salary <= 50000, salary <= 70000, False]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=filter_salaries, args=(i * 1000,)) for i in range(8)]
+    # Switch threads often so evictions interleave
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert len(store._mask_cache) <= 128
+
+def test_store_pickles_without_its_lock():
+    store = pickle.loads(pickle.dumps(_store()))
+
+    assert store.mask({'job_type': 'contract'}).tolist() == [False, True, False]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml.models.content_based_recommender import ContentBasedRecommender, select_top_n
+
+TEMPLATES = [
+    ('Python developer', 'Build web APIs with Python and SQL', ['python', 'sql']),
+    ('Data analyst', 'Analyse sales data with SQL and Excel', ['sql', 'excel']),
+    ('Nurse', 'Care for patients in a busy hospital', ['nursing']),
+    ('Accountant', 'Audit ledgers and prepare taxes', ['accounting']),
+]
+
+USER_DOCUMENTS = [
+    '',
+    'zebra quantum',
+    'python',
+    'sql',
+    'python developer sql web apis',
+    'nurse hospital patients accounting',
+]
+
+@pytest.fixture(scope='module')
+def model():
+    # Every template is posted many times, so most scores tie
+    jobs = pd.DataFrame([
+        {'id': f'job-{i}', 'title': title, 'description': description, 'skills': skills}
+        for i, (title, description, skills) in enumerate(TEMPLATES * 30)
+    ])
+    return ContentBasedRecommender().fit(jobs)
+
+def _job_ids(recommendations):
+    return [recommendation['job_id'] for recommendation in recommendations]
+
+@pytest.mark.parametrize('top_n', [1, 5, 31, 120])
+def test_batch_and_single_recommendations_are_equal(model, top_n):
+    single = [_job_ids(model.get_recommendations(document, top_n=top_n)) for document in USER_DOCUMENTS]
+
+    assert [_job_ids(r) for r in model.get_recommendations_batch(USER_DOCUMENTS, top_n=top_n)] == single
+    assert [_job_ids(r) for r in model.get_recommendations_batch(USER_DOCUMENTS, top_n=top_n, use_index=True)] == single
+
+@pytest.mark.parametrize('top_n', [1, 5, 31, 120])
+def test_indexed_recommendations_match_a_full_scan(model, top_n):
+    similarities = model.score_documents(USER_DOCUMENTS)
+    expected = [list(model.job_ids[rows]) for rows in select_top_n(similarities, top_n)]
+
+    assert [_job_ids(model.get_recommendations(document, top_n=top_n)) for document in USER_DOCUMENTS] == expected
+
+def test_indexed_recommendations_cover_jobs_added_after_fit():
+    model = ContentBasedRecommender().fit(pd.DataFrame([
+        {'id': f'job-{i}', 'title': title, 'description': description, 'skills': skills}
+        for i, (title, description, skills) in enumerate(TEMPLATES * 3)
+    ]))
+    # The index has no bounds for an added job, which can set a top-N
+    # threshold above the bounds of every query term
+    model.add_jobs(pd.DataFrame([{'id': 'added', 'title': 'Python', 'description': 'Python and Excel', 'skills': ['python', 'excel']}]))
+
+    for top_n in (1, 3):
+        expected = list(model.job_ids[select_top_n(model.score_documents(['python excel']), top_n)[0]])
+        assert expected[0] == 'added'
+        assert _job_ids(model.get_recommendations('python excel', top_n=top_n)) == expected
@@ -0,0 +1,16 @@
+import numpy as np
+from ml.models.content_based_recommender import select_top_n
+
+def _reference(similarities, top_n):
+    return np.array([np.lexsort((np.arange(len(row)), -row))[:top_n] for row in similarities])
+
+def test_boundary_ties_go_to_the_lowest_indices():
+    assert select_top_n(np.zeros((1, 4000)), 1).tolist() == [[0]]
+    assert select_top_n(np.array([[0.5, 0.2, 0.9, 0.2, 0.2]]), 3).tolist() == [[2, 0, 1]]
+
+def test_matches_a_full_sort_with_tied_scores():
+    similarities = np.round(np.random.default_rng(0).random((20, 500)), 1)
+    similarities[3] = 0.0
+    similarities[4, ::7] = -np.inf
+    for top_n in (1, 10, 499, 500):
+        np.testing.assert_array_equal(select_top_n(similarities, top_n), _reference(similarities, top_n))
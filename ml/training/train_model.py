@@ -9,6 +9,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.content_based_recommender import ContentBasedRecommender
 from models.hybrid_recommender import HybridRecommender
+from models.job_attributes import CATEGORICAL_ATTRIBUTES, NUMERIC_ATTRIBUTES
+from data.job_data_io import load_job_data, is_up_to_date, write_manifest
 
 # Configure logging
 logging.basicConfig(
@@ -17,10 +19,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Columns used for training; other columns are never read
+TRAINING_COLUMNS = (
+    ['id', 'title', 'description', 'skills', 'is_active'] + CATEGORICAL_ATTRIBUTES + NUMERIC_ATTRIBUTES
+)
+
 def load_data(data_path):
-    """Load job data from CSV file"""
+    """Load job data from a CSV, Parquet or Arrow file"""
     logger.info(f"Loading data from {data_path}")
-    job_data = pd.read_csv(data_path)
+    job_data = load_job_data(data_path, columns=TRAINING_COLUMNS)
     
     # Ensure required columns exist
     required_columns = ['id', 'title', 'description', 'skills']
@@ -29,52 +36,114 @@ def load_data(data_path):
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
-    # Parse skills column if it's in string format
-    if job_data['skills'].dtype == 'object':
-        try:
-            job_data['skills'] = job_data['skills'].apply(
-                lambda x: x.split(',') if isinstance(x, str) else []
-            )
-        except Exception as e:
-            logger.warning(f"Error parsing skills column: {e}")
-    
     logger.info(f"Loaded {len(job_data)} job records")
     return job_data
 
-def train_and_save_model(job_data, model_path, model_type='content'):
+def load_interactions(source):
+    """
+    Load user-job interactions for collaborative filtering
+
+    source: CSV file with columns [user_id, job_id] (optionally status or
+    weight), or a database URI whose applications table is read
+    """
+    logger.info(f"Loading interactions from {source}")
+    if '://' in source:
+        from sqlalchemy import create_engine
+        engine = create_engine(source)
+        interactions = pd.read_sql('SELECT user_id, job_id, status FROM applications', engine)
+    else:
+        interactions = pd.read_csv(source)
+
+    missing_columns = [col for col in ['user_id', 'job_id'] if col not in interactions.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required interaction columns: {missing_columns}")
+
+    logger.info(f"Loaded {len(interactions)} interactions")
+    return interactions
+
+def train_and_save_model(job_data, model_path, model_type='content', n_jobs=1, artifact_format='joblib',
+                         interactions=None, ann_params=None):
     """Train recommender model and save it to disk"""
     logger.info(f"Training {model_type} model...")
     
     if model_type == 'content':
         recommender = ContentBasedRecommender()
-        recommender.fit(job_data)
+        recommender.fit(job_data, n_jobs=n_jobs)
     elif model_type == 'hybrid':
         recommender = HybridRecommender()
-        recommender.fit(job_data)
+        recommender.fit(job_data, user_job_interactions=interactions, n_jobs=n_jobs)
     else:
         raise ValueError(f"Unknown model type: {model_type}")
     
+    if ann_params is not None:
+        logger.info("Building ANN index...")
+        content_model = getattr(recommender, 'content_based', recommender)
+        content_model.build_ann_index(**ann_params)
+    
     logger.info(f"Saving model to {model_path}")
-    recommender.save_model(model_path)
+    recommender.save_model(model_path, artifact_format=artifact_format)
     logger.info("Model training and saving complete")
     
     return recommender
 
 def main():
     parser = argparse.ArgumentParser(description="Train SmartHire recommender model")
-    parser.add_argument('--data', type=str, required=True, help='Path to job data CSV')
+    parser.add_argument('--data', type=str, required=True, help='Path to job data (CSV, Parquet or Arrow)')
     parser.add_argument('--output', type=str, required=True, help='Path to save model')
     parser.add_argument('--model-type', type=str, default='content', 
                         choices=['content', 'hybrid'], help='Type of recommender model')
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help='Worker processes for fitting (-1 uses all cores)')
+    parser.add_argument('--format', type=str, default='joblib', choices=['joblib', 'mmap'],
+                        help='Model artifact format (mmap writes a directory of memory-mappable arrays)')
+    parser.add_argument('--interactions', type=str,
+                        help='Interactions CSV or database URI (applications table) for the hybrid model')
+    parser.add_argument('--ann', action='store_true',
+                        help='Build an approximate nearest-neighbour index for faster retrieval on large '
+                             'corpora; results are approximate (see IVFIndex)')
+    parser.add_argument('--ann-components', type=int, default=128, help='ANN embedding dimension')
+    parser.add_argument('--ann-probe', type=int, default=8, help='ANN inverted lists scanned per query')
+    parser.add_argument('--ann-candidates', type=int, default=1000,
+                        help='ANN candidates re-ranked with the exact cosine')
+    parser.add_argument('--force', action='store_true',
+                        help='Retrain even if the data and parameters are unchanged')
     
     args = parser.parse_args()
     
     try:
+        # Skip retraining when the model was built from identical inputs
+        # (interactions read from a database cannot be hashed)
+        manifest = None
+        if not (args.interactions and '://' in args.interactions):
+            inputs = [args.data] + ([args.interactions] if args.interactions else [])
+            params = {
+                'model_type': args.model_type,
+                'format': args.format,
+                'ann': [args.ann_components, args.ann_probe, args.ann_candidates] if args.ann else None,
+            }
+            up_to_date, manifest = is_up_to_date(inputs, args.output, params)
+            if up_to_date and not args.force:
+                logger.info(f"{args.output} is up to date with {args.data}, skipping training")
+                return
+        
         # Load data
         job_data = load_data(args.data)
         
+        interactions = load_interactions(args.interactions) if args.interactions else None
+        
+        ann_params = None
+        if args.ann:
+            ann_params = {
+                'n_components': args.ann_components,
+                'n_probe': args.ann_probe,
+                'n_candidates': args.ann_candidates,
+            }
+        
         # Train and save model
-        model = train_and_save_model(job_data, args.output, args.model_type)
+        model = train_and_save_model(job_data, args.output, args.model_type, args.n_jobs, args.format,
+                                     interactions, ann_params)
+        if manifest is not None:
+            write_manifest(args.output, manifest)
         
         # Quick validation
         if len(job_data) > 0: